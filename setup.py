@@ -13,4 +13,5 @@ setup(
     long_decription_content_type='text/markdown',
     packages=find_packages(),
     install_requires=['requests'],
+    extras_require={'aio': ['aiohttp']},
 )
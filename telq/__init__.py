@@ -1,15 +1,65 @@
-import datetime as dt
-from typing import Dict, List, Union
+import importlib
+import time
+from typing import TYPE_CHECKING, Any, Optional
 
 import telq.authentication as authentication
-from telq.session.session_data import SessionData
-from telq.supplier.supplier_data import SupplierData
-from telq.networks import Networks
-from telq.tests import Test
-from telq.tests import MT
-from telq.tests import LNT
-from telq.supplier import Supplier
-from telq.session import Session
+from telq.transport import RequestsTransport, Transport
+
+if TYPE_CHECKING:
+    from telq.authentication.cache import TokenCache
+    from telq.authentication.refresh import TokenRefresher
+    from telq.networks import Networks
+    from telq.session import Session
+    from telq.session.session_data import SessionData
+    from telq.supplier import Supplier
+    from telq.supplier.supplier_data import SupplierData
+    from telq.tests import LNT, MT, Test
+    from telq.util.pool import PoolConfig
+    from telq.util.ratelimit import RateLimiter
+    from telq.util.retry import RetryPolicy, RetryStats
+
+# names re-exported by this package, imported on first access so that `import telq` stays cheap
+_LAZY_EXPORTS = {
+    "SessionData": "telq.session.session_data",
+    "SupplierData": "telq.supplier.supplier_data",
+    "Networks": "telq.networks",
+    "Test": "telq.tests",
+    "MT": "telq.tests",
+    "LNT": "telq.tests",
+    "Supplier": "telq.supplier",
+    "Session": "telq.session",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _Client:
+    """Sub-client of TelQTelecomAPI, built from the current authentication on first access.
+    Its module is only imported then, so callers using a single client do not pay for the others"""
+
+    def __init__(self, module: str, name: str):
+        self.module = module
+        self.name = name
+
+    def __set_name__(self, owner, attr: str) -> None:
+        self.attr = attr
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        if instance._authenticated is None:
+            raise RuntimeError(
+                "You must be authenticated first - call the authenticate method passing your App Id and Key "
+            )
+        client_class = getattr(importlib.import_module(self.module), self.name)
+        client = instance.__dict__[self.attr] = client_class(instance._authenticated)
+        return client
 
 
 class TelQTelecomAPI:
@@ -31,6 +81,27 @@ class TelQTelecomAPI:
         will occur on those versions, but they will continue to be supported
         by our app through 2021. We may stop supporting them at some point in the future
         but we will give ample warning to all our customers about it.
+    pool : PoolConfig, optional
+        Connection pool settings (pool size, per-host limit, keep-alive and timeout).
+        One pool is shared by every client of this instance, so connections to the
+        API are reused instead of being opened for each request
+    transport : Transport, optional
+        Transport used for every request, defaults to a RequestsTransport using `pool`.
+        Pass a `telq.transport.fake.FakeTransport` to run against an in-memory TelQ server
+    retry : RetryPolicy, optional
+        Retries requests failing with a temporary error such as HTTP 429 or 503 according
+        to this policy, with jittered exponential backoff honoring Retry-After.
+        By default failed requests are not retried
+    rate_limiter : RateLimiter, optional
+        Holds back requests of all clients to stay within per endpoint class budgets,
+        with submissions preempting polling. It can be shared by several instances
+    token_cache : TokenCache, optional
+        Stores the token on disk so other processes authenticating with the same App Id
+        reuse it instead of requesting a new one, see `telq.authentication.cache.TokenCache`
+    refresh_margin : float, optional, default 300
+        Refresh the token on a background thread this many seconds before it expires.
+        None disables background refresh. Either way, requests rejected with HTTP 401
+        re-authenticate once and are replayed
 
     Examples
     --------
@@ -103,38 +174,66 @@ class TelQTelecomAPI:
      'pdusDelivered': []}
     """
 
-    _last_time_authenticated = None
-    _authenticated: authentication.Authentication
-    supplier: Supplier
-    session: Session
-    mt: MT
-    lnt: LNT
-    network: Networks
+    _authenticated: Optional[authentication.Authentication]
+    supplier: "Supplier" = _Client("telq.supplier", "Supplier")
+    session: "Session" = _Client("telq.session", "Session")
+    mt: "MT" = _Client("telq.tests.mt", "MT")
+    lnt: "LNT" = _Client("telq.tests.lnt", "LNT")
+    network: "Networks" = _Client("telq.networks", "Networks")
 
-    def __init__(self, base_url: str = "https://api.telqtele.com", api_version: str = "v3") -> None:
+    def __init__(self, base_url: str = "https://api.telqtele.com", api_version: str = "v3",
+                 pool: Optional["PoolConfig"] = None, transport: Optional[Transport] = None,
+                 retry: Optional["RetryPolicy"] = None, rate_limiter: Optional["RateLimiter"] = None,
+                 token_cache: Optional["TokenCache"] = None, refresh_margin: Optional[float] = 300) -> None:
         self.api_version = api_version
         self.base_url = base_url
+        self.token_cache = token_cache
+        self.refresh_margin = refresh_margin
+        self._authenticated = None
+        self._refresher: Optional["TokenRefresher"] = None
+        self._transport = transport or RequestsTransport(pool)
+        if rate_limiter is not None:
+            from telq.util.ratelimit import RateLimitedTransport
+            self._transport = RateLimitedTransport(self._transport, rate_limiter)
+        if retry is not None:
+            from telq.util.retry import RetryingTransport
+            self._transport = RetryingTransport(self._transport, retry)
 
-    def __init_clients(self):
-        try:
-            self.session = Session(self._authenticated)
-            self.supplier = Supplier(self._authenticated)
-            self.mt = MT(self._authenticated)
-            self.lnt = LNT(self._authenticated)
-            self.network = Networks(self._authenticated)
+    @property
+    def retry_stats(self) -> Optional["RetryStats"]:
+        """Retry statistics per endpoint, None if requests are not retried"""
+        # only a RetryingTransport keeps statistics
+        return getattr(self._transport, "stats", None)
 
-        except AttributeError:
-            raise RuntimeError(
-                "You must be authenticated first - call the authenticate method passing your App Id and Key "
-            )
+    def close(self) -> None:
+        """Stops refreshing the token and closes all pooled connections to the API"""
+        if self._refresher is not None:
+            self._refresher.stop()
+        self._transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __reset_clients(self):
+        for name, attr in vars(TelQTelecomAPI).items():
+            if isinstance(attr, _Client):
+                client = self.__dict__.pop(name, None)
+                cache = getattr(client, "cache", None)
+                if cache is not None:
+                    # build the client again from the new authentication, keeping the cache set on it
+                    getattr(self, name).cache = cache
 
     def authenticate(self, api_id: str, api_key: str):
         """Authenticates the App Id and Key.
 
         NOTE
         ----------
-        Please note that each authentication lasts for only 24 hours, you will be required to
-        authenticate every 24 hours
+        Please note that each authentication lasts for only 24 hours. The token is refreshed
+        in the background before it expires unless `refresh_margin` is None, and requests
+        rejected with HTTP 401 re-authenticate once and are replayed
 
         Parameters
         ----------
@@ -146,23 +245,18 @@ class TelQTelecomAPI:
         """ ""
         if not api_id or not api_key:
             raise ValueError("API credentials are not set")
-        try:
-            # if the user has been authenticated before
-            # and its within 24 hours since the last time the user was authenticated
-            if self._last_time_authenticated and (
-                    dt.datetime.utcnow() -
-                    self._last_time_authenticated) < dt.timedelta(days=1):
-                print("Already authenticated")
-            # if 24 hours has elapased
-            else:
-                self._authenticated = authentication.Authentication(
-                    api_id=api_id, api_key=api_key, api_version=self.api_version, base_url=self.base_url
-                )
-                self._last_time_authenticated = dt.datetime.now()
-        except AttributeError:
-            # if the user has never been authenticated
+        # reuse the token while it is valid - it may have been requested by another process using the token cache
+        if self._authenticated is not None and time.time() < self._authenticated.expires_at:
+            print("Already authenticated")
+        else:
             self._authenticated = authentication.Authentication(
-                api_id=api_id, api_key=api_key, api_version=self.api_version, base_url=self.base_url
+                api_id=api_id, api_key=api_key, api_version=self.api_version, base_url=self.base_url,
+                transport=self._transport, token_cache=self.token_cache
             )
-            self._last_time_authenticated = dt.datetime.now()
-        self.__init_clients()
+            # clients are built again from the new authentication when next accessed
+            self.__reset_clients()
+            if self._refresher is not None:
+                self._refresher.stop()
+            if self.refresh_margin is not None:
+                from telq.authentication.refresh import TokenRefresher
+                self._refresher = TokenRefresher(self._authenticated, self.refresh_margin).start()
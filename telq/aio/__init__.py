@@ -0,0 +1,126 @@
+import asyncio
+import time
+from typing import Optional
+
+from telq.aio.authentication import AsyncAuthentication
+from telq.aio.networks import AsyncNetworks
+from telq.aio.session import AsyncSession
+from telq.aio.supplier import AsyncSupplier
+from telq.aio.tests import AsyncLNT, AsyncMT
+from telq.authentication.cache import TokenCache
+from telq.transport import AsyncTransport
+from telq.util.pool import PoolConfig
+from telq.util.ratelimit import AsyncRateLimitedTransport, RateLimiter
+from telq.util.retry import AsyncRetryingTransport, RetryPolicy, RetryStats
+
+
+class AsyncTelQTelecomAPI:
+    """Asyncio counterpart of TelQTelecomAPI. Every client method is a coroutine,
+    so a single event loop can keep thousands of requests in flight without a thread per request.
+
+    Parameters
+    ----------
+    base_url : str, default 'https://api.telqtele.com'
+        Base URL for TelQ App
+    api_version : str, default 'v3'
+        API version to use, see TelQTelecomAPI
+    pool : PoolConfig, optional
+        Connection pool settings of the default aiohttp transport, see AiohttpTransport
+    transport : AsyncTransport, optional
+        Transport used for every request, defaults to an AiohttpTransport using `pool`
+        which requires aiohttp (`pip install telq[aio]`).
+        Pass a `telq.transport.fake.AsyncFakeTransport` to run against an in-memory TelQ server
+    retry : RetryPolicy, optional
+        Retries requests failing with a temporary error, see TelQTelecomAPI
+    rate_limiter : RateLimiter, optional
+        Holds back requests to stay within budgets, see TelQTelecomAPI
+    token_cache : TokenCache, optional
+        Stores the token on disk to be reused by other processes, see TelQTelecomAPI
+    refresh_margin : float, optional, default 300
+        Refresh the token on a background task this many seconds before it expires,
+        None disables background refresh, see TelQTelecomAPI
+
+    Examples
+    --------
+    >>> async with AsyncTelQTelecomAPI() as telq_api:
+    ...     await telq_api.authenticate(api_id="<yourAppKey>", api_key="<yourAppId>")
+    ...     networks = await telq_api.network.get_networks()
+    ...     tests = await telq_api.mt.initiate_new_tests(destinationNetworks=networks[:2])
+    ...     results = await asyncio.gather(
+    ...         *(telq_api.mt.get_test_results(test['id']) for test in tests['response'])
+    ...     )
+    """
+
+    _authenticated: Optional[AsyncAuthentication]
+    supplier: AsyncSupplier
+    session: AsyncSession
+    mt: AsyncMT
+    lnt: AsyncLNT
+    network: AsyncNetworks
+
+    def __init__(self, base_url: str = "https://api.telqtele.com", api_version: str = "v3",
+                 pool: Optional[PoolConfig] = None, transport: Optional[AsyncTransport] = None,
+                 retry: Optional[RetryPolicy] = None, rate_limiter: Optional[RateLimiter] = None,
+                 token_cache: Optional[TokenCache] = None, refresh_margin: Optional[float] = 300) -> None:
+        self.api_version = api_version
+        self.base_url = base_url
+        self.token_cache = token_cache
+        self.refresh_margin = refresh_margin
+        self._authenticated = None
+        self._refresher: Optional[asyncio.Task] = None
+        if transport is None:
+            from telq.aio.transport import AiohttpTransport
+            transport = AiohttpTransport(pool)
+        if rate_limiter is not None:
+            transport = AsyncRateLimitedTransport(transport, rate_limiter)
+        if retry is not None:
+            transport = AsyncRetryingTransport(transport, retry)
+        self._transport = transport
+
+    @property
+    def retry_stats(self) -> Optional[RetryStats]:
+        """Retry statistics per endpoint, None if requests are not retried"""
+        return self._transport.stats if isinstance(self._transport, AsyncRetryingTransport) else None
+
+    async def close(self) -> None:
+        """Stops refreshing the token and closes all pooled connections to the API"""
+        if self._refresher is not None:
+            self._refresher.cancel()
+        await self._transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def __init_clients(self):
+        # keep the caches set on the clients of the previous authentication
+        session_cache = getattr(vars(self).get("session"), "cache", None)
+        supplier_cache = getattr(vars(self).get("supplier"), "cache", None)
+        self.session = AsyncSession(self._authenticated)
+        self.session.cache = session_cache
+        self.supplier = AsyncSupplier(self._authenticated)
+        self.supplier.cache = supplier_cache
+        self.mt = AsyncMT(self._authenticated)
+        self.lnt = AsyncLNT(self._authenticated)
+        self.network = AsyncNetworks(self._authenticated)
+
+    async def authenticate(self, api_id: str, api_key: str):
+        """Authenticates the App Id and Key, see TelQTelecomAPI.authenticate"""
+        if not api_id or not api_key:
+            raise ValueError("API credentials are not set")
+        # reuse the token while it is valid
+        if self._authenticated is not None and time.time() < self._authenticated.expires_at:
+            return
+        authenticated = AsyncAuthentication(
+            api_id=api_id, api_key=api_key, api_version=self.api_version, base_url=self.base_url,
+            transport=self._transport, token_cache=self.token_cache
+        )
+        await authenticated.authenticate()
+        self._authenticated = authenticated
+        if self._refresher is not None:
+            self._refresher.cancel()
+        if self.refresh_margin is not None:
+            self._refresher = asyncio.ensure_future(authenticated.keep_fresh(self.refresh_margin))
+        self.__init_clients()
@@ -0,0 +1,84 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import telq.endpoints as endpoints
+from telq.authentication import Authentication
+from telq.authentication.cache import CachedToken
+from telq.authentication.refresh import seconds_until_refresh
+from telq.transport import AsyncTransport, TransportResponse
+
+
+@dataclass
+class AsyncAuthentication(Authentication):
+    """Performs authentication with the App Id and App Key on an asyncio event loop.
+
+    Unlike Authentication, the token is not requested on construction -
+    await `authenticate` to validate the App Id and App Key with the token endpoint.
+
+    Parameters
+    ----------
+    transport : AsyncTransport
+        Transport used for every request made with this authentication
+    """ ""
+
+    transport: Optional[AsyncTransport] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._prepare_token_request()
+
+    async def request(self, method: str, url: str, headers: Optional[dict] = None, json: Optional[Any] = None) -> TransportResponse:
+        """Sends a request with the bearer token, see Authentication.request"""
+        token = self._bearer_token
+        response = await self.transport.request(method, url, headers=dict(headers or {}, Authorization=token), json=json)
+        if response.status_code != 401:
+            return response
+        await self.refresh(token)
+        return await self.transport.request(method, url, headers=dict(headers or {}, Authorization=self._bearer_token), json=json)
+
+    async def refresh(self, stale_token: Optional[str] = None) -> None:
+        """Replaces the token with a new one, see Authentication.refresh"""
+        stale_token = stale_token or self._bearer_token
+        if self._refresh_lock is None:
+            # created on first use so it belongs to the running event loop
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            if self._bearer_token == stale_token:
+                await self.authenticate(stale_token)
+
+    async def keep_fresh(self, margin: float = 300, retry_interval: float = 30) -> None:
+        """Refreshes the token `margin` seconds before it expires, until cancelled"""
+        wait = seconds_until_refresh(self.expires_at, margin, time.time())
+        while True:
+            await asyncio.sleep(wait)
+            try:
+                await self.refresh()
+                wait = seconds_until_refresh(self.expires_at, margin, time.time())
+            except Exception:
+                # try again later, a request rejected with HTTP 401 in the meantime re-authenticates by itself
+                wait = retry_interval
+
+    async def authenticate(self, stale_token: Optional[str] = None) -> None:
+        if self.token_cache is not None:
+            # read without the cache lock, waiting for it on the event loop would block every coroutine
+            cached = self.token_cache.get(self._token_cache_key())
+            if cached and cached.value != stale_token:
+                self._set_token(cached)
+                return
+
+        # pass App Id and App Key to the token endpoint to authenticate user
+        url = endpoints.TokenURL(self.base_url, self.api_version).url()
+        method = "POST"
+        response = await self.transport.request(method, url, headers=self.headers, json=self.data)
+        self._set_token(self._parse_token_response(response))
+
+        if self.token_cache is not None:
+            # the cache lock may be held by another process for a whole token request, wait for it on a thread
+            token = CachedToken(self._bearer_token, self.expires_at)
+            await asyncio.get_running_loop().run_in_executor(None, self._store_token, token)
+
+    def _store_token(self, token: CachedToken) -> None:
+        with self.token_cache.lock():
+            self.token_cache.set(self._token_cache_key(), token)
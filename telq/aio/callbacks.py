@@ -0,0 +1,256 @@
+import asyncio
+import hmac
+import inspect
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict], Union[None, Awaitable[None]]]
+
+# seconds between two checks for room in the queue for a callback
+_ROOM_POLL_INTERVAL = 0.05
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found", 405: "Method Not Allowed",
+    408: "Request Timeout", 411: "Length Required", 413: "Payload Too Large", 503: "Service Unavailable",
+}
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class CallbackReceiver:
+    """Receives the TestResult callbacks sent by TelQ to `resultsCallbackUrl`, so test results
+    can be pushed to you instead of being polled.
+
+    It is a minimal HTTP server running on the event loop. Each callback is checked against
+    the token given as `resultsCallbackToken`, parsed and put in a bounded queue. Results are
+    either consumed by iterating over the receiver, or dispatched to the registered handlers.
+    When the queue stays full for `put_timeout` seconds, callbacks are answered with HTTP 503
+    and Retry-After, so TelQ sends them again later instead of the receiver running out of memory.
+    A callback holding several results is queued as a whole or not at all, so results are not
+    received twice when TelQ sends it again.
+
+    Parameters
+    ----------
+    token : str, optional
+        The `resultsCallbackToken` of the tests. Callbacks without this bearer token are rejected
+        with HTTP 401. By default callbacks are not authenticated
+    host : str, default '127.0.0.1'
+        Address to listen on, e.g. '0.0.0.0' to accept callbacks from other hosts
+    port : int, default 0
+        Port to listen on, a free port is chosen if 0, see `port`
+    path : str, default '/'
+        Path of the callback URL, other paths are answered with HTTP 404
+    max_queue : int, default 1000
+        Maximum number of results received but not consumed yet. Callbacks holding more
+        results are answered with HTTP 413
+    put_timeout : float, default 5
+        Seconds to wait for room in the queue before answering HTTP 503
+    max_body : int, default 1048576
+        Maximum size of a callback body in bytes
+    workers : int, default 4
+        Number of tasks calling the handlers, when handlers are registered
+    read_timeout : float, default 30
+        Seconds to wait for the headers and then the body of a callback. A connection sending
+        them slower is closed, answering HTTP 408 if the body is late
+
+    Examples
+    --------
+    >>> async with CallbackReceiver(token="secret", host="0.0.0.0", port=8080, path="/telq") as receiver:
+    ...     await telq_api.lnt.initiate_new_tests(tests, resultsCallbackUrl="https://example.com/telq",
+    ...                                           resultsCallbackToken="secret")
+    ...     async for result in receiver:
+    ...         print(result["id"], result["testStatus"])
+    """ ""
+
+    def __init__(self, token: Optional[str] = None, host: str = "127.0.0.1", port: int = 0, path: str = "/",
+                 max_queue: int = 1000, put_timeout: float = 5, max_body: int = 1024 * 1024,
+                 workers: int = 4, read_timeout: float = 30):
+        self.token = token
+        self.host = host
+        self.port = port
+        self.path = path
+        self.put_timeout = put_timeout
+        self.max_body = max_body
+        self.workers = workers
+        self.read_timeout = read_timeout
+        self.max_queue = max_queue
+        self.received = 0
+        self.rejected = 0
+        self._handlers: List[Handler] = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def add_handler(self, handler: Handler) -> None:
+        """Calls `handler` with each result received, it can be a function or a coroutine function.
+        Handlers must be added before `start`, results are then no longer available by iterating"""
+        self._handlers.append(handler)
+
+    @property
+    def url(self) -> str:
+        """URL of the receiver, e.g. to test it locally"""
+        return f"http://{self.host}:{self.port}{self.path}"
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        """Results received and not consumed yet"""
+        if self._queue is None:
+            # created on first use so it belongs to the running event loop
+            self._queue = asyncio.Queue(self.max_queue)
+        return self._queue
+
+    async def start(self) -> "CallbackReceiver":
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tasks = [asyncio.ensure_future(self._dispatch()) for _ in range(self.workers if self._handlers else 0)]
+        return self
+
+    async def close(self) -> None:
+        """Stops accepting callbacks and stops the handlers"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self._tasks:
+            task.cancel()
+
+    async def __aenter__(self) -> "CallbackReceiver":
+        return await self.start()
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def __aiter__(self) -> "CallbackReceiver":
+        return self
+
+    async def __anext__(self) -> dict:
+        result = await self.queue.get()
+        self.queue.task_done()
+        return result
+
+    async def _dispatch(self) -> None:
+        while True:
+            result = await self.queue.get()
+            for handler in self._handlers:
+                try:
+                    outcome = handler(result)
+                    if inspect.isawaitable(outcome):
+                        await outcome
+                except Exception:
+                    logger.exception("Callback handler %r failed for test %s", handler, result.get("id"))
+            self.queue.task_done()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.read_timeout)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.LimitOverrunError):
+                    return
+                try:
+                    method, path, version, headers = self._parse_head(head)
+                    keep_alive = self._keep_alive(version, headers)
+                    body = await self._read_body(reader, headers)
+                    await self._receive(method, path, headers, body)
+                    status, message, extra_headers = 200, None, {}
+                except _HTTPError as e:
+                    self.rejected += 1
+                    status, message, extra_headers = e.status, str(e), e.headers
+                    keep_alive = keep_alive and e.status not in (400, 408, 411, 413)
+                self._respond(writer, status, message, extra_headers, keep_alive)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _parse_head(head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+        try:
+            request_line, *lines = head.decode("latin-1").split("\r\n")
+            method, target, version = request_line.split(" ")
+        except ValueError:
+            raise _HTTPError(400, "Malformed request line")
+        headers = {}
+        for line in lines:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        return method.upper(), target.split("?", 1)[0], version, headers
+
+    @staticmethod
+    def _keep_alive(version: str, headers: Dict[str, str]) -> bool:
+        connection = headers.get("connection", "").lower()
+        return connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+    async def _read_body(self, reader: asyncio.StreamReader, headers: Dict[str, str]) -> bytes:
+        if "transfer-encoding" in headers:
+            raise _HTTPError(411, "Chunked bodies are not supported, send a Content-Length")
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise _HTTPError(400, "Invalid Content-Length")
+        if length > self.max_body:
+            raise _HTTPError(413, f"Body larger than {self.max_body} bytes")
+        try:
+            return await asyncio.wait_for(reader.readexactly(length), self.read_timeout)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+            raise _HTTPError(408, "Body not received in time")
+
+    def _authorized(self, headers: Dict[str, str]) -> bool:
+        if self.token is None:
+            return True
+        scheme, _, credentials = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer":
+            # also accept the bare token
+            credentials = headers.get("authorization", "")
+        return hmac.compare_digest(credentials.strip().encode("utf-8"), self.token.encode("utf-8"))
+
+    async def _receive(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> None:
+        if path != self.path:
+            raise _HTTPError(404, f"No callback at {path}")
+        if method != "POST":
+            raise _HTTPError(405, "Callbacks must be POSTed", {"Allow": "POST"})
+        if not self._authorized(headers):
+            raise _HTTPError(401, "Invalid callback token")
+        try:
+            payload: Any = json.loads(body)
+        except ValueError:
+            raise _HTTPError(400, "Body is not JSON")
+        results = payload if isinstance(payload, list) else [payload]
+        if not all(isinstance(result, dict) for result in results):
+            raise _HTTPError(400, "Body is not a TestResult")
+        queue = self.queue
+        if 0 < queue.maxsize < len(results):
+            raise _HTTPError(413, f"More than {queue.maxsize} results")
+        # queue the whole batch or nothing: a batch answered with 503 is sent again as a whole
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.put_timeout
+        while 0 < queue.maxsize and queue.maxsize - queue.qsize() < len(results):
+            if loop.time() >= deadline:
+                raise _HTTPError(503, "Too many results waiting to be processed",
+                                 {"Retry-After": str(max(1, round(self.put_timeout)))})
+            await asyncio.sleep(min(_ROOM_POLL_INTERVAL, max(0.0, deadline - loop.time())))
+        # nothing else runs on the event loop until every result is queued
+        for result in results:
+            queue.put_nowait(result)
+        self.received += len(results)
+
+    @staticmethod
+    def _respond(writer: asyncio.StreamWriter, status: int, message: Optional[str], headers: Dict[str, str],
+                 keep_alive: bool) -> None:
+        body = json.dumps({"status": status, "message": message}).encode("utf-8") if message else b""
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}", f"Content-Length: {len(body)}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if body:
+            lines.append("Content-Type: application/json")
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
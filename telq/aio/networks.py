@@ -0,0 +1,97 @@
+import asyncio
+from typing import List, Optional
+
+from telq.aio.authentication import AsyncAuthentication
+from telq.endpoints import NetworksURL
+from telq.networks import NetworksResponse, conditional_headers, parse_networks_response
+from telq.networks.cache import EXPIRED, STALE, NetworksCache, freshness
+from telq.networks.catalog import NetworkCatalog
+
+
+class AsyncNetworks:
+    """Awaitable counterpart of Networks, see Networks for details"""
+
+    def __init__(self, authentication: AsyncAuthentication):
+        self._authentication = authentication
+
+    async def get_networks(self):
+        """Retrieves a list with all our currently available Networks"""
+        url = NetworksURL(self._authentication.base_url, self._authentication.api_version).url()
+        method = "GET"
+        headers = {
+            "accept": "application/json",
+        }
+        response = await self._authentication.request(method, url, headers=headers)
+        res = response.json()
+        if 'error' in res:
+            raise ValueError(res['message'])
+        response.raise_for_status()
+        return res
+
+    async def get_networks_if_modified(self, etag: Optional[str] = None, last_modified: Optional[str] = None) -> NetworksResponse:
+        """Retrieves the available Networks unless they did not change, see Networks.get_networks_if_modified"""
+        url = NetworksURL(self._authentication.base_url, self._authentication.api_version).url()
+        method = "GET"
+        response = await self._authentication.request(method, url, headers=conditional_headers(etag, last_modified))
+        return parse_networks_response(response)
+
+
+class AsyncNetworksCache(NetworksCache):
+    """Asyncio counterpart of NetworksCache, revalidating stale networks in a background task
+
+    Parameters
+    ----------
+    networks : AsyncNetworks
+        The client used to fetch the networks, e.g. `telq_api.network`
+    """ ""
+
+    def __init__(self, networks: AsyncNetworks, *args, **kwargs):
+        super().__init__(networks, *args, **kwargs)
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+    async def get(self) -> List[dict]:
+        """Returns the networks, fetching them only if they are missing or expired"""
+        with self._lock:
+            state = freshness(self._fetched_at, self.clock(), self.ttl, self.max_stale)
+            if state == STALE and self._revalidation is None:
+                self._revalidation = asyncio.ensure_future(self._revalidate())
+            if state != EXPIRED:
+                return self._value
+        return await self.refresh()
+
+    async def catalog(self) -> NetworkCatalog:
+        """Returns the networks as a NetworkCatalog, see NetworksCache.catalog"""
+        await self.get()
+        return self._catalog
+
+    async def refresh(self) -> List[dict]:
+        """Fetches the networks now and returns them, see NetworksCache.refresh"""
+        requested_at = self.clock()
+        with self._lock:
+            fetches = self._fetches
+        if self._refresh_lock is None:
+            # created on first use so it belongs to the running event loop
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            with self._lock:
+                if self._fetches != fetches and self._fetched_at is not None:
+                    # fetched while this caller waited for the refresh running
+                    return self._value
+            response = await self.networks.get_networks_if_modified(self._etag, self._last_modified)
+            return self._store(response, requested_at)
+
+    async def close(self) -> None:
+        """Cancels the background refresh"""
+        if self._revalidation is not None:
+            self._revalidation.cancel()
+
+    async def _revalidate(self) -> None:
+        try:
+            await self.refresh()
+            self.last_error = None
+        except Exception as e:
+            # keep serving the stale networks, `get` fetches them itself once they expire
+            self.last_error = e
+        finally:
+            with self._lock:
+                self._revalidation = None
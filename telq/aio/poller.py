@@ -0,0 +1,57 @@
+import asyncio
+import time
+from typing import AsyncIterator, Callable, Iterable, Mapping, Optional, Union
+
+from telq.aio.tests import AsyncMT
+from telq.tests.poller import PollResult, PollSchedule, _PollState, _record_poll, _time_to_live
+
+
+class AsyncResultPoller:
+    """Asyncio counterpart of ResultPoller, see ResultPoller for details
+
+    Parameters
+    ----------
+    mt : AsyncMT
+        The client used to get the results, e.g. `telq_api.mt`
+    """ ""
+
+    def __init__(self, mt: AsyncMT, schedule: Optional[PollSchedule] = None, max_in_flight: int = 8,
+                 clock: Callable[[], float] = time.time, sleep: Callable[[float], object] = asyncio.sleep):
+        self.mt = mt
+        self.schedule = schedule or PollSchedule()
+        self.max_in_flight = max(1, max_in_flight)
+        self.clock = clock
+        self.sleep = sleep
+
+    async def as_completed(self, test_ids: Iterable[int], time_to_live: Union[float, Mapping[int, float]] = 3600,
+                           callback: Optional[Callable[[PollResult], None]] = None) -> AsyncIterator[PollResult]:
+        """Polls the tests and yields each one once it reached a final status or expired"""
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        completed: asyncio.Queue = asyncio.Queue()
+        started = self.clock()
+
+        async def poll(state: _PollState) -> None:
+            while True:
+                async with semaphore:
+                    try:
+                        error, result = None, await self.mt.get_test_results(state.test_id)
+                    except Exception as e:
+                        error, result = e, None
+                now = self.clock()
+                outcome = _record_poll(state, error, result, self.schedule, now)
+                if outcome is not None:
+                    await completed.put(outcome)
+                    return
+                await self.sleep(self.schedule.interval(state.age(now), state.time_to_live))
+
+        tasks = [asyncio.ensure_future(poll(_PollState(test_id, started, _time_to_live(time_to_live, test_id))))
+                 for test_id in dict.fromkeys(test_ids)]
+        try:
+            for _ in range(len(tasks)):
+                outcome = await completed.get()
+                if callback is not None:
+                    callback(outcome)
+                yield outcome
+        finally:
+            for task in tasks:
+                task.cancel()
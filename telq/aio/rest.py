@@ -0,0 +1,29 @@
+from typing import Optional
+from abc import ABC
+
+from telq.aio.authentication import AsyncAuthentication
+from telq.util.rest import APIError, request_headers
+
+
+class AsyncTelQRest(ABC):
+    def __init__(self, authentication: AsyncAuthentication):
+        self._authentication = authentication
+        # share the authentication's transport so all clients reuse the same connections
+        self._transport = authentication.transport
+
+    async def request(self, url: str, method: str, data: Optional[dict] = None, extra_headers: Optional[dict] = None) -> dict:
+        headers = request_headers(self._authentication, extra_headers)
+        # re-authenticates and replays the request if the token was rejected
+        response = await self._authentication.request(method, url, headers=headers, json=data)
+
+        try:
+            res = response.json()
+        except ValueError:
+            res = response.text
+
+        if isinstance(res, dict) and res.get('error') != None:
+            raise APIError(f"Server returned {url} HTTP {response.status_code}: {res}", response.status_code, res,
+                           response.headers)
+        response.raise_for_status()
+
+        return res if isinstance(res, dict) else {"response": res}
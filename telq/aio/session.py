@@ -0,0 +1,59 @@
+from dataclasses import asdict
+from typing import AsyncIterator, List, Optional
+
+from telq.aio.rest import AsyncTelQRest
+from telq.endpoints import SessionItemURL, SessionPageURL, SessionURL
+from telq.session.session_data import SessionData
+from telq.util.cache import ItemCache, aread_through, invalidating, warm
+from telq.util.paging import aiter_all_items
+
+
+class AsyncSession(AsyncTelQRest):
+    """Awaitable counterpart of Session, see Session for details on each method"""
+
+    cache: Optional[ItemCache] = None
+
+    async def create(self, session: SessionData):
+        """Create SMPP session"""
+        url = SessionURL(self._authentication.base_url, self._authentication.api_version).url()
+        method = "POST"
+        return await self.request(url, method, data=asdict(session))
+
+    async def update(self, session: SessionData):
+        """Update SMPP session"""
+        url = SessionURL(self._authentication.base_url, self._authentication.api_version).url()
+        method = "PUT"
+
+        if not session.smppSessionId:
+            raise ValueError("smpp_session_id in session required to update")
+
+        with invalidating(self.cache, session.smppSessionId):
+            await self.request(url, method, data=asdict(session))
+
+    async def get(self, id: int):
+        """Retrieve individual SMPP session"""
+        url = SessionItemURL(self._authentication.base_url, self._authentication.api_version).url(id)
+        method = "GET"
+        return await aread_through(self.cache, id, lambda: self.request(url, method))
+
+    async def delete(self, id: int):
+        """Delete individual SMPP session"""
+        url = SessionItemURL(self._authentication.base_url, self._authentication.api_version).url(id)
+        method = "DELETE"
+        with invalidating(self.cache, id):
+            return await self.request(url, method)
+
+    async def list(self, page: int = 1, size: int = 20, order: str = "asc") -> dict:
+        """Get sessions list with pagination."""
+        url = SessionPageURL(self._authentication.base_url, self._authentication.api_version).url(page, size, order)
+        method = "GET"
+        generation = self.cache.generation if self.cache is not None else None
+        return warm(self.cache, await self.request(url, method), "smppSessionId", generation)
+
+    def iter_all(self, size: Optional[int] = None, order: str = "asc", max_workers: int = 4) -> AsyncIterator[dict]:
+        """Yields every session, awaiting the pages of `list` concurrently"""
+        return aiter_all_items(lambda page, page_size: self.list(page, page_size, order), size, max_workers)
+
+    async def fetch_all(self, size: Optional[int] = None, order: str = "asc", max_workers: int = 4) -> List[dict]:
+        """Returns every session, see iter_all"""
+        return [session async for session in self.iter_all(size, order, max_workers)]
@@ -0,0 +1,102 @@
+from dataclasses import asdict
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Sequence
+
+from telq.aio.rest import AsyncTelQRest
+from telq.endpoints import SupplierCustomURL, SupplierItemURL, SupplierPageURL, SupplierStatusPageURL, SupplierURL
+from telq.supplier.supplier_data import SupplierData
+from telq.util.bulk import BulkResult, aretrying, is_rejected_batch, run_chunks_async
+from telq.util.cache import ItemCache, aread_through, invalidating, warm
+from telq.util.paging import aiter_all_items
+
+if TYPE_CHECKING:
+    from telq.util.retry import RetryPolicy
+
+
+class AsyncSupplier(AsyncTelQRest):
+    """Awaitable counterpart of Supplier, see Supplier for details on each method"""
+
+    cache: Optional[ItemCache] = None
+
+    async def create(self, supplier: SupplierData):
+        """Create supplier"""
+        url = SupplierURL(self._authentication.base_url, self._authentication.api_version).url()
+        method = "POST"
+        return await self.request(url, method, data=asdict(supplier))
+
+    async def update(self, supplier: SupplierData):
+        """Update supplier"""
+        url = SupplierURL(self._authentication.base_url, self._authentication.api_version).url()
+        method = "PUT"
+
+        if not supplier.supplierId:
+            raise ValueError("supplierId in supplier required to update")
+
+        with invalidating(self.cache, supplier.supplierId):
+            return await self.request(url, method, data=asdict(supplier))
+
+    async def get(self, id: int):
+        """Retrieve individual supplier"""
+        url = SupplierItemURL(self._authentication.base_url, self._authentication.api_version).url(id)
+        method = "GET"
+        return await aread_through(self.cache, id, lambda: self.request(url, method))
+
+    async def delete(self, id: int):
+        """Delete individual supplier"""
+        url = SupplierItemURL(self._authentication.base_url, self._authentication.api_version).url(id)
+        method = "DELETE"
+        with invalidating(self.cache, id):
+            return await self.request(url, method)
+
+    async def list(self, page: int = 1, size: int = 20, order: str = "asc"):
+        """Get suppliers list with pagination."""
+        url = SupplierPageURL(self._authentication.base_url, self._authentication.api_version).url(page, size, order)
+        method = "GET"
+        generation = self.cache.generation if self.cache is not None else None
+        return warm(self.cache, await self.request(url, method), "supplierId", generation)
+
+    async def list_status(self, page: int = 1, size: int = 20, order: str = "asc"):
+        """Retrieve live information about your suppliers and their corresponding sessions."""
+        url = SupplierStatusPageURL(self._authentication.base_url, self._authentication.api_version).url(page, size, order)
+        method = "GET"
+        return await self.request(url, method)
+
+    def iter_all(self, size: Optional[int] = None, order: str = "asc", max_workers: int = 4) -> AsyncIterator[dict]:
+        """Yields every supplier, awaiting the pages of `list` concurrently"""
+        return aiter_all_items(lambda page, page_size: self.list(page, page_size, order), size, max_workers)
+
+    async def fetch_all(self, size: Optional[int] = None, order: str = "asc", max_workers: int = 4) -> List[dict]:
+        """Returns every supplier, see iter_all"""
+        return [supplier async for supplier in self.iter_all(size, order, max_workers)]
+
+    def iter_all_status(self, size: Optional[int] = None, order: str = "asc",
+                        max_workers: int = 4) -> AsyncIterator[dict]:
+        """Yields the live status of every supplier, awaiting the pages of `list_status` concurrently"""
+        return aiter_all_items(lambda page, page_size: self.list_status(page, page_size, order), size, max_workers)
+
+    async def fetch_all_status(self, size: Optional[int] = None, order: str = "asc",
+                               max_workers: int = 4) -> List[dict]:
+        """Returns the live status of every supplier, see iter_all_status"""
+        return [status async for status in self.iter_all_status(size, order, max_workers)]
+
+    async def assign(self, smpp_session_id: int, supplier_id_list: List[str]):
+        """Re-assign a list of existing suppliers to another SMPP session."""
+        url = SupplierCustomURL(self._authentication.base_url, self._authentication.api_version).url("/assign")
+        method = "POST"
+        data = {
+            "smppSessionId": smpp_session_id,
+            "supplierIds": supplier_id_list
+        }
+        with invalidating(self.cache, *supplier_id_list):
+            return await self.request(url, method, data=data)
+
+    async def assign_bulk(self, smpp_session_id: int, supplier_id_list: List[int], chunk_size: int = 50,
+                          max_workers: int = 4, retry: Optional["RetryPolicy"] = None,
+                          split_rejected: bool = True) -> BulkResult:
+        """Re-assigns many suppliers to another SMPP session, awaiting up to `max_workers`
+        chunks at once, see Supplier.assign_bulk"""
+        async def send(chunk: Sequence[int]) -> list:
+            await self.assign(smpp_session_id, list(chunk))
+            return list(chunk)
+
+        return await run_chunks_async(aretrying(send, retry), list(supplier_id_list), chunk_size,
+                                      max_workers, is_rejected_batch if split_rejected else None)
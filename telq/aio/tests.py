@@ -0,0 +1,183 @@
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Union
+
+from telq.aio.rest import AsyncTelQRest
+from telq.endpoints import BatchResultsURL, ResultsURL, TestsBatchURL, TestsURL
+from telq.tests import LNT, MT, Test, TestBatch
+from telq.tests.lnt import _check_tests
+from telq.util.bulk import BulkResult, is_rejected_batch, run_chunks_async
+from telq.util.paging import aiter_items
+
+
+class AsyncMT(AsyncTelQRest):
+    """Awaitable counterpart of MT, see MT for details on each method"""
+
+    _validate_parse_data = MT._validate_parse_data
+
+    async def initiate_new_tests(
+        self,
+        destinationNetworks: List[Dict[str, str]],
+        resultsCallbackUrl: Union[str, None] = None,
+        maxCallbackRetries: int = 3,
+        testIdTextType: str = "ALPHA",
+        testIdTextCase: str = "MIXED",
+        testIdTextLength: int = 10,
+        testTimeToLiveInSeconds: int = 3600,
+    ) -> Dict:
+        """Initiate a new test"""
+        url = TestsURL(self._authentication.base_url, self._authentication.api_version).url()
+        method = "POST"
+
+        data = self._validate_parse_data(
+            destinationNetworks,
+            resultsCallbackUrl,
+            maxCallbackRetries,
+            testIdTextType,
+            testIdTextCase,
+            testIdTextLength,
+            testTimeToLiveInSeconds,
+        )
+
+        return await self.request(url, method, data)
+
+    async def initiate_new_tests_bulk(
+        self,
+        destinationNetworks: List[Dict[str, str]],
+        resultsCallbackUrl: Union[str, None] = None,
+        maxCallbackRetries: int = 3,
+        testIdTextType: str = "ALPHA",
+        testIdTextCase: str = "MIXED",
+        testIdTextLength: int = 10,
+        testTimeToLiveInSeconds: int = 3600,
+        chunk_size: int = 100,
+        max_workers: int = 4,
+    ) -> BulkResult:
+        """Initiate new tests for a large list of destination networks, awaiting up to
+        `max_workers` chunks at once, see MT.initiate_new_tests_bulk"""
+        url = TestsURL(self._authentication.base_url, self._authentication.api_version).url()
+        method = "POST"
+
+        data = self._validate_parse_data(
+            destinationNetworks,
+            resultsCallbackUrl,
+            maxCallbackRetries,
+            testIdTextType,
+            testIdTextCase,
+            testIdTextLength,
+            testTimeToLiveInSeconds,
+        )
+
+        async def send(chunk: List[Dict[str, str]]) -> list:
+            return (await self.request(url, method, dict(data, destinationNetworks=chunk)))["response"]
+
+        return await run_chunks_async(send, destinationNetworks, chunk_size, max_workers)
+
+    async def get_test_results(self, test_id: int):
+        url = ResultsURL(self._authentication.base_url, self._authentication.api_version).url(test_id=test_id)
+        method = "GET"
+        return await self.request(url, method)
+
+
+class AsyncLNT(AsyncTelQRest):
+    """Awaitable counterpart of LNT, see LNT for details on each method"""
+
+    _validate_parse_data = LNT._validate_parse_data
+
+    async def initiate_new_tests(
+        self,
+        tests: Union[List[Test], TestBatch],
+        smppValidityPeriod: Optional[int] = None,
+        dataCoding: Optional[str] = None,
+        sourceTon: Optional[str] = None,
+        sourceNpi: Optional[str] = None,
+        resultsCallbackUrl: Union[str, None] = None,
+        resultsCallbackToken: Optional[str] = None,
+        maxCallbackRetries: int = 3,
+        testTimeToLiveInSeconds: int = 3600,
+        scheduledDeliveryTime: Optional[str] = None,
+        replaceIfPresentFlag: bool = False,
+        priorityFlag: int = 1,
+        sendTextAsMessagePayloadTlv: bool = False,
+        commentText: Optional[str] = None,
+        tlv: Optional[List[Dict[str, str]]] = None,
+        udh: Optional[List[Dict[str, str]]] = None,
+    ):
+        """Initiate a new lnt batch tests"""
+        url = TestsBatchURL(self._authentication.base_url, self._authentication.api_version).url()
+        method = "POST"
+        extra_headers = {}
+
+        if resultsCallbackToken:
+            extra_headers["results-callback-token"] = resultsCallbackToken
+
+        data = self._validate_parse_data(
+            tests,
+            smppValidityPeriod,
+            dataCoding,
+            sourceTon,
+            sourceNpi,
+            resultsCallbackUrl,
+            maxCallbackRetries,
+            testTimeToLiveInSeconds,
+            scheduledDeliveryTime,
+            replaceIfPresentFlag,
+            priorityFlag,
+            sendTextAsMessagePayloadTlv,
+            commentText,
+            tlv,
+            udh
+        )
+        return await self.request(url, method, data, extra_headers=extra_headers)
+
+    async def initiate_new_tests_bulk(
+        self,
+        tests: Union[List[Test], TestBatch],
+        smppValidityPeriod: Optional[int] = None,
+        dataCoding: Optional[str] = None,
+        sourceTon: Optional[str] = None,
+        sourceNpi: Optional[str] = None,
+        resultsCallbackUrl: Union[str, None] = None,
+        resultsCallbackToken: Optional[str] = None,
+        maxCallbackRetries: int = 3,
+        testTimeToLiveInSeconds: int = 3600,
+        scheduledDeliveryTime: Optional[str] = None,
+        replaceIfPresentFlag: bool = False,
+        priorityFlag: int = 1,
+        sendTextAsMessagePayloadTlv: bool = False,
+        commentText: Optional[str] = None,
+        tlv: Optional[List[Dict[str, str]]] = None,
+        udh: Optional[List[Dict[str, str]]] = None,
+        chunk_size: int = 500,
+        max_workers: int = 4,
+        split_rejected: bool = True,
+    ) -> BulkResult:
+        """Initiate a large batch of lnt tests, split into sub-batches awaited concurrently,
+        see LNT.initiate_new_tests_bulk"""
+        url = TestsBatchURL(self._authentication.base_url, self._authentication.api_version).url()
+        method = "POST"
+        extra_headers = {}
+
+        if resultsCallbackToken:
+            extra_headers["results-callback-token"] = resultsCallbackToken
+
+        _check_tests(tests)
+        options = (smppValidityPeriod, dataCoding, sourceTon, sourceNpi, resultsCallbackUrl, maxCallbackRetries,
+                   testTimeToLiveInSeconds, scheduledDeliveryTime, replaceIfPresentFlag, priorityFlag,
+                   sendTextAsMessagePayloadTlv, commentText, tlv, udh)
+
+        async def send(chunk: Sequence[Test]) -> list:
+            return (await self.request(url, method, self._validate_parse_data(chunk, *options),
+                                       extra_headers=extra_headers))["response"]
+
+        return await run_chunks_async(send, tests, chunk_size, max_workers,
+                                      is_rejected_batch if split_rejected else None)
+
+    async def get_test_results(self, date_from: Optional[str] = None, date_to: Optional[str] = None, page: int = 1, size: int = 100, order: str = "asc"):
+        url = (BatchResultsURL(self._authentication.base_url, self._authentication.api_version)
+               .url(date_from, date_to, page, size, order))
+        method = "GET"
+        return await self.request(url, method)
+
+    def iter_test_results(self, date_from: Optional[str] = None, date_to: Optional[str] = None, size: int = 100,
+                          order: str = "asc", prefetch: int = 4) -> AsyncIterator[dict]:
+        """Yields the results of every test in order, prefetching pages, see LNT.iter_test_results"""
+        return aiter_items(lambda page: self.get_test_results(date_from, date_to, page, size, order), prefetch)
@@ -0,0 +1,60 @@
+import asyncio
+from typing import Any, Optional
+
+import requests
+
+try:
+    import aiohttp
+except ImportError as e:  # pragma: no cover
+    raise ImportError(
+        "The asyncio client requires aiohttp - install it with `pip install telq[aio]`"
+    ) from e
+
+from telq.transport import AsyncTransport, TransportResponse, body_arguments
+from telq.util.pool import PoolConfig
+
+
+class AiohttpTransport(AsyncTransport):
+    """Asyncio transport sending requests over a pooled aiohttp client session
+
+    Parameters
+    ----------
+    pool : PoolConfig, optional
+        Connection pool settings. `pool_maxsize` limits the connections per host and
+        `pool_connections * pool_maxsize` the connections in total. Requests over the
+        limit always wait for a free connection
+    """ ""
+
+    def __init__(self, pool: Optional[PoolConfig] = None):
+        self.pool = pool or PoolConfig()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # the session binds to the running event loop, so it is created on first use
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool.pool_connections * self.pool.pool_maxsize,
+                limit_per_host=self.pool.pool_maxsize,
+                force_close=not self.pool.keep_alive,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.pool.timeout)
+            )
+        return self._session
+
+    async def request(self, method: str, url: str, headers: Optional[dict] = None, json: Optional[Any] = None) -> TransportResponse:
+        # raise the same exceptions as RequestsTransport so errors are handled alike by sync and async clients
+        try:
+            async with self.session.request(method, url, headers=headers, **body_arguments(json)) as response:
+                content = await response.read()
+                return TransportResponse(response.status, content, dict(response.headers), url)
+        except aiohttp.ClientConnectionError as e:
+            raise requests.exceptions.ConnectionError(e) from e
+        except asyncio.TimeoutError as e:
+            raise requests.exceptions.Timeout(e) from e
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -1,9 +1,11 @@
-import os
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
 import warnings
-import toml
-import requests
 import telq.endpoints as endpoints
+from telq.authentication.cache import CachedToken, TokenCache
+from telq.transport import RequestsTransport, Transport, TransportResponse
 from telq.util.version import SDK_VERSION
 
 
@@ -27,6 +29,12 @@ class Authentication:
         but we will give ample warning to all our customers about it.
     base_url : str, default 'https://api.telqtele.com'
         Base URL for TelQ App
+    transport : Transport, optional
+        Transport used for every request made with this authentication.
+        A RequestsTransport with the default pool settings is created if not given
+    token_cache : TokenCache, optional
+        Reuses a valid token stored on disk by another process instead of requesting
+        a new one, and stores newly requested tokens in it
 
     Raises
     ------
@@ -38,8 +46,46 @@ class Authentication:
     api_key: str
     base_url: str
     api_version: str = "v3"
+    transport: Optional[Transport] = field(default=None, repr=False, compare=False)
+    token_cache: Optional[TokenCache] = field(default=None, repr=False, compare=False)
+
+    # lifetime of a token if the token endpoint does not tell
+    _default_token_ttl = 24 * 60 * 60
 
     def __post_init__(self) -> None:
+        if self.transport is None:
+            self.transport = RequestsTransport()
+        self._refresh_lock = threading.Lock()
+        self._prepare_token_request()
+        self._authenticate_user()
+
+    def request(self, method: str, url: str, headers: Optional[dict] = None, json: Optional[Any] = None) -> TransportResponse:
+        """Sends a request with the bearer token. If the token is rejected with HTTP 401,
+        authenticates again and replays the request once"""
+        token = self._bearer_token
+        response = self.transport.request(method, url, headers=dict(headers or {}, Authorization=token), json=json)
+        if response.status_code != 401:
+            return response
+        self.refresh(token)
+        return self.transport.request(method, url, headers=dict(headers or {}, Authorization=self._bearer_token), json=json)
+
+    def refresh(self, stale_token: Optional[str] = None) -> None:
+        """Replaces the token with a new one.
+
+        Only one refresh runs at a time. When many requests find `stale_token` rejected at once,
+        the first one requests a new token and the others reuse it.
+
+        Parameters
+        ----------
+        stale_token : str, optional
+            The token to replace, by default the current one. Nothing is done if it was already replaced
+        """
+        stale_token = stale_token or self._bearer_token
+        with self._refresh_lock:
+            if self._bearer_token == stale_token:
+                self._authenticate_user(stale_token)
+
+    def _prepare_token_request(self) -> None:
         self.headers = {
             "accept": "application/json",
             "Content-Type": "application/json",
@@ -47,7 +93,6 @@ class Authentication:
         }
         self.data = {"appId": self.api_id, "appKey": self.api_key, "baseUrl": self.base_url}
         self._validate_api_version()
-        self._authenticate_user()
 
     def _validate_api_version(self) -> None:
         _deprecated_versions = ["v1.0", "v1.1", "v1.2", "v1.3", "v1.4"]
@@ -65,19 +110,42 @@ class Authentication:
                 "Invalid TelQ API selected - choose a version like 'v2.2' or 'v1.5' and so on - see our documentation for more information"
             )
 
-    def _authenticate_user(self) -> None:
+    def _authenticate_user(self, stale_token: Optional[str] = None) -> None:
+        if self.token_cache is None:
+            self._request_token()
+            return
+        # hold the cache lock while requesting, so concurrent processes wait for this token instead of requesting their own
+        key = self._token_cache_key()
+        with self.token_cache.lock():
+            cached = self.token_cache.get(key)
+            if cached and cached.value != stale_token:
+                self._set_token(cached)
+                return
+            self._request_token()
+            self.token_cache.set(key, CachedToken(self._bearer_token, self.expires_at))
+
+    def _request_token(self) -> None:
         # pass App Id and App Key to the token endpoint to authenticate user
         url = endpoints.TokenURL(self.base_url, self.api_version).url()
         method = "POST"
-        response = requests.request(method, url, headers=self.headers, json=self.data)
+        response = self.transport.request(method, url, headers=self.headers, json=self.data)
+        self._set_token(self._parse_token_response(response))
 
+    def _parse_token_response(self, response: TransportResponse) -> CachedToken:
+        from requests.exceptions import HTTPError
         try:
             res = response.json()
             if 'error' in res:
                 raise ValueError(res['message'])
             response.raise_for_status()
-        except requests.exceptions.HTTPError as e:
+        except HTTPError as e:
             raise Exception(e)
 
-        json_obj = response.json()
-        self._bearer_token = json_obj["value"]
+        return CachedToken(res["value"], time.time() + res.get("ttl", self._default_token_ttl))
+
+    def _set_token(self, token: CachedToken) -> None:
+        self._bearer_token = token.value
+        self.expires_at = token.expires_at
+
+    def _token_cache_key(self) -> str:
+        return TokenCache.key(self.api_id, self.base_url, self.api_version)
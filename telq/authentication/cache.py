@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+
+@dataclass
+class CachedToken:
+    """A bearer token stored in a TokenCache.
+
+    Attributes:
+        value (str): The bearer token.
+        expires_at (float): Time the token expires, in seconds since the epoch.
+    """
+    value: str
+    expires_at: float
+
+
+def default_cache_path() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "telq", "tokens.json")
+
+
+class TokenCache:
+    """Keeps bearer tokens in a file so that processes, including short-lived ones
+    like cron jobs, can reuse a valid token instead of requesting a new one on startup.
+
+    Tokens are keyed by App Id, base URL and API version. The file is only accessed while
+    holding an exclusive file lock, so when many processes start at once only the first
+    one requests a token and the others wait for it and reuse it.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path to the cache file, by default `$XDG_CACHE_HOME/telq/tokens.json`
+        (`~/.cache/telq/tokens.json`). It is created readable by its owner only
+    min_ttl : float, default 300
+        Only reuse tokens valid for at least this many more seconds
+
+    Examples
+    --------
+    >>> telq_api = TelQTelecomAPI(token_cache=TokenCache())
+    >>> telq_api.authenticate(api_id="<yourAppKey>", api_key="<yourAppId>")
+    """ ""
+
+    def __init__(self, path: Optional[str] = None, min_ttl: float = 300):
+        self.path = path or default_cache_path()
+        self.min_ttl = min_ttl
+
+    @staticmethod
+    def key(api_id: str, base_url: str, api_version: str) -> str:
+        return hashlib.sha256(f"{api_id}|{base_url}|{api_version}".encode("utf-8")).hexdigest()
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Holds an exclusive lock on the cache across threads and processes"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path + ".lock", "a+") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:  # pragma: no cover - Windows
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:  # pragma: no cover - Windows
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path) as cache_file:
+                entries = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _write(self, entries: Dict[str, dict]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        # write to a temporary file first so readers never see a partially written cache
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tokens-")
+        try:
+            with os.fdopen(fd, "w") as cache_file:
+                json.dump(entries, cache_file)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def get(self, key: str) -> Optional[CachedToken]:
+        """Returns the cached token if it is valid for at least `min_ttl` more seconds"""
+        entry = self._read().get(key)
+        if not entry:
+            return None
+        token = CachedToken(entry["value"], entry["expiresAt"])
+        return token if token.expires_at - time.time() >= self.min_ttl else None
+
+    def set(self, key: str, token: CachedToken) -> None:
+        now = time.time()
+        entries = {
+            cached_key: entry for cached_key, entry in self._read().items()
+            if isinstance(entry, dict) and entry.get("expiresAt", 0) > now
+        }
+        entries[key] = {"value": token.value, "expiresAt": token.expires_at}
+        self._write(entries)
+
+    def invalidate(self, key: str, value: Optional[str] = None) -> None:
+        """Removes the cached token, only if it is `value` when given"""
+        entries = self._read()
+        if key in entries and (value is None or entries[key].get("value") == value):
+            del entries[key]
+            self._write(entries)
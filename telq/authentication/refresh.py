@@ -0,0 +1,55 @@
+import threading
+import time
+from typing import Callable
+
+from telq.authentication import Authentication
+
+
+def seconds_until_refresh(expires_at: float, margin: float, now: float) -> float:
+    """Seconds to wait before refreshing a token expiring at `expires_at`, `margin` seconds ahead.
+    Short-lived tokens are refreshed halfway through their remaining lifetime instead"""
+    remaining = expires_at - now
+    return max(remaining - margin, remaining / 2, 1.0)
+
+
+class TokenRefresher:
+    """Refreshes the token of an Authentication on a background thread before it expires,
+    so long-running clients never send requests with an expired token.
+
+    Parameters
+    ----------
+    authentication : Authentication
+        The authentication whose token is refreshed
+    margin : float, default 300
+        Refresh the token this many seconds before it expires
+    retry_interval : float, default 30
+        Seconds to wait before trying again when a refresh fails
+    clock : Callable[[], float], default time.time
+        Returns the current time in seconds since the epoch
+    """ ""
+
+    def __init__(self, authentication: Authentication, margin: float = 300, retry_interval: float = 30,
+                 clock: Callable[[], float] = time.time):
+        self._authentication = authentication
+        self.margin = margin
+        self.retry_interval = retry_interval
+        self.clock = clock
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="telq-token-refresher", daemon=True)
+
+    def start(self) -> "TokenRefresher":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self) -> None:
+        wait = seconds_until_refresh(self._authentication.expires_at, self.margin, self.clock())
+        while not self._stopped.wait(wait):
+            try:
+                self._authentication.refresh()
+                wait = seconds_until_refresh(self._authentication.expires_at, self.margin, self.clock())
+            except Exception:
+                # try again later, a request rejected with HTTP 401 in the meantime re-authenticates by itself
+                wait = self.retry_interval
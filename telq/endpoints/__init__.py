@@ -1,7 +1,9 @@
+import re
 from abc import ABC, abstractmethod
 from typing import Optional
 from urllib.parse import urljoin
 from urllib.parse import urlencode
+from urllib.parse import urlsplit
 
 
 class TelQURL(ABC):
@@ -164,3 +166,10 @@ class SupplierStatusPageURL(TelQURL):
 
     def path(self) -> str:
         return "/sessions-suppliers"
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """Identifies the endpoint a request is sent to regardless of base URL (including any path
+    prefix), API version, ids and query parameters, e.g. 'GET /tests/{id}'"""
+    path = re.sub(r"^.*?/client(?=/|$)", "", urlsplit(url).path)
+    return f"{method.upper()} {re.sub(r'/[0-9]+(?=/|$)', '/{id}', path)}"
@@ -1,8 +1,47 @@
-import requests
+from dataclasses import dataclass
+from typing import List, Optional
+
 import telq.authentication as authentication
 from telq.endpoints import NetworksURL
 
 
+@dataclass
+class NetworksResponse:
+    """Result of a conditional request for the available networks.
+
+    Attributes:
+        networks (List[dict]): The networks, None if they did not change since the given validators.
+        etag (str): ETag of the networks, if the server sent one.
+        last_modified (str): Last-Modified date of the networks, if the server sent one.
+    """
+    networks: Optional[List[dict]]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def conditional_headers(etag: Optional[str] = None, last_modified: Optional[str] = None) -> dict:
+    """Headers of a request for the networks, only answered if they changed since `etag` or `last_modified`"""
+    headers = {
+        "accept": "application/json",
+    }
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def parse_networks_response(response) -> NetworksResponse:
+    etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    if response.status_code == 304:
+        return NetworksResponse(None, etag, last_modified)
+    res = response.json()
+    if 'error' in res:
+        raise ValueError(res['message'])
+    response.raise_for_status()
+    return NetworksResponse(res, etag, last_modified)
+
+
 class Networks:
     """Retrieves a list with all our currently available Networks. 
     Please note that the list of available networks updates frequently 
@@ -38,14 +77,33 @@ class Networks:
         method = "GET"
         headers = {
             "accept": "application/json",
-            "Authorization": self._authentication._bearer_token,
         }
-        response = requests.request(method, url, headers=headers)
+        response = self._authentication.request(method, url, headers=headers)
         res = response.json()
-        try:
-            if 'error' in res:
-                raise ValueError(res['message'])
-            response.raise_for_status()
-        except requests.exceptions.HTTPError as e:
-            raise (e)
+        if 'error' in res:
+            raise ValueError(res['message'])
+        response.raise_for_status()
         return res
+
+    def get_networks_if_modified(self, etag: Optional[str] = None, last_modified: Optional[str] = None) -> NetworksResponse:
+        """Retrieves the available Networks unless they did not change since a previous response.
+
+        Sends a conditional request with the validators of that response, so an unchanged
+        list is not transferred again if the server supports ETag or If-Modified-Since.
+
+        Parameters
+        ----------
+        etag : str, optional
+            ETag of the previous response
+        last_modified : str, optional
+            Last-Modified date of the previous response
+
+        Returns
+        -------
+        NetworksResponse
+            The networks, or None as networks if they did not change, and the new validators
+        """ ""
+        url = NetworksURL(self._authentication.base_url, self._authentication.api_version).url()
+        method = "GET"
+        response = self._authentication.request(method, url, headers=conditional_headers(etag, last_modified))
+        return parse_networks_response(response)
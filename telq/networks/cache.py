@@ -0,0 +1,144 @@
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from telq.networks import Networks, NetworksResponse
+from telq.networks.catalog import NetworkCatalog
+from telq.networks.changes import NetworkChangeFeed
+
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+
+
+def freshness(fetched_at: Optional[float], now: float, ttl: float, max_stale: float) -> str:
+    """Whether networks fetched at `fetched_at` can be served as they are, served while
+    being revalidated, or must be fetched again before being served"""
+    if fetched_at is None:
+        return EXPIRED
+    age = now - fetched_at
+    if age < ttl:
+        return FRESH
+    return STALE if age < ttl + max_stale else EXPIRED
+
+
+class NetworksCache:
+    """Keeps the available networks in memory, so they can be read without waiting for the API.
+
+    Networks younger than `ttl` are served from memory. Older networks are still served
+    for up to `max_stale` more seconds while a background thread fetches them again
+    ("stale-while-revalidate"), so callers only wait for the API on the first call or
+    after the networks could not be refreshed for a long time. Refreshes send the ETag
+    and Last-Modified date of the previous response, so the server does not send the
+    list again when it did not change, if it supports conditional requests.
+
+    The returned list is shared by every caller and must not be modified. `catalog` returns
+    the networks as an indexed NetworkCatalog instead, replaced as a whole on each refresh.
+    Subscribers of `changes` are told which networks were added, removed or changed
+    whenever a refresh replaces the catalog.
+
+    Parameters
+    ----------
+    networks : Networks
+        The client used to fetch the networks, e.g. `telq_api.network`
+    ttl : float, default 60
+        Seconds the networks are served without being refreshed
+    max_stale : float, default 300
+        Seconds past `ttl` the networks are still served while being refreshed in the background
+    clock : Callable[[], float], default time.monotonic
+        Returns the current time in seconds
+
+    Examples
+    --------
+    >>> networks_cache = NetworksCache(telq_api.network, ttl=60)
+    >>> networks_cache.get()
+    [{'mcc': '350',
+      'countryName': 'Bermuda',
+      ...]
+    """ ""
+
+    def __init__(self, networks: Networks, ttl: float = 60, max_stale: float = 300,
+                 clock: Callable[[], float] = time.monotonic):
+        self.networks = networks
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.clock = clock
+        # error of the last background refresh, None if it succeeded
+        self.last_error: Optional[Exception] = None
+        self._value: Optional[List[dict]] = None
+        self._catalog: Optional[NetworkCatalog] = None
+        self.changes = NetworkChangeFeed()
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._fetched_at: Optional[float] = None
+        # incremented by each fetch stored, so callers waiting for a refresh can tell one completed
+        self._fetches = 0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._revalidation: Optional[Any] = None
+
+    def get(self) -> List[dict]:
+        """Returns the networks, fetching them only if they are missing or expired"""
+        with self._lock:
+            state = freshness(self._fetched_at, self.clock(), self.ttl, self.max_stale)
+            if state == STALE and self._revalidation is None:
+                self._revalidation = threading.Thread(target=self._revalidate, name="telq-networks-refresh", daemon=True)
+                self._revalidation.start()
+            if state != EXPIRED:
+                return self._value
+        return self.refresh()
+
+    def catalog(self) -> NetworkCatalog:
+        """Returns the networks as a NetworkCatalog, fetching them only if they are missing or expired"""
+        self.get()
+        return self._catalog
+
+    def refresh(self) -> List[dict]:
+        """Fetches the networks now and returns them.
+
+        Only one refresh runs at a time, callers refreshing at the same time share its result.
+        """ ""
+        requested_at = self.clock()
+        with self._lock:
+            fetches = self._fetches
+        with self._refresh_lock:
+            with self._lock:
+                if self._fetches != fetches and self._fetched_at is not None:
+                    # fetched while this caller waited for the refresh running
+                    return self._value
+            response = self.networks.get_networks_if_modified(self._etag, self._last_modified)
+            return self._store(response, requested_at)
+
+    def invalidate(self) -> None:
+        """Forgets the networks, so the next `get` fetches them again"""
+        with self._lock:
+            self._value = self._catalog = self._etag = self._last_modified = self._fetched_at = None
+
+    def _store(self, response: NetworksResponse, fetched_at: float) -> List[dict]:
+        # index the networks before taking the lock, readers keep using the previous catalog meanwhile
+        catalog = NetworkCatalog(response.networks) if response.networks is not None else None
+        with self._lock:
+            previous = self._catalog
+            if catalog is not None:
+                self._value, self._catalog = response.networks, catalog
+            # a 304 response may omit the validators
+            self._etag = response.etag or self._etag
+            self._last_modified = response.last_modified or self._last_modified
+            self._fetched_at = fetched_at
+            self._fetches += 1
+            value = self._value
+        if catalog is not None:
+            # refreshes are serialised, so subscribers see the catalogs in order
+            self.changes.publish(previous, catalog)
+        return value
+
+    def _revalidate(self) -> None:
+        try:
+            self.refresh()
+            self.last_error = None
+        except Exception as e:
+            # keep serving the stale networks, `get` fetches them itself once they expire
+            self.last_error = e
+        finally:
+            with self._lock:
+                self._revalidation = None
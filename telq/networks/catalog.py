@@ -0,0 +1,175 @@
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+NetworkKey = Tuple[str, str, Optional[str]]
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    # country and provider names repeat across networks, share a single copy of each
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Network:
+    """An available network, as returned by /networks.
+
+    Attributes:
+        mcc (str): Mobile Country Code, 3 digits.
+        mnc (str): Mobile Network Code, 2 to 3 digits.
+        portedFromMnc (str): Mobile Network Code the numbers were ported from, None if not ported.
+        countryName (str): Name of the country.
+        providerName (str): Name of the provider.
+        portedFromProviderName (str): Name of the provider the numbers were ported from, None if not ported.
+    """
+
+    __slots__ = ("mcc", "mnc", "portedFromMnc", "countryName", "providerName", "portedFromProviderName")
+
+    def __init__(self, mcc: str, mnc: str, portedFromMnc: Optional[str] = None, countryName: Optional[str] = None,
+                 providerName: Optional[str] = None, portedFromProviderName: Optional[str] = None):
+        self.mcc = _intern(mcc)
+        self.mnc = _intern(mnc)
+        self.portedFromMnc = _intern(portedFromMnc)
+        self.countryName = _intern(countryName)
+        self.providerName = _intern(providerName)
+        self.portedFromProviderName = _intern(portedFromProviderName)
+
+    @classmethod
+    def from_dict(cls, network: dict) -> "Network":
+        return cls(**{name: network.get(name) for name in cls.__slots__})
+
+    @property
+    def key(self) -> NetworkKey:
+        return self.mcc, self.mnc, self.portedFromMnc
+
+    @property
+    def ported(self) -> bool:
+        return self.portedFromMnc is not None
+
+    def destination(self) -> Dict[str, Optional[str]]:
+        """The network as an item of `destinationNetworks` of `MT.initiate_new_tests`"""
+        return {"mcc": self.mcc, "mnc": self.mnc, "portedFromMnc": self.portedFromMnc}
+
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Network) and self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash(self._values())
+
+    def __repr__(self) -> str:
+        return f"Network({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
+
+def network_key(network: dict) -> NetworkKey:
+    """Key of a network or destination given as a dict, as in `Network.key`"""
+    return network.get("mcc"), network.get("mnc"), network.get("portedFromMnc")
+
+
+class NetworkCatalog:
+    """Immutable, indexed view of the available networks.
+
+    Networks are indexed by (mcc, mnc, portedFromMnc), mcc, country name and provider name,
+    so looking networks up takes constant time instead of scanning the list returned
+    by `Networks.get_networks`. Country and provider names are matched case-insensitively.
+
+    A catalog is never modified. `NetworksCache.catalog` returns a new catalog after each
+    refresh, so code holding a catalog always sees a consistent list.
+
+    Parameters
+    ----------
+    networks : Iterable[dict]
+        The networks, as returned by `Networks.get_networks`
+
+    Examples
+    --------
+    >>> catalog = NetworkCatalog(telq_api.network.get_networks())
+    >>> catalog.find(providerName="Verizon", ported=True)
+    (Network(mcc='310', mnc='012', portedFromMnc='260', countryName='United States of America', ...),)
+    >>> telq_api.mt.initiate_new_tests([network.destination() for network in catalog.by_mcc("310")])
+    """ ""
+
+    def __init__(self, networks: Iterable[dict]):
+        by_key: Dict[NetworkKey, Network] = {}
+        by_mcc: Dict[str, List[Network]] = {}
+        by_country: Dict[str, List[Network]] = {}
+        by_provider: Dict[str, List[Network]] = {}
+        for item in networks:
+            network = Network.from_dict(item)
+            if network.key in by_key:
+                continue
+            by_key[network.key] = network
+            by_mcc.setdefault(network.mcc, []).append(network)
+            by_country.setdefault(self._name_key(network.countryName), []).append(network)
+            by_provider.setdefault(self._name_key(network.providerName), []).append(network)
+        self._networks = tuple(by_key.values())
+        self._by_key = by_key
+        self._by_mcc = {mcc: tuple(found) for mcc, found in by_mcc.items()}
+        self._by_country = {name: tuple(found) for name, found in by_country.items()}
+        self._by_provider = {name: tuple(found) for name, found in by_provider.items()}
+
+    @staticmethod
+    def _name_key(name: Optional[str]) -> str:
+        return (name or "").casefold()
+
+    def __len__(self) -> int:
+        return len(self._networks)
+
+    def __iter__(self) -> Iterator[Network]:
+        return iter(self._networks)
+
+    def __contains__(self, network) -> bool:
+        key = network.key if isinstance(network, Network) else network_key(network)
+        return key in self._by_key
+
+    def get(self, mcc: str, mnc: str, portedFromMnc: Optional[str] = None) -> Optional[Network]:
+        """The network with this mcc, mnc and portedFromMnc, None if it is not available"""
+        return self._by_key.get((mcc, mnc, portedFromMnc))
+
+    def by_mcc(self, mcc: str) -> Tuple[Network, ...]:
+        return self._by_mcc.get(mcc, ())
+
+    def by_country(self, countryName: str) -> Tuple[Network, ...]:
+        return self._by_country.get(self._name_key(countryName), ())
+
+    def by_provider(self, providerName: str) -> Tuple[Network, ...]:
+        return self._by_provider.get(self._name_key(providerName), ())
+
+    def find(self, mcc: Optional[str] = None, countryName: Optional[str] = None,
+             providerName: Optional[str] = None, ported: Optional[bool] = None) -> Tuple[Network, ...]:
+        """Networks matching all the given criteria
+
+        Parameters
+        ----------
+        mcc : str, optional
+            Mobile Country Code
+        countryName : str, optional
+            Name of the country, case-insensitive
+        providerName : str, optional
+            Name of the provider, case-insensitive
+        ported : bool, optional
+            Only ported networks if True, only networks which are not ported if False
+        """ ""
+        candidates = [
+            found for found, given in (
+                (self.by_mcc(mcc), mcc), (self.by_country(countryName), countryName),
+                (self.by_provider(providerName), providerName),
+            ) if given is not None
+        ]
+        # scan the smallest index, the others only filter it
+        networks = min(candidates, key=len) if candidates else self._networks
+        name_key = self._name_key
+        return tuple(
+            network for network in networks
+            if (mcc is None or network.mcc == mcc)
+            and (countryName is None or name_key(network.countryName) == name_key(countryName))
+            and (providerName is None or name_key(network.providerName) == name_key(providerName))
+            and (ported is None or network.ported == ported)
+        )
+
+    def to_list(self) -> List[dict]:
+        """The networks as returned by `Networks.get_networks`"""
+        return [network.to_dict() for network in self._networks]
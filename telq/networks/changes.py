@@ -0,0 +1,108 @@
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from telq.networks.catalog import Network, NetworkCatalog
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class NetworkChange:
+    """A change of the available networks between two catalogs.
+
+    Attributes:
+        kind (str): 'added', 'removed' or 'changed'.
+        network (Network): The network now available, or the network removed.
+        previous (Network): The network before it changed, only for 'changed'.
+    """
+    kind: str
+    network: Network
+    previous: Optional[Network] = None
+
+
+def diff_catalogs(previous: Optional[NetworkCatalog], current: NetworkCatalog) -> List[NetworkChange]:
+    """Changes turning `previous` into `current`, every network is added if there is no previous catalog.
+
+    Networks are matched by (mcc, mnc, portedFromMnc). A network is reported as changed when
+    its names changed, or when it is the only network of its mcc and mnc in both catalogs
+    and its portedFromMnc changed.
+    """
+    if previous is current:
+        return []
+    old = previous._by_key if previous is not None else {}
+    new = current._by_key
+    changes = []
+    added: Dict[Tuple[str, str], List[Network]] = {}
+    removed: Dict[Tuple[str, str], List[Network]] = {}
+    for key, network in new.items():
+        before = old.get(key)
+        if before is None:
+            added.setdefault(key[:2], []).append(network)
+        elif before != network:
+            changes.append(NetworkChange(CHANGED, network, before))
+    for key, network in old.items():
+        if key not in new:
+            removed.setdefault(key[:2], []).append(network)
+
+    for mcc_mnc, networks in added.items():
+        gone = removed.get(mcc_mnc)
+        if gone is not None and len(gone) == len(networks) == 1:
+            changes.append(NetworkChange(CHANGED, networks[0], removed.pop(mcc_mnc)[0]))
+        else:
+            changes.extend(NetworkChange(ADDED, network) for network in networks)
+    for networks in removed.values():
+        changes.extend(NetworkChange(REMOVED, network) for network in networks)
+    return changes
+
+
+class NetworkChangeFeed:
+    """Tells subscribers how the available networks changed each time a new catalog is published.
+
+    Subscribers are called with the list of changes, only when there are changes, on the
+    thread publishing the catalog. An exception raised by a subscriber is logged and
+    does not prevent the other subscribers from being called.
+
+    Examples
+    --------
+    >>> networks_cache = NetworksCache(telq_api.network)
+    >>> unsubscribe = networks_cache.changes.subscribe(lambda changes: print(len(changes)))
+    >>> _ = networks_cache.get()
+    7
+    """ ""
+
+    def __init__(self):
+        self._subscribers: List[Callable[[List[NetworkChange]], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[List[NetworkChange]], None]) -> Callable[[], None]:
+        """Calls `callback` with the changes of each new catalog. Returns a function unsubscribing it"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def publish(self, previous: Optional[NetworkCatalog], current: NetworkCatalog) -> List[NetworkChange]:
+        """Notifies the subscribers of the changes between two catalogs and returns them"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return []
+        changes = diff_catalogs(previous, current)
+        if changes:
+            for callback in subscribers:
+                try:
+                    callback(changes)
+                except Exception:
+                    logger.exception("Network change subscriber %r failed", callback)
+        return changes
@@ -0,0 +1,301 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from telq.session import Session
+from telq.session.session_data import SessionData
+from telq.supplier import Supplier
+from telq.supplier.supplier_data import SupplierData
+
+CREATE = "create"
+UPDATE = "update"
+ASSIGN = "assign"
+DELETE = "delete"
+
+SESSION = "session"
+SUPPLIER = "supplier"
+
+# fields never compared: ids, and the password which the API does not return
+_IGNORED_FIELDS = frozenset({"smppSessionId", "supplierId", "password"})
+
+
+def session_key(session: Union[SessionData, dict]) -> Tuple:
+    """Identifies a session without its id: its host, port and system_id"""
+    if isinstance(session, SessionData):
+        return session.hostIp, session.hostPort, session.systemId
+    return session.get("hostIp"), session.get("hostPort"), session.get("systemId")
+
+
+def changed_fields(desired: Any, current: dict) -> List[str]:
+    """Fields of the desired SessionData or SupplierData differing from the current item.
+    Fields set to None in the desired state are left as they are"""
+    return [
+        name for name, value in asdict(desired).items()
+        if name not in _IGNORED_FIELDS and value is not None and current.get(name) != value
+    ]
+
+
+@dataclass
+class Change:
+    """A change needed for the current sessions and suppliers to match the desired ones.
+
+    Attributes:
+        action (str): 'create', 'update', 'assign' (move a supplier to another session) or 'delete'.
+        resource (str): 'session' or 'supplier'.
+        key (Any): The id of the session or supplier, or its key if it does not exist yet.
+        desired (SessionData or SupplierData): The desired state, None for deletes.
+        current (dict): The current state as listed by the API, None for creates.
+        fields (List[str]): Names of the fields changed by an update or an assign.
+    """
+    action: str
+    resource: str
+    key: Any
+    desired: Optional[Union[SessionData, SupplierData]] = None
+    current: Optional[dict] = None
+    fields: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ReconcilePlan:
+    """Changes making the current sessions and suppliers match the desired ones.
+
+    Attributes:
+        sessions (List[Change]): Changes of sessions.
+        suppliers (List[Change]): Changes of suppliers.
+    """
+    sessions: List[Change] = field(default_factory=list)
+    suppliers: List[Change] = field(default_factory=list)
+
+    @property
+    def changes(self) -> List[Change]:
+        return self.sessions + self.suppliers
+
+    @property
+    def empty(self) -> bool:
+        return not self.sessions and not self.suppliers
+
+    def summary(self) -> Dict[str, int]:
+        """Number of changes per action and resource, e.g. {'update supplier': 3}"""
+        return dict(Counter(f"{change.action} {change.resource}" for change in self.changes))
+
+
+@dataclass
+class ChangeFailure:
+    """A change which failed.
+
+    Attributes:
+        change (Change): The change.
+        error (Exception): The error raised applying it.
+    """
+    change: Change
+    error: Exception
+
+
+@dataclass
+class ReconcileResult:
+    """Outcome of applying a ReconcilePlan.
+
+    Attributes:
+        applied (List[Change]): Changes applied.
+        failures (List[ChangeFailure]): Changes which failed, the other changes are still applied.
+    """
+    applied: List[Change] = field(default_factory=list)
+    failures: List[ChangeFailure] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+
+class Reconciler:
+    """Makes the SMPP sessions and suppliers of the account match a desired configuration.
+
+    `plan` lists the current sessions and suppliers (a few concurrent list requests) and
+    compares them with the desired ones, so unchanged items cost no request at all. `apply`
+    then sends only the creates, updates, moves and deletes needed, concurrently: sessions
+    are created and updated first, then suppliers are created, updated and moved (with
+    one assign request per target session), and finally suppliers and sessions are deleted.
+
+    Desired sessions are matched with the current ones by smppSessionId when it is set, else
+    by host, port and system_id. Desired suppliers are matched by supplierId when it is set,
+    else by supplierName. The smppSessionId of a desired supplier is either the id of an
+    existing session or one of the desired SessionData, e.g. a session created by the same
+    plan. Fields set to None in the desired state are not compared, and as the API does not
+    return passwords, a changed password alone is not detected.
+
+    Parameters
+    ----------
+    session : Session
+        The client used for sessions, e.g. `telq_api.session`
+    supplier : Supplier
+        The client used for suppliers, e.g. `telq_api.supplier`
+    prune : bool, default False
+        Delete the sessions and suppliers missing from the desired configuration
+    max_workers : int, default 8
+        Maximum number of requests sent at once
+
+    Examples
+    --------
+    >>> reconciler = Reconciler(telq_api.session, telq_api.supplier, prune=True)
+    >>> primary = SessionData("smpp.example.com", 2775, "telq", "secret", throughput=20)
+    >>> plan = reconciler.plan([primary], [SupplierData(primary, "Example", "Wholesale")])
+    >>> plan.summary()
+    {'update session': 1, 'assign supplier': 1}
+    >>> result = reconciler.apply(plan)
+    """ ""
+
+    def __init__(self, session: Session, supplier: Supplier, prune: bool = False, max_workers: int = 8):
+        self.session = session
+        self.supplier = supplier
+        self.prune = prune
+        self.max_workers = max(1, max_workers)
+
+    def plan(self, sessions: Iterable[SessionData], suppliers: Iterable[SupplierData]) -> ReconcilePlan:
+        """Computes the changes needed, without applying them"""
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="telq-reconcile") as executor:
+            current_sessions = executor.submit(self.session.fetch_all, max_workers=self.max_workers)
+            current_suppliers = executor.submit(self.supplier.fetch_all, max_workers=self.max_workers)
+            current_sessions, current_suppliers = current_sessions.result(), current_suppliers.result()
+
+        plan = ReconcilePlan()
+        # id of each desired session which exists, by identity of its SessionData
+        session_ids: Dict[int, int] = {}
+        by_id = {session["smppSessionId"]: session for session in current_sessions}
+        by_key = {session_key(session): session for session in current_sessions}
+        matched = set()
+        for desired in sessions:
+            current = by_id.get(desired.smppSessionId) if desired.smppSessionId else by_key.get(session_key(desired))
+            if current is None:
+                plan.sessions.append(Change(CREATE, SESSION, session_key(desired), desired))
+                continue
+            if current["smppSessionId"] in matched:
+                raise ValueError(f"Session {session_key(desired)} is configured twice")
+            matched.add(current["smppSessionId"])
+            session_ids[id(desired)] = current["smppSessionId"]
+            fields = changed_fields(desired, current)
+            if fields:
+                plan.sessions.append(Change(UPDATE, SESSION, current["smppSessionId"], desired, current, fields))
+
+        by_id = {supplier["supplierId"]: supplier for supplier in current_suppliers}
+        by_name: Dict[str, List[dict]] = {}
+        for supplier in current_suppliers:
+            by_name.setdefault(supplier.get("supplierName"), []).append(supplier)
+        matched_suppliers = set()
+        for desired in suppliers:
+            target = self._session_id(desired.smppSessionId, session_ids)
+            if target is not None:
+                desired = replace(desired, smppSessionId=target)
+            if desired.supplierId:
+                current = by_id.get(desired.supplierId)
+            else:
+                candidates = by_name.get(desired.supplierName, [])
+                if len(candidates) > 1:
+                    raise ValueError(f"Several suppliers are named {desired.supplierName!r}, set their supplierId")
+                current = candidates[0] if candidates else None
+            if current is None:
+                plan.suppliers.append(Change(CREATE, SUPPLIER, desired.supplierName, desired))
+                continue
+            if current["supplierId"] in matched_suppliers:
+                raise ValueError(f"Supplier {desired.supplierName!r} is configured twice")
+            matched_suppliers.add(current["supplierId"])
+            fields = changed_fields(desired, current)
+            moved = target != current.get("smppSessionId")
+            if fields:
+                plan.suppliers.append(Change(UPDATE, SUPPLIER, current["supplierId"], desired, current,
+                                             fields + (["smppSessionId"] if moved else [])))
+            elif moved:
+                plan.suppliers.append(Change(ASSIGN, SUPPLIER, current["supplierId"], desired, current,
+                                             ["smppSessionId"]))
+
+        if self.prune:
+            plan.suppliers.extend(
+                Change(DELETE, SUPPLIER, supplier["supplierId"], current=supplier)
+                for supplier in current_suppliers if supplier["supplierId"] not in matched_suppliers
+            )
+            plan.sessions.extend(
+                Change(DELETE, SESSION, session["smppSessionId"], current=session)
+                for session in current_sessions if session["smppSessionId"] not in matched
+            )
+        return plan
+
+    def apply(self, plan: ReconcilePlan) -> ReconcileResult:
+        """Applies the changes of a plan, see plan"""
+        result = ReconcileResult()
+        # ids of the sessions created, by identity of their SessionData
+        session_ids: Dict[int, int] = {}
+
+        def create_session(change: Change) -> None:
+            session_ids[id(change.desired)] = self.session.create(change.desired)["smppSessionId"]
+
+        def update_session(change: Change) -> None:
+            self.session.update(replace(change.desired, smppSessionId=change.key))
+
+        def create_supplier(change: Change) -> None:
+            self.supplier.create(self._resolved(change.desired, session_ids))
+
+        def update_supplier(change: Change) -> None:
+            self.supplier.update(replace(self._resolved(change.desired, session_ids), supplierId=change.key))
+
+        self._run(result, [(change, create_session if change.action == CREATE else update_session)
+                           for change in plan.sessions if change.action in (CREATE, UPDATE)])
+
+        supplier_tasks = [(change, create_supplier if change.action == CREATE else update_supplier)
+                          for change in plan.suppliers if change.action in (CREATE, UPDATE)]
+        moves: Dict[int, List[Change]] = {}
+        for change in plan.suppliers:
+            if change.action == ASSIGN:
+                target = self._session_id(change.desired.smppSessionId, session_ids)
+                if target is None:
+                    result.failures.append(ChangeFailure(change, ValueError("Its new session was not created")))
+                    continue
+                moves.setdefault(target, []).append(change)
+        for target, changes in moves.items():
+            supplier_tasks.append((changes, lambda changes, target=target: self.supplier.assign(
+                target, [change.key for change in changes])))
+        self._run(result, supplier_tasks)
+
+        self._run(result, [(change, lambda change: self.supplier.delete(change.key))
+                           for change in plan.suppliers if change.action == DELETE])
+        self._run(result, [(change, lambda change: self.session.delete(change.key))
+                           for change in plan.sessions if change.action == DELETE])
+        return result
+
+    def reconcile(self, sessions: Iterable[SessionData], suppliers: Iterable[SupplierData]) -> ReconcileResult:
+        """Plans and applies the changes"""
+        return self.apply(self.plan(sessions, suppliers))
+
+    def _run(self, result: ReconcileResult, tasks: List[Tuple[Any, Callable]]) -> None:
+        """Runs the tasks concurrently, a task applies a change or a list of changes"""
+        def run(task: Tuple[Any, Callable]) -> Optional[Exception]:
+            changes, apply = task
+            try:
+                apply(changes)
+            except Exception as e:
+                return e
+            return None
+
+        if not tasks:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks)),
+                                thread_name_prefix="telq-reconcile") as executor:
+            errors = list(executor.map(run, tasks))
+        for (changes, _), error in zip(tasks, errors):
+            for change in changes if isinstance(changes, list) else [changes]:
+                if error is None:
+                    result.applied.append(change)
+                else:
+                    result.failures.append(ChangeFailure(change, error))
+
+    @staticmethod
+    def _session_id(session: Union[int, SessionData], session_ids: Dict[int, int]) -> Optional[int]:
+        """Id of the session a desired supplier belongs to, None if its session is not created yet"""
+        if isinstance(session, SessionData):
+            return session.smppSessionId or session_ids.get(id(session))
+        return session
+
+    def _resolved(self, supplier: SupplierData, session_ids: Dict[int, int]) -> SupplierData:
+        session_id = self._session_id(supplier.smppSessionId, session_ids)
+        if session_id is None:
+            raise ValueError(f"The session of supplier {supplier.supplierName!r} was not created")
+        return replace(supplier, smppSessionId=session_id)
@@ -1,7 +1,10 @@
 from dataclasses import asdict
+from typing import Iterator, List, Optional
 from telq.endpoints import SessionItemURL, SessionURL
 from telq.endpoints import SessionPageURL
 from telq.session.session_data import SessionData
+from telq.util.cache import ItemCache, invalidating, read_through, warm
+from telq.util.paging import iter_all_items
 from telq.util.rest import TelQRest
 
 
@@ -15,6 +18,11 @@ class Session(TelQRest):
     authentication: authentication.Authentication
         The authentication class after you have been authenticated
 
+    Attributes
+    -------
+    cache: ItemCache, optional
+        Serves `get` from memory when set, see `telq.util.cache.ItemCache`. None by default
+
     Raises
     ------
     Exception
@@ -22,6 +30,8 @@ class Session(TelQRest):
         This will happen If there is an error with your request
     """ ""
 
+    cache: Optional[ItemCache] = None
+
     def create(self, session: SessionData):
         """Create SMPP session
 
@@ -46,7 +56,8 @@ class Session(TelQRest):
         if not session.smppSessionId:
             raise ValueError("smpp_session_id in session required to update")
 
-        self.request(url, method, data=asdict(session))
+        with invalidating(self.cache, session.smppSessionId):
+            self.request(url, method, data=asdict(session))
 
     def get(self, id: int):
         """Retrieve individual SMPP session
@@ -70,16 +81,19 @@ class Session(TelQRest):
                     - 'useSSL' (bool): True if the session is using SSL protocol.
                     - 'windowWaitTimeout' (int): Window wait timeout in milliseconds.
                     - 'supplierCount' (int): Total number of suppliers assigned to this session object.
+
+            The session is served from `cache` when it holds it.
         """
         url = SessionItemURL(self._authentication.base_url, self._authentication.api_version).url(id)
         method = "GET"
-        return self.request(url, method)
+        return read_through(self.cache, id, lambda: self.request(url, method))
 
     def delete(self, id: int):
         """Delete individual SMPP session"""
         url = SessionItemURL(self._authentication.base_url, self._authentication.api_version).url(id)
         method = "DELETE"
-        return self.request(url, method)
+        with invalidating(self.cache, id):
+            return self.request(url, method)
 
     def list(self, page: int = 1, size: int = 20, order: str = "asc") -> dict:
         """Get sessions list with pagination.
@@ -103,4 +117,24 @@ class Session(TelQRest):
             "accept": "application/json",
             "Authorization": self._authentication._bearer_token,
         }
-        return self.request(url, method)
+        generation = self.cache.generation if self.cache is not None else None
+        return warm(self.cache, self.request(url, method), "smppSessionId", generation)
+
+    def iter_all(self, size: Optional[int] = None, order: str = "asc", max_workers: int = 4) -> Iterator[dict]:
+        """Yields every session, fetching the pages of `list` concurrently.
+
+        Parameters
+        ----------
+        size : int, optional
+            Number of sessions per page. By default the first page has 20 sessions, and the
+            size of the following pages is chosen to fetch them in a single wave of requests
+        order : str, optional
+            'asc' or 'desc', by default 'asc'
+        max_workers : int, optional
+            Maximum number of pages fetched at once, by default 4
+        """ ""
+        return iter_all_items(lambda page, page_size: self.list(page, page_size, order), size, max_workers)
+
+    def fetch_all(self, size: Optional[int] = None, order: str = "asc", max_workers: int = 4) -> List[dict]:
+        """Returns every session, see iter_all"""
+        return [session for session in self.iter_all(size, order, max_workers)]
@@ -1,11 +1,17 @@
-from typing import List
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence
 from dataclasses import asdict
 from telq.endpoints import SupplierItemURL, SupplierStatusPageURL, SupplierURL
 from telq.endpoints import SupplierPageURL
 from telq.endpoints import SupplierCustomURL
 from telq.supplier.supplier_data import SupplierData
+from telq.util.bulk import BulkResult, is_rejected_batch, retrying, run_chunks
+from telq.util.cache import ItemCache, invalidating, read_through, warm
+from telq.util.paging import iter_all_items
 from telq.util.rest import TelQRest
 
+if TYPE_CHECKING:
+    from telq.util.retry import RetryPolicy
+
 
 class Supplier(TelQRest):
     """
@@ -16,6 +22,11 @@ class Supplier(TelQRest):
     authentication: authentication.Authentication
         The authentication class after you have been authenticated
 
+    Attributes
+    -------
+    cache: ItemCache, optional
+        Serves `get` from memory when set, see `telq.util.cache.ItemCache`. None by default
+
     Raises
     ------
     Exception
@@ -23,6 +34,8 @@ class Supplier(TelQRest):
         This will happen If there is an error with your request
     """
 
+    cache: Optional[ItemCache] = None
+
     def create(self, supplier: SupplierData):
         """Create SMPP session"""
         url = SupplierURL(self._authentication.base_url, self._authentication.api_version).url()
@@ -37,7 +50,8 @@ class Supplier(TelQRest):
         if not supplier.supplierId:
             raise ValueError("supplierId in supplier required to update")
 
-        return self.request(url, method, data=asdict(supplier))
+        with invalidating(self.cache, supplier.supplierId):
+            return self.request(url, method, data=asdict(supplier))
 
     def get(self, id: int):
         """Retrieve individual supplier
@@ -54,16 +68,19 @@ class Supplier(TelQRest):
                     service_type (str): Service type of the supplier.
                     tlv (List[dict]): An array of TLV values defined in HEX format for the supplier as: tagHex and valueHex.
                     udh (List[dict]): An array of UDH values defined in HEX format for the supplier as: tagHex and valueHex.
+
+            The supplier is served from `cache` when it holds it.
         """
         url = SupplierItemURL(self._authentication.base_url, self._authentication.api_version).url(id)
         method = "GET"
-        return self.request(url, method)
+        return read_through(self.cache, id, lambda: self.request(url, method))
 
     def delete(self, id: int):
         """Delete individual supplier"""
         url = SupplierItemURL(self._authentication.base_url, self._authentication.api_version).url(id)
         method = "DELETE"
-        return self.request(url, method)
+        with invalidating(self.cache, id):
+            return self.request(url, method)
 
     def list(self, page: int = 1, size: int = 20, order: str = "asc"):
         """Get sessions list with pagination.
@@ -83,7 +100,8 @@ class Supplier(TelQRest):
            """
         url = SupplierPageURL(self._authentication.base_url, self._authentication.api_version).url(page, size, order)
         method = "GET"
-        return self.request(url, method)
+        generation = self.cache.generation if self.cache is not None else None
+        return warm(self.cache, self.request(url, method), "supplierId", generation)
 
     def list_status(self, page: int = 1, size: int = 20, order: str = "asc"):
         """This allows you to retrieve live information about your suppliers and their corresponding sessions to check their current availability.
@@ -105,6 +123,33 @@ class Supplier(TelQRest):
         method = "GET"
         return self.request(url, method)
 
+    def iter_all(self, size: Optional[int] = None, order: str = "asc", max_workers: int = 4) -> Iterator[dict]:
+        """Yields every supplier, fetching the pages of `list` concurrently.
+
+        Parameters
+        ----------
+        size : int, optional
+            Number of suppliers per page. By default the first page has 20 suppliers, and the
+            size of the following pages is chosen to fetch them in a single wave of requests
+        order : str, optional
+            'asc' or 'desc', by default 'asc'
+        max_workers : int, optional
+            Maximum number of pages fetched at once, by default 4
+        """ ""
+        return iter_all_items(lambda page, page_size: self.list(page, page_size, order), size, max_workers)
+
+    def fetch_all(self, size: Optional[int] = None, order: str = "asc", max_workers: int = 4) -> List[dict]:
+        """Returns every supplier, see iter_all"""
+        return [supplier for supplier in self.iter_all(size, order, max_workers)]
+
+    def iter_all_status(self, size: Optional[int] = None, order: str = "asc", max_workers: int = 4) -> Iterator[dict]:
+        """Yields the live status of every supplier, fetching the pages of `list_status` concurrently, see iter_all"""
+        return iter_all_items(lambda page, page_size: self.list_status(page, page_size, order), size, max_workers)
+
+    def fetch_all_status(self, size: Optional[int] = None, order: str = "asc", max_workers: int = 4) -> List[dict]:
+        """Returns the live status of every supplier, see iter_all_status"""
+        return [status for status in self.iter_all_status(size, order, max_workers)]
+
     def assign(self, smpp_session_id: int, supplier_id_list: List[str]):
         """This is a bulk operation that allows our users to re-assign a list of existing suppliers to another SMPP session."""
         url = SupplierCustomURL(self._authentication.base_url, self._authentication.api_version).url("/assign")
@@ -113,4 +158,53 @@ class Supplier(TelQRest):
             "smppSessionId": smpp_session_id,
             "supplierIds": supplier_id_list
         }
-        return self.request(url, method, data=data)
+        with invalidating(self.cache, *supplier_id_list):
+            return self.request(url, method, data=data)
+
+    def assign_bulk(self, smpp_session_id: int, supplier_id_list: List[int], chunk_size: int = 50,
+                    max_workers: int = 4, retry: Optional["RetryPolicy"] = None,
+                    split_rejected: bool = True) -> BulkResult:
+        """Re-assigns many suppliers to another SMPP session, in chunks sent concurrently.
+
+        Every chunk of at most `chunk_size` suppliers is assigned with one `assign` request, up to
+        `max_workers` at once. A chunk failing with a transient error, e.g. a timeout or HTTP 503,
+        is sent again as `retry` allows, with jittered backoff honoring Retry-After: assigning a
+        supplier to the session it is already in changes nothing, so retries are safe. Other
+        errors are reported at once. With `split_rejected`, a chunk rejected because of some of
+        its suppliers (e.g. deleted ones) is split in halves sent again, down to single suppliers,
+        so the other suppliers are still assigned.
+
+        Parameters
+        ----------
+        smpp_session_id : int
+            Id of the session the suppliers are assigned to
+        supplier_id_list : List[int]
+            Ids of the suppliers
+        chunk_size : int, optional
+            Maximum number of suppliers per request, by default 50
+        max_workers : int, optional
+            Maximum number of requests sent at once, by default 4
+        retry : RetryPolicy, optional
+            Number of retries of a chunk and waits between them, by default `RetryPolicy(max_retries=2)`
+        split_rejected : bool, optional
+            Split rejected chunks to find the suppliers rejected, by default True
+
+        Returns
+        -------
+        BulkResult
+            `results` holds the ids of the suppliers assigned, in the order of `supplier_id_list`, and
+            `failures` the suppliers which could not be assigned with their error. Passing
+            `result.failed_items()` to `assign_bulk` again resumes an interrupted migration
+
+        Examples
+        --------
+        >>> result = telq_api.supplier.assign_bulk(standby_session_id, supplier_ids, chunk_size=100)
+        >>> for failure in result.failures:
+        ...     print(failure.items, failure.error)
+        """ ""
+        def send(chunk: Sequence[int]) -> list:
+            self.assign(smpp_session_id, list(chunk))
+            return list(chunk)
+
+        return run_chunks(retrying(send, retry), list(supplier_id_list), chunk_size, max_workers,
+                          is_rejected_batch if split_rejected else None)
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from telq.supplier import Supplier
+from telq.util.paging import iter_pages
+
+logger = logging.getLogger(__name__)
+
+ADDED = "added"
+REMOVED = "removed"
+ONLINE = "online"
+OFFLINE = "offline"
+ERROR = "error"
+MOVED = "moved"
+
+
+@dataclass(frozen=True)
+class StatusEvent:
+    """A transition of the status of a supplier and its SMPP session.
+
+    Attributes:
+        kind (str): 'added', 'removed', 'online', 'offline', 'error' (a new lastError) or 'moved'
+            (assigned to another session).
+        supplierId (int): Id of the supplier.
+        smppSessionId (int): Id of the session of the supplier.
+        current (dict): The status, as returned by `Supplier.list_status`, None when removed.
+        previous (dict): The status at the previous poll, None when added.
+    """
+    kind: str
+    supplierId: int
+    smppSessionId: Optional[int]
+    current: Optional[dict]
+    previous: Optional[dict]
+
+
+def status_events(previous: Optional[dict], current: Optional[dict]) -> List[StatusEvent]:
+    """Transitions between two statuses of the same supplier"""
+    status = current if current is not None else previous
+    supplier_id, session_id = status["supplierId"], status.get("smppSessionId")
+    if previous is None:
+        return [StatusEvent(ADDED, supplier_id, session_id, current, None)]
+    if current is None:
+        return [StatusEvent(REMOVED, supplier_id, session_id, None, previous)]
+    events = []
+    if current.get("smppSessionId") != previous.get("smppSessionId"):
+        events.append(StatusEvent(MOVED, supplier_id, session_id, current, previous))
+    if bool(current.get("online")) != bool(previous.get("online")):
+        events.append(StatusEvent(ONLINE if current.get("online") else OFFLINE, supplier_id, session_id,
+                                  current, previous))
+    if current.get("lastError") and current.get("lastError") != previous.get("lastError"):
+        events.append(StatusEvent(ERROR, supplier_id, session_id, current, previous))
+    return events
+
+
+class StatusWatcher:
+    """Polls `Supplier.list_status` and tells subscribers when suppliers and their sessions change.
+
+    Subscribers are only called with transitions (e.g. a session going offline or reporting a new
+    lastError), not with the whole list. Every page is downloaded at each poll; pages are hashed
+    so those identical to the previous poll are not compared item by item, which saves work but
+    not bandwidth. Requests are reduced by the adaptive polling interval: it drops to
+    `min_interval` as soon as something changes, so flapping sessions are followed closely, and
+    grows by `backoff` at each poll without change, up to `max_interval`.
+
+    Subscribers are called on the polling thread. An exception raised by a subscriber is logged
+    and does not prevent the other subscribers from being called.
+
+    Parameters
+    ----------
+    supplier : Supplier
+        The client used to get the statuses, e.g. `telq_api.supplier`
+    min_interval : float, default 2
+        Seconds between polls while statuses change
+    max_interval : float, default 60
+        Seconds between polls once statuses are stable
+    backoff : float, default 1.5
+        Factor the interval grows by after each poll without change
+    size : int, default 100
+        Number of statuses per page
+    max_workers : int, default 4
+        Maximum number of pages fetched at once
+    clock : Callable[[], float], default time.monotonic
+        Returns the current time in seconds
+    sleep : Callable[[float], None], optional
+        Waits between polls in `run`, by default waiting until `stop` is called
+
+    Examples
+    --------
+    >>> watcher = StatusWatcher(telq_api.supplier, min_interval=2, max_interval=60)
+    >>> watcher.subscribe(lambda events: [alert(event) for event in events if event.kind == OFFLINE])
+    >>> watcher.start()
+    """ ""
+
+    def __init__(self, supplier: Supplier, min_interval: float = 2.0, max_interval: float = 60.0,
+                 backoff: float = 1.5, size: int = 100, max_workers: int = 4,
+                 clock: Callable[[], float] = time.monotonic, sleep: Optional[Callable[[float], None]] = None):
+        self.supplier = supplier
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.size = size
+        self.max_workers = max_workers
+        self.clock = clock
+        self.interval = min_interval
+        self.polls = 0
+        self.statuses: Dict[int, dict] = {}
+        self._sleep = sleep
+        # hash and supplier ids of each page at the previous poll
+        self._pages: Dict[int, Tuple[str, List[int]]] = {}
+        self._subscribers: List[Callable[[List[StatusEvent]], None]] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: Callable[[List[StatusEvent]], None]) -> Callable[[], None]:
+        """Calls `callback` with the events of each poll with changes. Returns a function unsubscribing it"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def poll(self) -> List[StatusEvent]:
+        """Fetches the statuses once, notifies the subscribers of the events and returns them.
+        The first poll reports every supplier as added"""
+        statuses: Dict[int, dict] = {}
+        pages: Dict[int, Tuple[str, List[int]]] = {}
+        changed: Dict[int, dict] = {}
+        pages_fetched = iter_pages(lambda number: self.supplier.list_status(number, self.size), self.max_workers)
+        for number, page in enumerate(pages_fetched, 1):
+            content = page.get("content") or []
+            digest = hashlib.sha1(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+            ids = [status["supplierId"] for status in content]
+            pages[number] = digest, ids
+            if self._pages.get(number, (None,))[0] == digest:
+                # same page as last time, its statuses did not change
+                statuses.update((supplier_id, self.statuses[supplier_id]) for supplier_id in ids)
+                continue
+            for status in content:
+                statuses[status["supplierId"]] = status
+                changed[status["supplierId"]] = status
+
+        events = []
+        for supplier_id, status in changed.items():
+            events.extend(status_events(self.statuses.get(supplier_id), status))
+        for supplier_id, previous in self.statuses.items():
+            if supplier_id not in statuses:
+                events.extend(status_events(previous, None))
+
+        self.statuses, self._pages = statuses, pages
+        self.polls += 1
+        self.interval = self.min_interval if events else min(self.max_interval, self.interval * self.backoff)
+        if events:
+            self._publish(events)
+        return events
+
+    def run(self) -> None:
+        """Polls until `stop` is called, waiting `interval` seconds between polls"""
+        while not self._stopped.is_set():
+            started = self.clock()
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Polling the supplier statuses failed")
+                self.interval = min(self.max_interval, self.interval * self.backoff)
+            wait = max(0.0, self.interval - (self.clock() - started))
+            if self._sleep is not None:
+                self._sleep(wait)
+            else:
+                self._stopped.wait(wait)
+
+    def start(self) -> "StatusWatcher":
+        """Polls on a daemon thread"""
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run, name="telq-status-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _publish(self, events: List[StatusEvent]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(events)
+            except Exception:
+                logger.exception("Status subscriber %r failed", callback)
@@ -1,3 +1,4 @@
 from telq.tests.lnt import LNT
 from telq.tests.mt import MT
 from telq.tests.model import Test
+from telq.tests.batch import TestBatch
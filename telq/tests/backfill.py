@@ -0,0 +1,173 @@
+import datetime as dt
+import math
+import threading
+from concurrent import futures
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+from telq.tests.lnt import LNT
+from telq.util.times import TimeLike, format_time, parse_time
+
+
+@dataclass
+class BackfillWindow:
+    """A time window of a backfill, including `start` and excluding `end` unless it is the last one.
+
+    Attributes:
+        start (datetime): First creation time of the window.
+        end (datetime): Creation time ending the window.
+        last (bool): Whether the window ends the backfill, which then includes `end`.
+    """
+    start: dt.datetime
+    end: dt.datetime
+    last: bool = False
+
+    def contains(self, created_at: dt.datetime) -> bool:
+        return self.start <= created_at and (created_at < self.end or (self.last and created_at == self.end))
+
+    def split(self, parts: int) -> List["BackfillWindow"]:
+        step = (self.end - self.start) / parts
+        bounds = [self.start + step * i for i in range(parts)] + [self.end]
+        return [
+            BackfillWindow(start, end, self.last and i == parts - 1)
+            for i, (start, end) in enumerate(zip(bounds, bounds[1:]))
+        ]
+
+
+@dataclass
+class BackfillStats:
+    """Statistics of a backfill.
+
+    Attributes:
+        windows (int): Windows whose results were fetched.
+        splits (int): Windows subdivided because they had too many pages.
+        requests (int): Pages requested.
+        results (int): Results returned.
+        duplicates (int): Results dropped because their test was already returned.
+    """
+    windows: int = 0
+    splits: int = 0
+    requests: int = 0
+    results: int = 0
+    duplicates: int = 0
+
+
+class LNTBackfill:
+    """Fetches the LNT test results of a long time range on a pool of workers.
+
+    Paging deeply through one long range is slow and, while new tests keep arriving, pages
+    shift under the cursor. Instead, the range is split into time windows, and the pages of
+    each window are fetched by a worker. A window with more than `max_pages` pages is split
+    into smaller windows first, until windows are `min_window` long. Windows do not overlap:
+    a test created exactly at a boundary is only returned by the window it starts, and tests
+    returned twice by shifting pages are dropped.
+
+    Results of a window are returned in creation order, but windows are returned as
+    soon as they are fetched, so results of different windows can be interleaved.
+
+    Parameters
+    ----------
+    lnt : LNT
+        The client used to get the results, e.g. `telq_api.lnt`
+    window : timedelta, default 1 day
+        Length of the windows the range is split into initially
+    max_pages : int, default 10
+        Windows with more pages are split
+    size : int, default 100
+        Number of results per page
+    max_workers : int, default 4
+        Number of windows fetched at once
+    min_window : timedelta, default 1 second
+        Windows are not split below this length
+
+    Examples
+    --------
+    >>> backfill = LNTBackfill(telq_api.lnt, window=dt.timedelta(hours=6), max_workers=8)
+    >>> for result in backfill.run("2022-05-01T00:00:00Z", "2022-05-31T00:00:00Z"):
+    ...     store(result)
+    >>> backfill.stats
+    BackfillStats(windows=131, splits=3, requests=1302, results=129743, duplicates=0)
+    """ ""
+
+    def __init__(self, lnt: LNT, window: dt.timedelta = dt.timedelta(days=1), max_pages: int = 10, size: int = 100,
+                 max_workers: int = 4, min_window: dt.timedelta = dt.timedelta(seconds=1)):
+        self.lnt = lnt
+        self.window = window
+        self.max_pages = max(1, max_pages)
+        self.size = size
+        self.max_workers = max(1, max_workers)
+        self.min_window = min_window
+        self.stats = BackfillStats()
+        self._lock = threading.Lock()
+
+    def windows(self, date_from: TimeLike, date_to: Optional[TimeLike] = None) -> List[BackfillWindow]:
+        """Splits the range into the initial windows"""
+        start = parse_time(date_from)
+        end = parse_time(date_to) if date_to is not None else dt.datetime.now(dt.timezone.utc)
+        if end < start:
+            raise ValueError("date_to must not be before date_from")
+        parts = max(1, math.ceil((end - start) / self.window))
+        return BackfillWindow(start, end, last=True).split(parts)
+
+    def run(self, date_from: TimeLike, date_to: Optional[TimeLike] = None) -> Iterator[dict]:
+        """Yields the results of every test created between `date_from` and `date_to` (by default now)
+
+        Parameters
+        ----------
+        date_from : str or datetime
+            Creation time of the first tests, e.g. '2022-05-01T00:00:00Z'
+        date_to : str or datetime, optional
+            Creation time of the last tests, by default now
+        """ ""
+        pending = self.windows(date_from, date_to)
+        in_flight = set()
+        with futures.ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="telq-backfill") as executor:
+            try:
+                while pending or in_flight:
+                    while pending and len(in_flight) < self.max_workers:
+                        in_flight.add(executor.submit(self._fetch_window, pending.pop(0)))
+                    finished, in_flight = futures.wait(in_flight, return_when=futures.FIRST_COMPLETED)
+                    for future in finished:
+                        split, results = future.result()
+                        # fetch the smaller windows first, they continue where the split one started
+                        pending[:0] = split
+                        yield from results
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+    def _fetch_window(self, window: BackfillWindow) -> Tuple[List[BackfillWindow], List[dict]]:
+        """Returns the windows to fetch instead if the window is too large, else its results"""
+        date_from, date_to = format_time(window.start), format_time(window.end)
+        page = self.lnt.get_test_results(date_from, date_to, 1, self.size, "asc")
+        total = page.get("totalPages") or 1
+        parts = math.ceil(total / self.max_pages)
+        self._count(requests=1)
+        if parts > 1 and window.end - window.start >= self.min_window * 2:
+            parts = min(parts, int((window.end - window.start) / self.min_window))
+            self._count(splits=1)
+            return window.split(parts), []
+
+        contents = [page.get("content") or []]
+        for number in range(2, total + 1):
+            contents.append(self.lnt.get_test_results(date_from, date_to, number, self.size, "asc").get("content") or [])
+            self._count(requests=1)
+        seen = set()
+        results = []
+        duplicates = 0
+        for content in contents:
+            for result in content:
+                if not window.contains(parse_time(result["testCreatedAt"])):
+                    continue
+                if result.get("id") in seen:
+                    duplicates += 1
+                    continue
+                seen.add(result.get("id"))
+                results.append(result)
+        self._count(windows=1, results=len(results), duplicates=duplicates)
+        return [], results
+
+    def _count(self, **counts: int) -> None:
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self.stats, name, getattr(self.stats, name) + count)
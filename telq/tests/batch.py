@@ -0,0 +1,136 @@
+import json
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from telq.tests.model import Test
+from telq.transport import EncodedJSON
+
+# fields of a Test shared by every test of a batch
+TEMPLATE_FIELDS = ("sender", "text", "testIdTextType", "testIdTextCase", "testIdTextLength", "supplierId")
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class TestBatch:
+    """LNT tests sharing the same sender, text and supplier, stored as columns of destinations.
+
+    A list of tens of thousands of Test objects holds a dict per test, and serializing it
+    builds another one. A TestBatch only keeps three lists of interned strings (mcc, mnc
+    and portedFromMnc), and is encoded to JSON directly: the fields of the template are
+    encoded once, then each test only adds its destination. Pass it instead of a list of
+    Test to `LNT.initiate_new_tests`.
+
+    Parameters
+    ----------
+    sender : str
+        Sender of every test
+    text : str
+        Text of every test
+    supplierId : int
+        Supplier every test is sent through
+    testIdTextType : str, default 'ALPHA'
+    testIdTextCase : str, default 'MIXED'
+    testIdTextLength : int, default 7
+    mcc, mnc, portedFromMnc : Iterable[str], optional
+        Columns of destinations, as in `extend_columns`
+
+    Examples
+    --------
+    >>> batch = TestBatch("TelQ", "Hello", supplierId=12)
+    >>> batch.extend(network.destination() for network in catalog.by_country("Brazil"))
+    >>> batch.add("246", "03")
+    >>> telq_api.lnt.initiate_new_tests(batch)
+    """ ""
+
+    __slots__ = ("template", "mcc", "mnc", "portedFromMnc")
+
+    def __init__(self, sender: str, text: str, supplierId: int, testIdTextType: str = "ALPHA",
+                 testIdTextCase: str = "MIXED", testIdTextLength: int = 7, mcc: Iterable[str] = (),
+                 mnc: Iterable[str] = (), portedFromMnc: Optional[Iterable[Optional[str]]] = None):
+        self.template: Dict[str, Any] = {
+            "sender": sender, "text": text, "testIdTextType": testIdTextType, "testIdTextCase": testIdTextCase,
+            "testIdTextLength": testIdTextLength, "supplierId": supplierId,
+        }
+        self.mcc: List[str] = []
+        self.mnc: List[str] = []
+        self.portedFromMnc: List[Optional[str]] = []
+        self.extend_columns(mcc, mnc, portedFromMnc)
+
+    @classmethod
+    def from_tests(cls, tests: Iterable[Test]) -> List["TestBatch"]:
+        """Groups tests into batches, one per sender, text, supplier and testIdText settings"""
+        batches: Dict[tuple, TestBatch] = {}
+        for test in tests:
+            key = tuple(getattr(test, name) for name in TEMPLATE_FIELDS)
+            if key not in batches:
+                batches[key] = cls(**dict(zip(TEMPLATE_FIELDS, key)))
+            batches[key].add(test.mcc, test.mnc, test.portedFromMnc)
+        return list(batches.values())
+
+    def add(self, mcc: str, mnc: str, portedFromMnc: Optional[str] = None) -> None:
+        self.mcc.append(_intern(mcc))
+        self.mnc.append(_intern(mnc))
+        self.portedFromMnc.append(_intern(portedFromMnc))
+
+    def extend(self, destinations: Iterable[Dict[str, Optional[str]]]) -> None:
+        """Adds a test per destination, e.g. as returned by `Network.destination()`"""
+        for destination in destinations:
+            self.add(destination["mcc"], destination["mnc"], destination.get("portedFromMnc"))
+
+    def extend_columns(self, mcc: Iterable[str], mnc: Iterable[str],
+                       portedFromMnc: Optional[Iterable[Optional[str]]] = None) -> None:
+        """Adds a test per row of the columns, which must have the same length"""
+        mcc, mnc = [_intern(value) for value in mcc], [_intern(value) for value in mnc]
+        ported = [_intern(value) for value in portedFromMnc] if portedFromMnc is not None else [None] * len(mcc)
+        if not len(mcc) == len(mnc) == len(ported):
+            raise ValueError("mcc, mnc and portedFromMnc must have the same length")
+        self.mcc.extend(mcc)
+        self.mnc.extend(mnc)
+        self.portedFromMnc.extend(ported)
+
+    def __len__(self) -> int:
+        return len(self.mcc)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Test, "TestBatch"]:
+        if isinstance(index, slice):
+            batch = TestBatch(**self.template)
+            batch.mcc, batch.mnc, batch.portedFromMnc = self.mcc[index], self.mnc[index], self.portedFromMnc[index]
+            return batch
+        return Test(mcc=self.mcc[index], mnc=self.mnc[index], portedFromMnc=self.portedFromMnc[index],
+                    **self.template)
+
+    def __iter__(self) -> Iterator[Test]:
+        """Yields the tests as Test objects, one at a time"""
+        for index in range(len(self)):
+            yield self[index]
+
+    def __repr__(self) -> str:
+        return f"TestBatch({len(self)} tests, supplierId={self.template['supplierId']})"
+
+    def iter_json(self) -> Iterator[bytes]:
+        """Yields the JSON array of the tests in fragments, without building a dict per test"""
+        # every test starts with the same fields
+        prefix = json.dumps(self.template)[:-1].encode("utf-8") + b', "mcc": '
+        encoded: Dict[Optional[str], bytes] = {}
+
+        def encode(value: Optional[str]) -> bytes:
+            if value not in encoded:
+                encoded[value] = json.dumps(value).encode("utf-8")
+            return encoded[value]
+
+        yield b"["
+        for index, (mcc, mnc, ported) in enumerate(zip(self.mcc, self.mnc, self.portedFromMnc)):
+            yield b"".join((b", " if index else b"", prefix, encode(mcc), b', "mnc": ', encode(mnc),
+                            b', "portedFromMnc": ', encode(ported), b"}"))
+        yield b"]"
+
+    def to_json(self) -> bytes:
+        return b"".join(self.iter_json())
+
+    def request_body(self, data: Dict[str, Any]) -> EncodedJSON:
+        """Encodes the body of an LNT request, with this batch as its `tests`"""
+        options = json.dumps({key: value for key, value in data.items() if key != "tests"})
+        rest = b", " + options[1:].encode("utf-8") if options != "{}" else b"}"
+        return EncodedJSON(b'{"tests": ' + self.to_json() + rest)
@@ -1,10 +1,28 @@
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Sequence, Union
 
 from telq.endpoints import BatchResultsURL, TestsBatchURL
+from telq.tests.batch import TestBatch
 from telq.tests.model import Test
+from telq.transport import EncodedJSON
+from telq.util.bulk import BulkResult, is_rejected_batch, run_chunks
+from telq.util.paging import iter_items
 from telq.util.rest import TelQRest
 
 
+def _check_tests(tests: Union[List[Test], TestBatch]) -> None:
+    if len(tests) == 0:
+        raise KeyError(
+            "at least one test should be supplied in the tests parameter"
+        )
+
+    if not isinstance(tests, TestBatch):
+        for test in tests:
+            if not isinstance(test, Test):
+                raise KeyError(
+                    "test should be instance of Test class"
+                )
+
+
 class LNT(TelQRest):
     """ Launch batch tests with LNT API
 
@@ -22,7 +40,7 @@ class LNT(TelQRest):
 
     def initiate_new_tests(
         self,
-        tests: List[Test],
+        tests: Union[List[Test], TestBatch],
         smppValidityPeriod: Optional[int] = None,
         dataCoding: Optional[str] = None,
         sourceTon: Optional[str] = None,
@@ -43,8 +61,10 @@ class LNT(TelQRest):
 
         Parameters
         ----------
-        tests : List[Test]
-            List of tests in a batch. Test should be represented with Test class
+        tests : List[Test] or TestBatch
+            List of tests in a batch. Test should be represented with Test class.
+            Large batches of tests sharing sender, text and supplier are cheaper to build
+            and send as a TestBatch
         resultsCallbackUrl : Union[str, None], optional
             The callback URL where you would like to receive TestResult updates
             anytime your tests status changes, by default None
@@ -126,16 +146,119 @@ class LNT(TelQRest):
         return self.request(url, method, data, extra_headers=extra_headers)
 
 
+    def initiate_new_tests_bulk(
+        self,
+        tests: Union[List[Test], TestBatch],
+        smppValidityPeriod: Optional[int] = None,
+        dataCoding: Optional[str] = None,
+        sourceTon: Optional[str] = None,
+        sourceNpi: Optional[str] = None,
+        resultsCallbackUrl: Union[str, None] = None,
+        resultsCallbackToken: Optional[str] = None,
+        maxCallbackRetries: int = 3,
+        testTimeToLiveInSeconds: int = 3600,
+        scheduledDeliveryTime: Optional[str] = None,
+        replaceIfPresentFlag: bool = False,
+        priorityFlag: int = 1,
+        sendTextAsMessagePayloadTlv: bool = False,
+        commentText: Optional[str] = None,
+        tlv: Optional[List[Dict[str, str]]] = None,
+        udh: Optional[List[Dict[str, str]]] = None,
+        chunk_size: int = 500,
+        max_workers: int = 4,
+        split_rejected: bool = True,
+    ) -> BulkResult:
+        """Initiate a large batch of lnt tests, split into sub-batches sent concurrently
+
+        Every sub-batch of at most `chunk_size` tests is sent with the same SMPP and callback
+        options. Up to `max_workers` sub-batches are sent at once over the shared connection pool.
+        The API rejects a whole batch when one of its tests is invalid or when it is too large:
+        with `split_rejected`, a rejected sub-batch is split in halves sent again, down to single
+        tests, so only the tests actually rejected are reported as failed.
+
+        Parameters
+        ----------
+        tests : List[Test] or TestBatch
+            The tests, all of them are checked before any request is sent
+        smppValidityPeriod, dataCoding, sourceTon, sourceNpi, resultsCallbackUrl, resultsCallbackToken,
+        maxCallbackRetries, testTimeToLiveInSeconds, scheduledDeliveryTime, replaceIfPresentFlag, priorityFlag,
+        sendTextAsMessagePayloadTlv, commentText, tlv, udh
+            Applied to every sub-batch, see `initiate_new_tests`
+        chunk_size : int, optional
+            Maximum number of tests per request, by default 500
+        max_workers : int, optional
+            Maximum number of requests sent at once, by default 4
+        split_rejected : bool, optional
+            Split rejected sub-batches to find the tests rejected, by default True
+
+        Returns
+        -------
+        BulkResult
+            `results` holds the tests created, in the order of `tests`, and `failures` the tests
+            which failed with their error
+
+        Examples
+        --------
+        >>> result = telq_api.lnt.initiate_new_tests_bulk(tests, chunk_size=1000, commentText="campaign")
+        >>> for failure in result.failures:
+        ...     print(failure.start, failure.items, failure.error)
+        """ ""
+        url = TestsBatchURL(self._authentication.base_url, self._authentication.api_version).url()
+        method = "POST"
+        extra_headers = {}
+
+        if resultsCallbackToken:
+            extra_headers["results-callback-token"] = resultsCallbackToken
+
+        _check_tests(tests)
+        options = (smppValidityPeriod, dataCoding, sourceTon, sourceNpi, resultsCallbackUrl, maxCallbackRetries,
+                   testTimeToLiveInSeconds, scheduledDeliveryTime, replaceIfPresentFlag, priorityFlag,
+                   sendTextAsMessagePayloadTlv, commentText, tlv, udh)
+
+        def send(chunk: Sequence[Test]) -> list:
+            return self.request(url, method, self._validate_parse_data(chunk, *options),
+                                extra_headers=extra_headers)["response"]
+
+        return run_chunks(send, tests, chunk_size, max_workers, is_rejected_batch if split_rejected else None)
+
     def get_test_results(self, date_from: Optional[str] = None, date_to: Optional[str] = None, page: int = 1, size: int = 100, order: str = "asc"):
         url = (BatchResultsURL(self._authentication.base_url, self._authentication.api_version)
                .url(date_from, date_to, page, size, order))
         method = "GET"
         return self.request(url, method)
 
+    def iter_test_results(self, date_from: Optional[str] = None, date_to: Optional[str] = None, size: int = 100,
+                          order: str = "asc", prefetch: int = 4) -> Iterator[dict]:
+        """Yields the results of every test between `date_from` and `date_to`, one at a time and in order
+
+        Once the first page tells how many pages there are, up to `prefetch` following pages
+        are fetched concurrently while the current one is consumed, so memory use stays
+        bounded by `prefetch` pages however many results there are.
+
+        Parameters
+        ----------
+        date_from : str, optional
+            Only tests created at or after this time, e.g. '2022-05-13T00:00:00Z'
+        date_to : str, optional
+            Only tests created at or before this time
+        size : int, optional
+            Number of results per page, by default 100
+        order : str, optional
+            'asc' or 'desc' order of creation, by default 'asc'
+        prefetch : int, optional
+            Maximum number of pages fetched ahead, 1 fetches pages one after another, by default 4
+
+        Examples
+        --------
+        >>> for result in telq_api.lnt.iter_test_results("2022-05-13T00:00:00Z", "2022-05-14T00:00:00Z"):
+        ...     writer.writerow(result)
+        """ ""
+        return iter_items(lambda page: self.get_test_results(date_from, date_to, page, size, order), prefetch)
+
 
     def _validate_parse_data(
         self,
-        tests: List[Test],
+        tests: Union[List[Test], TestBatch],
         smppValidityPeriod: Optional[int] = None,
         dataCoding: Optional[str] = None,
         sourceTon: Optional[str] = None,
@@ -150,20 +273,11 @@ class LNT(TelQRest):
         commentText: Optional[str] = None,
         tlv: Optional[List[Dict[str, str]]] = None,
         udh: Optional[List[Dict[str, str]]] = None,
-    ) -> Dict[str, str]:
-        if len(tests) == 0:
-            raise KeyError(
-                "at least one test should be supplied in the tests parameter"
-            )
-
-        for test in tests:
-            if not isinstance(test, Test):
-                raise KeyError(
-                    "test should be instance of Test class"
-                )
+    ) -> Union[Dict[str, str], EncodedJSON]:
+        _check_tests(tests)
 
         data = {
-            "tests": [test.__dict__ for test in tests],
+            "tests": tests if isinstance(tests, TestBatch) else [test.__dict__ for test in tests],
             "resultsCallbackUrl": resultsCallbackUrl,
             "maxCallbackRetries": maxCallbackRetries,
             "dataCoding": dataCoding,
@@ -179,4 +293,7 @@ class LNT(TelQRest):
             "tlv": tlv,
             "udh": udh
         }
+        if isinstance(tests, TestBatch):
+            # encoded column-wise, without a dict per test
+            return tests.request_body(data)
         return data
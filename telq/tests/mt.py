@@ -1,6 +1,7 @@
 from typing import Dict, List, Union
 
 from telq.endpoints import ResultsURL, TestsURL
+from telq.util.bulk import BulkResult, run_chunks
 from telq.util.rest import TelQRest
 
 
@@ -85,6 +86,67 @@ class MT(TelQRest):
 
         return self.request(url, method, data)
 
+    def initiate_new_tests_bulk(
+        self,
+        destinationNetworks: List[Dict[str, str]],
+        resultsCallbackUrl: Union[str, None] = None,
+        maxCallbackRetries: int = 3,
+        testIdTextType: str = "ALPHA",
+        testIdTextCase: str = "MIXED",
+        testIdTextLength: int = 10,
+        testTimeToLiveInSeconds: int = 3600,
+        chunk_size: int = 100,
+        max_workers: int = 4,
+    ) -> BulkResult:
+        """Initiate new tests for a large list of destination networks
+
+        The destinations are split into chunks of `chunk_size` networks, each created with its own
+        request. Up to `max_workers` requests are sent at once over the shared connection pool.
+        A failed chunk does not fail the others: it is reported in the result, with its
+        destinations so they can be submitted again.
+
+        Parameters
+        ----------
+        destinationNetworks : List[Dict[str, str]]
+            The list of networks you want to issue tests to, see `initiate_new_tests`.
+            All of them are validated before any request is sent
+        resultsCallbackUrl, maxCallbackRetries, testIdTextType, testIdTextCase, testIdTextLength, testTimeToLiveInSeconds
+            Applied to every test, see `initiate_new_tests`
+        chunk_size : int, optional
+            Maximum number of destination networks per request, by default 100
+        max_workers : int, optional
+            Maximum number of requests sent at once, by default 4
+
+        Returns
+        -------
+        BulkResult
+            `results` holds the Test objects of every chunk created, in the order of `destinationNetworks`,
+            and `failures` the chunks which failed with their error
+
+        Examples
+        --------
+        >>> result = telq_api.mt.initiate_new_tests_bulk(networks, chunk_size=200)
+        >>> if not result.ok:
+        ...     retried = telq_api.mt.initiate_new_tests_bulk(result.failed_items())
+        """ ""
+        url = TestsURL(self._authentication.base_url, self._authentication.api_version).url()
+        method = "POST"
+
+        data = self._validate_parse_data(
+            destinationNetworks,
+            resultsCallbackUrl,
+            maxCallbackRetries,
+            testIdTextType,
+            testIdTextCase,
+            testIdTextLength,
+            testTimeToLiveInSeconds,
+        )
+
+        def send(chunk: List[Dict[str, str]]) -> list:
+            return self.request(url, method, dict(data, destinationNetworks=chunk))["response"]
+
+        return run_chunks(send, destinationNetworks, chunk_size, max_workers)
+
     def get_test_results(self, test_id: int):
         url = ResultsURL(self._authentication.base_url, self._authentication.api_version).url(test_id=test_id)
         method = "GET"
@@ -0,0 +1,209 @@
+import heapq
+import time
+from concurrent import futures
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from telq.tests.mt import MT
+from telq.util.times import parse_time
+
+# testStatus of tests still waiting for the message, every other status is final
+PENDING_STATUSES = frozenset({"WAIT"})
+
+# testTimeToLiveInSeconds of the API when tests are created without one
+DEFAULT_TIME_TO_LIVE = 3600
+
+
+@dataclass
+class PollSchedule:
+    """Decides how often the results of a test are polled.
+
+    A test is polled again after a delay proportional to its age, so young tests, which
+    are usually delivered within seconds, are polled often and older tests less and less.
+    The delay is kept between `min_interval` and `max_interval` and below `ttl_fraction`
+    of the test's time to live. A test still pending `grace` seconds after its time to live
+    is no longer polled.
+
+    Attributes:
+        min_interval (float): Shortest delay between two polls of a test, in seconds. (default: 1)
+        max_interval (float): Longest delay between two polls of a test, in seconds. (default: 60)
+        growth (float): Delay as a fraction of the age of the test. (default: 0.25)
+        ttl_fraction (float): Longest delay as a fraction of the time to live. (default: 0.05)
+        grace (float): Seconds a test is polled after its time to live. (default: 60)
+    """
+    min_interval: float = 1.0
+    max_interval: float = 60.0
+    growth: float = 0.25
+    ttl_fraction: float = 0.05
+    grace: float = 60.0
+
+    def interval(self, age: float, time_to_live: float) -> float:
+        """Seconds to wait before polling again a test `age` seconds old"""
+        longest = min(self.max_interval, time_to_live * self.ttl_fraction)
+        return max(self.min_interval, min(longest, age * self.growth))
+
+    def expired(self, age: float, time_to_live: float) -> bool:
+        return age >= time_to_live + self.grace
+
+
+@dataclass
+class PollResult:
+    """Outcome of polling a test.
+
+    Attributes:
+        test_id (int): Id of the test.
+        result (dict): The last test result received, None if every poll failed.
+        polls (int): Number of requests sent for the test.
+        error (Exception): Error of the last poll, if it failed.
+    """
+    test_id: int
+    result: Optional[dict]
+    polls: int = 0
+    error: Optional[Exception] = None
+
+    @property
+    def status(self) -> Optional[str]:
+        return self.result.get("testStatus") if self.result else None
+
+    @property
+    def done(self) -> bool:
+        """Whether the test reached a final status, as opposed to the poller giving up on it"""
+        return self.status is not None and self.status not in PENDING_STATUSES
+
+
+def _time_to_live(time_to_live: Union[float, Mapping[int, float]], test_id: int) -> float:
+    if isinstance(time_to_live, Mapping):
+        return time_to_live.get(test_id, DEFAULT_TIME_TO_LIVE)
+    return time_to_live
+
+
+class _PollState:
+    """Polling progress of one test"""
+
+    __slots__ = ("test_id", "created", "time_to_live", "polls", "result", "error")
+
+    def __init__(self, test_id: int, created: float, time_to_live: float):
+        self.test_id = test_id
+        # time the test was created, the time polling started until a result tells
+        self.created = created
+        self.time_to_live = time_to_live
+        self.polls = 0
+        self.result: Optional[dict] = None
+        self.error: Optional[Exception] = None
+
+    def age(self, now: float) -> float:
+        return now - self.created
+
+    def outcome(self) -> PollResult:
+        return PollResult(self.test_id, self.result, self.polls, self.error)
+
+
+class ResultPoller:
+    """Polls the results of many MT tests until they reach a final status.
+
+    Tests are polled concurrently, with at most `max_in_flight` requests at once across all
+    tests. Each test is polled on its own schedule (see PollSchedule) and results are returned
+    as soon as each test completes, so the fastest deliveries are known first while tests
+    still waiting cost fewer and fewer requests.
+
+    Parameters
+    ----------
+    mt : MT
+        The client used to get the results, e.g. `telq_api.mt`
+    schedule : PollSchedule, optional
+        When to poll each test, the default schedule if not given
+    max_in_flight : int, default 8
+        Maximum number of requests sent at once
+    clock : Callable[[], float], default time.time
+        Returns the current time in seconds since the epoch, the age of a test is measured
+        from its testCreatedAt
+    sleep : Callable[[float], None], default time.sleep
+        Waits for the given seconds when no test is due
+
+    Examples
+    --------
+    >>> tests = telq_api.mt.initiate_new_tests(networks)["response"]
+    >>> poller = ResultPoller(telq_api.mt, max_in_flight=4)
+    >>> for polled in poller.as_completed(test["id"] for test in tests if test["id"]):
+    ...     print(polled.test_id, polled.status)
+    13754642 POSITIVE
+    """ ""
+
+    def __init__(self, mt: MT, schedule: Optional[PollSchedule] = None, max_in_flight: int = 8,
+                 clock: Callable[[], float] = time.time, sleep: Callable[[float], None] = time.sleep):
+        self.mt = mt
+        self.schedule = schedule or PollSchedule()
+        self.max_in_flight = max(1, max_in_flight)
+        self.clock = clock
+        self.sleep = sleep
+
+    def as_completed(self, test_ids: Iterable[int], time_to_live: Union[float, Mapping[int, float]] = 3600,
+                     callback: Optional[Callable[[PollResult], None]] = None) -> Iterator[PollResult]:
+        """Polls the tests and yields each one once it reached a final status or expired.
+
+        The age of each test is measured from the testCreatedAt of its results, so tests
+        created long before polling starts are given up on at the right time.
+
+        Parameters
+        ----------
+        test_ids : Iterable[int]
+            Ids of the tests to poll
+        time_to_live : float or Mapping[int, float], default 3600
+            testTimeToLiveInSeconds the tests were created with, or a mapping of test id to
+            testTimeToLiveInSeconds when tests were created with different ones. A
+            testTimeToLiveInSeconds returned with the results takes precedence
+        callback : Callable[[PollResult], None], optional
+            Also called with each result, before it is yielded
+        """ ""
+        now = self.clock()
+        states = {test_id: _PollState(test_id, now, _time_to_live(time_to_live, test_id)) for test_id in test_ids}
+        due: List[Tuple[float, int]] = [(now, test_id) for test_id in states]
+        heapq.heapify(due)
+        in_flight: Dict = {}
+        with futures.ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="telq-poller") as executor:
+            while due or in_flight:
+                now = self.clock()
+                while due and due[0][0] <= now and len(in_flight) < self.max_in_flight:
+                    _, test_id = heapq.heappop(due)
+                    in_flight[executor.submit(self.mt.get_test_results, test_id)] = states[test_id]
+                if not in_flight:
+                    self.sleep(due[0][0] - now)
+                    continue
+                next_due = due[0][0] - now if due and len(in_flight) < self.max_in_flight else None
+                finished, _ = futures.wait(list(in_flight), timeout=next_due, return_when=futures.FIRST_COMPLETED)
+                for future in finished:
+                    state = in_flight.pop(future)
+                    error = future.exception()
+                    result = future.result() if error is None else None
+                    now = self.clock()
+                    outcome = _record_poll(state, error, result, self.schedule, now)
+                    if outcome is None:
+                        interval = self.schedule.interval(state.age(now), state.time_to_live)
+                        heapq.heappush(due, (now + interval, state.test_id))
+                        continue
+                    if callback is not None:
+                        callback(outcome)
+                    yield outcome
+
+    def wait(self, test_ids: Iterable[int],
+             time_to_live: Union[float, Mapping[int, float]] = 3600) -> Dict[int, PollResult]:
+        """Polls the tests until all of them reached a final status or expired"""
+        return {outcome.test_id: outcome for outcome in self.as_completed(test_ids, time_to_live)}
+
+
+def _record_poll(state: _PollState, error: Optional[Exception], result: Optional[dict], schedule: PollSchedule,
+                 now: float) -> Optional[PollResult]:
+    """Records the outcome of a poll, returns the result if the test is no longer polled"""
+    state.polls += 1
+    state.error = error
+    if error is None:
+        state.result = result
+        if result.get("testStatus") not in PENDING_STATUSES:
+            return state.outcome()
+        if result.get("testCreatedAt"):
+            state.created = parse_time(result["testCreatedAt"]).timestamp()
+        if result.get("testTimeToLiveInSeconds"):
+            state.time_to_live = result["testTimeToLiveInSeconds"]
+    if schedule.expired(state.age(now), state.time_to_live):
+        return state.outcome()
+    return None
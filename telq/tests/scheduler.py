@@ -0,0 +1,217 @@
+import datetime as dt
+import heapq
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from telq.tests.lnt import LNT
+from telq.tests.model import Test
+from telq.util.bulk import BulkResult, ChunkFailure
+
+# throughput the API gives sessions created without one, in SMS per second
+DEFAULT_THROUGHPUT = 5
+# window size the API gives sessions created without one
+DEFAULT_WINDOW_SIZE = 1
+
+
+class SessionTopology:
+    """Which SMPP session each supplier sends through, and the throughput and window size of each session.
+
+    Parameters
+    ----------
+    sessions : Iterable[dict]
+        Sessions as returned by `Session.list`, with smppSessionId, throughput and windowSize
+    suppliers : Iterable[dict]
+        Suppliers as returned by `Supplier.list`, with supplierId and smppSessionId
+    """ ""
+
+    def __init__(self, sessions: Iterable[dict], suppliers: Iterable[dict]):
+        sessions = list(sessions)
+        self.throughput: Dict[int, int] = {
+            session["smppSessionId"]: session.get("throughput") or DEFAULT_THROUGHPUT for session in sessions
+        }
+        self.window_size: Dict[int, int] = {
+            session["smppSessionId"]: session.get("windowSize") or DEFAULT_WINDOW_SIZE for session in sessions
+        }
+        self.session_of: Dict[int, int] = {supplier["supplierId"]: supplier["smppSessionId"] for supplier in suppliers}
+
+    @classmethod
+    def load(cls, session, supplier, size: Optional[int] = None) -> "SessionTopology":
+        """Lists every session and supplier, e.g. `SessionTopology.load(telq_api.session, telq_api.supplier)`.
+        `size` is the number of items per page, chosen by iter_all by default"""
+        return cls(session.iter_all(size), supplier.iter_all(size))
+
+    def session_for(self, supplier_id: int) -> int:
+        if supplier_id not in self.session_of:
+            raise ValueError(f"Supplier {supplier_id} is not bound to a known SMPP session")
+        return self.session_of[supplier_id]
+
+
+@dataclass
+class SessionPlan:
+    """Tests scheduled on one SMPP session.
+
+    Attributes:
+        smppSessionId (int): Id of the session.
+        throughput (float): SMS per second the tests are submitted at.
+        tests (int): Number of tests sent through the session.
+        duration (float): Seconds the session takes to send them.
+    """
+    smppSessionId: int
+    throughput: float
+    tests: int
+    duration: float
+
+
+@dataclass
+class SchedulePlan:
+    """Expected progress of a campaign.
+
+    Attributes:
+        sessions (Dict[int, SessionPlan]): Plan of each session used, by smppSessionId.
+        started_at (float): Time the campaign starts, in seconds since the epoch.
+    """
+    sessions: Dict[int, SessionPlan] = field(default_factory=dict)
+    started_at: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        """Seconds until the slowest session sent its tests, sessions sending in parallel"""
+        return max((plan.duration for plan in self.sessions.values()), default=0.0)
+
+    @property
+    def completes_at(self) -> dt.datetime:
+        """Expected time the last test is sent"""
+        return dt.datetime.fromtimestamp(self.started_at + self.duration, dt.timezone.utc)
+
+
+class LNTScheduler:
+    """Submits large LNT campaigns paced to the throughput of the SMPP sessions.
+
+    Sending a whole campaign at once queues it on the sessions, which send `throughput` SMS
+    per second each: tests at the end of a long queue are only sent after their time to live
+    and expire. Instead, the tests of each session are submitted in small batches, each one
+    once the tests submitted before are nearly sent (at most `lead` seconds of SMS wait on a
+    session), and batches of different sessions are interleaved so every session runs near
+    its throughput at the same time. At most `windowSize` batches are in flight on a session,
+    i.e. submitted but not yet expected to be sent: with a window size of 1, each batch is
+    only submitted once the previous one is expected to be sent, whatever `lead` is.
+
+    Parameters
+    ----------
+    lnt : LNT
+        The client used to submit the tests, e.g. `telq_api.lnt`
+    topology : SessionTopology
+        Sessions and suppliers, e.g. `SessionTopology.load(telq_api.session, telq_api.supplier)`
+    utilization : float, default 0.9
+        Fraction of the throughput of each session used, leaving room for other traffic
+    interval : float, default 1
+        Seconds of SMS submitted per batch, so a session with a throughput of 20 gets batches
+        of 18 tests at the default utilization
+    lead : float, default 2
+        Seconds of SMS queued on a session when the next batch is submitted, to absorb the
+        latency of the requests
+    clock : Callable[[], float], default time.time
+        Returns the current time in seconds since the epoch
+    sleep : Callable[[float], None], default time.sleep
+        Waits for the given seconds until the next batch is due
+
+    Examples
+    --------
+    >>> scheduler = LNTScheduler(telq_api.lnt, SessionTopology.load(telq_api.session, telq_api.supplier))
+    >>> scheduler.plan(tests).completes_at
+    datetime.datetime(2022, 5, 13, 20, 4, 12, tzinfo=datetime.timezone.utc)
+    >>> result = scheduler.run(tests, testTimeToLiveInSeconds=600)
+    """ ""
+
+    def __init__(self, lnt: LNT, topology: SessionTopology, utilization: float = 0.9, interval: float = 1.0,
+                 lead: float = 2.0, clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.lnt = lnt
+        self.topology = topology
+        self.utilization = utilization
+        self.interval = interval
+        self.lead = lead
+        self.clock = clock
+        self.sleep = sleep
+
+    def window_size(self, session_id: int) -> int:
+        """Maximum number of batches in flight on a session"""
+        return max(1, self.topology.window_size.get(session_id, DEFAULT_WINDOW_SIZE))
+
+    def rate(self, session_id: int) -> float:
+        """SMS per second submitted to a session"""
+        return self.topology.throughput.get(session_id, DEFAULT_THROUGHPUT) * self.utilization
+
+    def plan(self, tests: Iterable[Test]) -> SchedulePlan:
+        """Estimates how long sending the tests takes, without sending them"""
+        plan = SchedulePlan(started_at=self.clock())
+        for session_id, positions in self._by_session(list(tests)).items():
+            rate = self.rate(session_id)
+            plan.sessions[session_id] = SessionPlan(session_id, rate, len(positions), len(positions) / rate)
+        return plan
+
+    def run(self, tests: Iterable[Test], **options: Any) -> BulkResult:
+        """Submits the tests paced per session and returns once all of them are submitted.
+
+        Parameters
+        ----------
+        tests : Iterable[Test]
+            The tests, their supplierId decides the session they are sent through
+        options
+            Applied to every batch, see `LNT.initiate_new_tests`, e.g. testTimeToLiveInSeconds
+
+        Returns
+        -------
+        BulkResult
+            `results` holds the tests created, in the order of `tests`, and `failures` the batches
+            which failed with their error. Failures do not stop the other batches
+        """ ""
+        tests = list(tests)
+        now = self.clock()
+        batches: Dict[int, List[List[int]]] = {}
+        for session_id, positions in self._by_session(tests).items():
+            size = max(1, math.ceil(self.rate(session_id) * self.interval))
+            batches[session_id] = [positions[start:start + size] for start in range(0, len(positions), size)]
+        # time each session is expected to have sent everything submitted to it
+        free_at = {session_id: now for session_id in batches}
+        # time each batch submitted to a session is expected to be sent, the last `windowSize` ones
+        in_flight: Dict[int, List[float]] = {session_id: [] for session_id in batches}
+        due: List[Tuple[float, int]] = [(now, session_id) for session_id in batches]
+        heapq.heapify(due)
+
+        created: Dict[int, dict] = {}
+        failures: List[ChunkFailure] = []
+        index = 0
+        while due:
+            at, session_id = heapq.heappop(due)
+            wait = at - self.clock()
+            if wait > 0:
+                self.sleep(wait)
+            positions = batches[session_id].pop(0)
+            try:
+                response = self.lnt.initiate_new_tests([tests[position] for position in positions], **options)
+                created.update(zip(positions, response["response"]))
+            except Exception as e:
+                failures.append(ChunkFailure(index, positions[0], [tests[position] for position in positions], e))
+            index += 1
+            free_at[session_id] = max(self.clock(), free_at[session_id]) + len(positions) / self.rate(session_id)
+            window = self.window_size(session_id)
+            in_flight[session_id] = (in_flight[session_id] + [free_at[session_id]])[-window:]
+            if batches[session_id]:
+                next_at = free_at[session_id] - self.lead
+                if len(in_flight[session_id]) == window:
+                    # the window is full until its oldest batch is sent
+                    next_at = max(next_at, in_flight[session_id][0])
+                heapq.heappush(due, (next_at, session_id))
+
+        return BulkResult([created[position] for position in sorted(created)],
+                          sorted(failures, key=lambda failure: failure.start))
+
+    def _by_session(self, tests: List[Test]) -> Dict[int, List[int]]:
+        """Positions of the tests sent through each session, checking every supplier is known"""
+        positions: Dict[int, List[int]] = {}
+        for position, test in enumerate(tests):
+            positions.setdefault(self.topology.session_for(test.supplierId), []).append(position)
+        return positions
@@ -0,0 +1,249 @@
+import datetime as dt
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from telq.tests.lnt import LNT
+from telq.tests.poller import PENDING_STATUSES
+from telq.util.times import TimeLike, format_time, parse_time
+
+
+@dataclass
+class SyncCheckpoint:
+    """Where an LNTSync stopped.
+
+    Attributes:
+        watermark (str): testCreatedAt of the newest test returned, None before the first sync.
+        boundary_ids (List[int]): Ids of the tests created exactly at `watermark`.
+        pending (Dict[int, dict]): testCreatedAt and testStatus of the tests returned while still pending.
+    """
+    watermark: Optional[str] = None
+    boundary_ids: List[int] = field(default_factory=list)
+    pending: Dict[int, dict] = field(default_factory=dict)
+
+    def windows(self, gap: dt.timedelta) -> List[Tuple[dt.datetime, Optional[dt.datetime]]]:
+        """Creation time ranges the next sync fetches, oldest first: one per group of pending tests
+        created within `gap` of each other, the last one starting at the watermark (or the pending
+        tests within `gap` of it) and open-ended. Empty before the first sync"""
+        if self.watermark is None:
+            return []
+        watermark = parse_time(self.watermark)
+        times = sorted(parse_time(test["testCreatedAt"]) for test in self.pending.values())
+        windows = []
+        for created_at in [created_at for created_at in times if created_at < watermark] + [watermark]:
+            if windows and created_at - windows[-1][1] <= gap:
+                windows[-1][1] = created_at
+            else:
+                windows.append([created_at, created_at])
+        windows[-1][1] = None
+        return [(date_from, date_to) for date_from, date_to in windows]
+
+    def to_dict(self) -> dict:
+        return {
+            "watermark": self.watermark,
+            "boundaryIds": self.boundary_ids,
+            "pending": {str(test_id): test for test_id, test in self.pending.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SyncCheckpoint":
+        return cls(
+            data.get("watermark"),
+            list(data.get("boundaryIds") or []),
+            {int(test_id): test for test_id, test in (data.get("pending") or {}).items()},
+        )
+
+
+class FileCheckpointStore:
+    """Keeps the checkpoint of an LNTSync in a JSON file, replaced atomically on each save"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[SyncCheckpoint]:
+        try:
+            with open(self.path) as checkpoint_file:
+                return SyncCheckpoint.from_dict(json.load(checkpoint_file))
+        except FileNotFoundError:
+            return None
+
+    def save(self, checkpoint: SyncCheckpoint) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # write to a temporary file first so a crash never leaves a partially written checkpoint
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".checkpoint-")
+        try:
+            with os.fdopen(fd, "w") as checkpoint_file:
+                json.dump(checkpoint.to_dict(), checkpoint_file)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+class SQLiteCheckpointStore:
+    """Keeps checkpoints of LNTSync in a SQLite database, one row per `name`, so several
+    syncs (e.g. one per account) can share a database"""
+
+    def __init__(self, path: str, name: str = "lnt"):
+        self.path = path
+        self.name = name
+        with self._connect() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS telq_checkpoints (name TEXT PRIMARY KEY, data TEXT NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def load(self) -> Optional[SyncCheckpoint]:
+        connection = self._connect()
+        try:
+            row = connection.execute("SELECT data FROM telq_checkpoints WHERE name = ?", (self.name,)).fetchone()
+        finally:
+            connection.close()
+        return SyncCheckpoint.from_dict(json.loads(row[0])) if row else None
+
+    def save(self, checkpoint: SyncCheckpoint) -> None:
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("INSERT OR REPLACE INTO telq_checkpoints (name, data) VALUES (?, ?)",
+                                   (self.name, json.dumps(checkpoint.to_dict())))
+        finally:
+            connection.close()
+
+
+@dataclass
+class SyncStats:
+    """Statistics of the last run of an LNTSync.
+
+    Attributes:
+        fetched (int): Results downloaded.
+        new (int): Results of tests not returned before.
+        updated (int): Results of pending tests whose testStatus changed.
+        pending (int): Tests still pending after the run.
+        expired (int): Pending tests no longer followed because they are older than `pending_ttl`.
+    """
+    fetched: int = 0
+    new: int = 0
+    updated: int = 0
+    pending: int = 0
+    expired: int = 0
+
+
+class LNTSync:
+    """Incrementally syncs LNT test results, e.g. from a job running every minute.
+
+    The checkpoint keeps the creation time of the newest test returned (the watermark) and
+    the few tests returned while still pending. Each run fetches the tests created since the
+    watermark, and yields the results of tests created after it and of pending tests whose
+    testStatus changed; results already returned in their final status are skipped. The
+    checkpoint is saved once the run was fully consumed, so results of a run interrupted
+    midway are returned again by the next one.
+
+    As the API only filters results by creation time, pending tests older than the watermark
+    are re-checked by fetching the tests created around them: pending tests created within
+    `pending_gap` of each other share a query, and those within `pending_gap` of the
+    watermark are fetched by the query starting at the watermark. Each run therefore costs
+    one query per isolated group of pending tests, plus the results created within the
+    groups, which are downloaded again even when already returned. Tests still pending
+    `pending_ttl` after their creation are no longer followed.
+
+    Parameters
+    ----------
+    lnt : LNT
+        The client used to get the results, e.g. `telq_api.lnt`
+    store : FileCheckpointStore or SQLiteCheckpointStore
+        Where the checkpoint is loaded from and saved to
+    start : str or datetime, optional
+        Creation time of the first tests synced when there is no checkpoint yet,
+        by default every test
+    pending_ttl : timedelta, default 3 hours 5 minutes
+        How long after their creation pending tests are followed
+    pending_gap : timedelta, default 1 minute
+        Pending tests created closer than this are re-checked by the same query
+    size : int, default 100
+        Number of results per page
+    prefetch : int, default 4
+        Maximum number of pages fetched ahead, see LNT.iter_test_results
+    clock : Callable[[], float], default time.time
+        Returns the current time in seconds since the epoch
+
+    Examples
+    --------
+    >>> sync = LNTSync(telq_api.lnt, SQLiteCheckpointStore("telq.db"), start="2022-05-01T00:00:00Z")
+    >>> for result in sync.run():
+    ...     upsert(result)
+    >>> sync.stats
+    SyncStats(fetched=214, new=12, updated=9, pending=3, expired=0)
+    """ ""
+
+    def __init__(self, lnt: LNT, store, start: Optional[TimeLike] = None,
+                 pending_ttl: dt.timedelta = dt.timedelta(hours=3, minutes=5),
+                 pending_gap: dt.timedelta = dt.timedelta(minutes=1), size: int = 100, prefetch: int = 4,
+                 clock: Callable[[], float] = time.time):
+        self.lnt = lnt
+        self.store = store
+        self.start = parse_time(start) if start is not None else None
+        self.pending_ttl = pending_ttl
+        self.pending_gap = pending_gap
+        self.size = size
+        self.prefetch = prefetch
+        self.clock = clock
+        self.stats = SyncStats()
+
+    def run(self) -> Iterator[dict]:
+        """Yields the new and updated results since the last checkpoint, then saves the new checkpoint"""
+        self.stats = stats = SyncStats()
+        previous = self.store.load() or SyncCheckpoint()
+        windows = previous.windows(self.pending_gap) or [(self.start, None)]
+        watermark = parse_time(previous.watermark) if previous.watermark is not None else None
+        boundary_ids = set(previous.boundary_ids)
+        pending = dict(previous.pending)
+        seen = set()
+
+        for result in self._results(windows):
+            test_id = result["id"]
+            if test_id in seen:
+                continue
+            seen.add(test_id)
+            stats.fetched += 1
+            created_at = parse_time(result["testCreatedAt"])
+            status = result.get("testStatus")
+            followed = pending.pop(test_id, None)
+            if status in PENDING_STATUSES:
+                pending[test_id] = {"testCreatedAt": result["testCreatedAt"], "testStatus": status}
+
+            if watermark is None or created_at > watermark:
+                watermark, boundary_ids = created_at, {test_id}
+            elif created_at == watermark and test_id not in boundary_ids:
+                boundary_ids.add(test_id)
+            elif followed is not None:
+                if followed.get("testStatus") != status:
+                    stats.updated += 1
+                    yield result
+                continue
+            else:
+                # returned before in its final status
+                continue
+            stats.new += 1
+            yield result
+
+        expired_before = dt.datetime.fromtimestamp(self.clock(), dt.timezone.utc) - self.pending_ttl
+        for test_id in [test_id for test_id, test in pending.items()
+                        if parse_time(test["testCreatedAt"]) < expired_before]:
+            del pending[test_id]
+            stats.expired += 1
+        stats.pending = len(pending)
+        self.store.save(SyncCheckpoint(
+            format_time(watermark) if watermark is not None else None, sorted(boundary_ids), pending,
+        ))
+
+    def _results(self, windows: List[Tuple[Optional[dt.datetime], Optional[dt.datetime]]]) -> Iterator[dict]:
+        for date_from, date_to in windows:
+            yield from self.lnt.iter_test_results(format_time(date_from) if date_from else None,
+                                                  format_time(date_to) if date_to else None,
+                                                  self.size, "asc", self.prefetch)
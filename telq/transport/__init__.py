@@ -0,0 +1,112 @@
+import json as jsonlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    from telq.util.pool import PoolConfig
+
+# requests is imported when first needed, so that `import telq` stays cheap
+
+
+@dataclass
+class TransportResponse:
+    """HTTP response returned by a transport.
+
+    It exposes the subset of `requests.Response` used by the SDK, so responses from
+    requests can be returned by a transport as they are.
+
+    Attributes:
+        status_code (int): HTTP status code.
+        content (bytes): Raw response body.
+        headers (dict): Response headers.
+        url (str): URL the request was sent to.
+    """
+    status_code: int
+    content: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+    url: str = ""
+
+    def __post_init__(self) -> None:
+        from requests.structures import CaseInsensitiveDict
+        self.headers = CaseInsensitiveDict(self.headers)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def json(self) -> Any:
+        return jsonlib.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if 400 <= self.status_code < 600:
+            import requests
+            kind = "Client" if self.status_code < 500 else "Server"
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} {kind} Error for url: {self.url}", response=self
+            )
+
+
+@dataclass(frozen=True)
+class EncodedJSON:
+    """A request body already encoded as JSON, passed as `json` to a transport to be sent as it is,
+    e.g. by `telq.tests.batch.TestBatch` which encodes large batches without building dicts.
+
+    Attributes:
+        content (bytes): The encoded body.
+    """
+    content: bytes
+
+
+def body_arguments(json: Optional[Any]) -> Dict[str, Any]:
+    """Keyword arguments of requests and aiohttp sending `json` as the request body"""
+    if isinstance(json, EncodedJSON):
+        return {"data": json.content}
+    return {"json": json}
+
+
+class Transport(ABC):
+    """Sends HTTP requests on behalf of the blocking clients.
+
+    Every request of TelQTelecomAPI, including authentication, goes through its transport,
+    so the network can be replaced, e.g. by `telq.transport.fake.FakeTransport` for offline testing.
+    """ ""
+
+    @abstractmethod
+    def request(self, method: str, url: str, headers: Optional[dict] = None, json: Optional[Any] = None) -> TransportResponse:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class AsyncTransport(ABC):
+    """Sends HTTP requests on behalf of the asyncio clients, see Transport"""
+
+    @abstractmethod
+    async def request(self, method: str, url: str, headers: Optional[dict] = None, json: Optional[Any] = None) -> TransportResponse:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class RequestsTransport(Transport):
+    """Transport sending requests over a pooled requests session
+
+    Parameters
+    ----------
+    pool : PoolConfig, optional
+        Connection pool settings of the underlying session
+    """ ""
+
+    def __init__(self, pool: Optional["PoolConfig"] = None):
+        from telq.util.pool import PooledSession
+        self.session = PooledSession(pool)
+
+    def request(self, method: str, url: str, headers: Optional[dict] = None, json: Optional[Any] = None) -> TransportResponse:
+        # requests.Response already provides the TransportResponse interface
+        return self.session.request(method, url, headers=headers, **body_arguments(json))
+
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,548 @@
+import asyncio
+import datetime as dt
+import hashlib
+import itertools
+import json as jsonlib
+import math
+import random
+import re
+import string
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from telq.endpoints import endpoint_key
+from telq.transport import AsyncTransport, EncodedJSON, Transport, TransportResponse
+
+DEFAULT_NETWORKS = [
+    {"mcc": "350", "countryName": "Bermuda", "mnc": "01", "providerName": "Digicel",
+     "portedFromMnc": None, "portedFromProviderName": None},
+    {"mcc": "310", "countryName": "United States of America", "mnc": "012", "providerName": "Verizon",
+     "portedFromMnc": "260", "portedFromProviderName": "T-Mobile"},
+    {"mcc": "310", "countryName": "United States of America", "mnc": "260", "providerName": "T-Mobile",
+     "portedFromMnc": None, "portedFromProviderName": None},
+    {"mcc": "246", "countryName": "Lithuania", "mnc": "03", "providerName": "Tele2",
+     "portedFromMnc": "02", "portedFromProviderName": "BITE"},
+    {"mcc": "364", "countryName": "Bahamas", "mnc": "49", "providerName": "Aliv",
+     "portedFromMnc": None, "portedFromProviderName": None},
+    {"mcc": "724", "countryName": "Brazil", "mnc": "00", "providerName": "Nextel",
+     "portedFromMnc": None, "portedFromProviderName": None},
+    {"mcc": "276", "countryName": "Albania", "mnc": "02", "providerName": "Vodafone",
+     "portedFromMnc": None, "portedFromProviderName": None},
+]
+
+_REASONS = {
+    400: "Bad Request", 401: "Unauthorized", 404: "Not Found", 413: "Payload Too Large", 429: "Too Many Requests",
+    500: "Internal Server Error", 502: "Bad Gateway", 503: "Service Unavailable", 504: "Gateway Timeout",
+}
+
+
+class FakeTelQServer:
+    """In-memory implementation of the TelQ API, used to run the SDK without network access.
+
+    It serves the /token, /networks, /tests, /lnt/tests, /sessions, /suppliers and
+    /sessions-suppliers routes and keeps their state (issued tokens, tests, SMPP sessions
+    and suppliers) the way the TelQ API does, including authentication and error responses.
+    Requests are counted per endpoint in `requests`, e.g. `requests['GET /tests/{id}']`,
+    which is handy for benchmarks. /networks answers conditional requests (ETag and
+    If-Modified-Since) with HTTP 304 while `networks` is unchanged.
+
+    Parameters
+    ----------
+    credentials : Dict[str, str], optional
+        Accepted App Id to App Key pairs, by default any pair is accepted
+    networks : List[dict], optional
+        Networks returned by /networks, by default a small sample of networks
+    result_delay : float, optional
+        Seconds after which a test is delivered (testStatus 'POSITIVE'), by default 5.
+        If None, tests are never delivered and end as 'NOT_DELIVERED' after their time to live
+    clock : Callable[[], float], default time.time
+        Returns the current time in seconds since the epoch
+    seed : int, optional
+        Seed for generated test id texts and phone numbers
+    token_ttl : int, default 86400
+        Seconds an issued token is valid for
+    max_lnt_tests : int, optional
+        Maximum number of tests per LNT batch, larger batches are rejected with HTTP 413.
+        By default batches of any size are accepted
+
+    Examples
+    --------
+    >>> server = FakeTelQServer(result_delay=0)
+    >>> telq_api = TelQTelecomAPI(transport=FakeTransport(server))
+    >>> telq_api.authenticate(api_id="id", api_key="key")
+    >>> telq_api.mt.initiate_new_tests(telq_api.network.get_networks())
+    """ ""
+
+    def __init__(
+        self,
+        credentials: Optional[Dict[str, str]] = None,
+        networks: Optional[List[dict]] = None,
+        result_delay: Optional[float] = 5,
+        clock: Callable[[], float] = time.time,
+        seed: Optional[int] = None,
+        token_ttl: int = 86400,
+        max_lnt_tests: Optional[int] = None,
+    ):
+        self.credentials = credentials
+        self.networks = [dict(network) for network in (networks if networks is not None else DEFAULT_NETWORKS)]
+        self.result_delay = result_delay
+        self.clock = clock
+        self.token_ttl = token_ttl
+        self.max_lnt_tests = max_lnt_tests
+        # issued token -> time it expires
+        self.tokens: Dict[str, float] = {}
+        self.tests: Dict[int, dict] = {}
+        self.lnt_tests: Dict[int, dict] = {}
+        self.sessions: Dict[int, dict] = {}
+        self.suppliers: Dict[int, dict] = {}
+        self.requests: Counter = Counter()
+        self._random = random.Random(seed)
+        self._test_ids = itertools.count(1)
+        self._session_ids = itertools.count(1)
+        self._supplier_ids = itertools.count(1)
+        self._failures: List[list] = []
+        # ETag of the networks last served and time they last changed
+        self._networks_version: Tuple[Optional[str], float] = (None, 0.0)
+        self._lock = threading.RLock()
+        self._routes: List[Tuple[str, "re.Pattern", Callable]] = [
+            ("POST", re.compile(r"/token"), self._token),
+            ("GET", re.compile(r"/networks"), self._get_networks),
+            ("POST", re.compile(r"/tests"), self._create_tests),
+            ("GET", re.compile(r"/tests/(\d+)"), self._get_test),
+            ("POST", re.compile(r"/lnt/tests"), self._create_lnt_tests),
+            ("GET", re.compile(r"/lnt/tests"), self._list_lnt_tests),
+            ("POST", re.compile(r"/sessions"), self._create_session),
+            ("PUT", re.compile(r"/sessions"), self._update_session),
+            ("GET", re.compile(r"/sessions"), self._list_sessions),
+            ("GET", re.compile(r"/sessions/(\d+)"), self._get_session),
+            ("DELETE", re.compile(r"/sessions/(\d+)"), self._delete_session),
+            ("POST", re.compile(r"/suppliers/assign"), self._assign_suppliers),
+            ("POST", re.compile(r"/suppliers"), self._create_supplier),
+            ("PUT", re.compile(r"/suppliers"), self._update_supplier),
+            ("GET", re.compile(r"/suppliers"), self._list_suppliers),
+            ("GET", re.compile(r"/suppliers/(\d+)"), self._get_supplier),
+            ("DELETE", re.compile(r"/suppliers/(\d+)"), self._delete_supplier),
+            ("GET", re.compile(r"/sessions-suppliers"), self._list_status),
+        ]
+
+    def handle(self, method: str, url: str, headers: Optional[dict] = None, json: Optional[Any] = None) -> TransportResponse:
+        """Serves a single request and returns its response"""
+        parts = urlsplit(url)
+        path = re.sub(r"^.*?/client(?=/|$)", "", parts.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        # round trip the body through JSON like a real request would
+        if isinstance(json, EncodedJSON):
+            body = jsonlib.loads(json.content)
+        else:
+            body = jsonlib.loads(jsonlib.dumps(json)) if json is not None else None
+        headers = {key.lower(): value for key, value in (headers or {}).items()}
+
+        endpoint = endpoint_key(method, url)
+        with self._lock:
+            self.requests[endpoint] += 1
+        failure = self._take_failure(endpoint)
+        if failure is not None:
+            return self._response(url, *self._error(failure[0], "Injected failure"), failure[1])
+
+        for route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if route_method != method.upper() or not match:
+                continue
+            with self._lock:
+                if handler != self._token and self.tokens.get(headers.get("authorization"), 0) <= self.clock():
+                    result = self._error(401, "Invalid or expired token")
+                else:
+                    # handlers return the status, the body and optionally response headers
+                    result = handler(*match.groups(), body=body, query=query, headers=headers)
+            return self._response(url, *result)
+        return self._response(url, *self._error(404, f"No route for {method} {parts.path}"))
+
+    def fail_next(self, status: int, count: int = 1, endpoint: Optional[str] = None,
+                  headers: Optional[Dict[str, str]] = None) -> None:
+        """Makes the next `count` requests fail with `status` instead of being served.
+
+        Parameters
+        ----------
+        status : int
+            HTTP status of the failed responses, e.g. 429 or 503
+        count : int, default 1
+            Number of requests to fail
+        endpoint : str, optional
+            Only fail requests to this endpoint, as in `telq.endpoints.endpoint_key`,
+            e.g. 'GET /tests/{id}'. By default requests to any endpoint fail
+        headers : Dict[str, str], optional
+            Headers of the failed responses, e.g. {'Retry-After': '1'}
+        """
+        with self._lock:
+            self._failures.append([endpoint, status, headers or {}, count])
+
+    def _take_failure(self, endpoint: str) -> Optional[Tuple[int, Dict[str, str]]]:
+        with self._lock:
+            for failure in self._failures:
+                if failure[0] in (None, endpoint):
+                    failure[3] -= 1
+                    if failure[3] == 0:
+                        self._failures.remove(failure)
+                    return failure[1], failure[2]
+        return None
+
+    def set_test_status(self, test_id: int, status: str) -> None:
+        """Forces the testStatus of an MT or LNT test"""
+        with self._lock:
+            test = self.tests.get(test_id) or self.lnt_tests[test_id]
+            test["forcedStatus"] = status
+
+    def set_session_status(self, session_id: int, online: bool, last_error: Optional[str] = None) -> None:
+        """Sets whether an SMPP session is online and its last error"""
+        with self._lock:
+            self.sessions[session_id].update(online=online, lastError=last_error)
+
+    @staticmethod
+    def _response(url: str, status: int, res: Any, headers: Optional[Dict[str, str]] = None) -> TransportResponse:
+        content = jsonlib.dumps(res).encode("utf-8") if res is not None else b""
+        return TransportResponse(status, content, dict({"Content-Type": "application/json"}, **(headers or {})), url)
+
+    @staticmethod
+    def _error(status: int, message: str) -> Tuple[int, dict]:
+        return status, {"error": _REASONS.get(status, "Error"), "message": message, "status": status}
+
+    def _now(self) -> dt.datetime:
+        return dt.datetime.fromtimestamp(self.clock(), dt.timezone.utc)
+
+    @staticmethod
+    def _format_time(time_: dt.datetime) -> str:
+        return time_.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+    @staticmethod
+    def _parse_time(value: str) -> dt.datetime:
+        parsed = dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=dt.timezone.utc)
+
+    @staticmethod
+    def _page(items: List[dict], query: Dict[str, str]) -> dict:
+        page, size = int(query.get("page", 1)), int(query.get("size", 20))
+        if query.get("order", "asc") == "desc":
+            items = items[::-1]
+        content = items[(page - 1) * size:page * size]
+        total_pages = math.ceil(len(items) / size)
+        return {
+            "content": content,
+            "pageable": {"pageNumber": page, "pageSize": size},
+            "totalPages": total_pages,
+            "last": page >= total_pages,
+            "totalElements": len(items),
+            "sort": {"sorted": True, "unsorted": False, "empty": False},
+            "size": size,
+            "number": page,
+            "first": page == 1,
+            "numberOfElements": len(content),
+            "empty": not content,
+        }
+
+    def _find_network(self, destination: dict) -> Optional[dict]:
+        for network in self.networks:
+            if (network["mcc"] == destination.get("mcc") and network["mnc"] == destination.get("mnc")
+                    and network.get("portedFromMnc") == destination.get("portedFromMnc")):
+                return network
+        return None
+
+    def _test_id_text(self, text_type: str, case: str, length: int) -> str:
+        if text_type == "NUMERIC":
+            alphabet = string.digits
+        elif text_type == "WHATSAPP_CODE":
+            alphabet, length = string.digits, 7
+        else:
+            alphabet = {"UPPER": string.ascii_uppercase, "LOWER": string.ascii_lowercase}.get(case, string.ascii_letters)
+            if text_type == "ALPHA_NUMERIC":
+                alphabet += string.digits
+        return "".join(self._random.choice(alphabet) for _ in range(length))
+
+    def _test_status(self, test: dict) -> Tuple[str, Optional[dt.datetime]]:
+        if test.get("forcedStatus"):
+            return test["forcedStatus"], None
+        created_at = self._parse_time(test["testCreatedAt"])
+        age = (self._now() - created_at).total_seconds()
+        if self.result_delay is not None and age >= self.result_delay:
+            return "POSITIVE", created_at + dt.timedelta(seconds=self.result_delay)
+        if age >= test["testTimeToLiveInSeconds"]:
+            return "NOT_DELIVERED", None
+        return "WAIT", None
+
+    def _test_result(self, test: dict) -> dict:
+        status, received_at = self._test_status(test)
+        delivered = status == "POSITIVE"
+        result = {key: value for key, value in test.items() if key not in ("forcedStatus", "testTimeToLiveInSeconds")}
+        result.update(
+            testStatus=status,
+            smsReceivedAt=self._format_time(received_at) if received_at else None,
+            receiptDelay=self.result_delay if received_at else None,
+            senderDelivered=test.get("senderSent", "TelQ") if delivered else None,
+            textDelivered=(test.get("textSent") or test["testIdText"]) if delivered else None,
+        )
+        return result
+
+    def _token(self, body: dict, **kwargs) -> Tuple[int, Any]:
+        api_id, api_key = (body or {}).get("appId"), (body or {}).get("appKey")
+        if not api_id or not api_key or (self.credentials is not None and self.credentials.get(api_id) != api_key):
+            return self._error(401, "Invalid appId or appKey")
+        token = "".join(self._random.choice(string.ascii_letters + string.digits) for _ in range(32))
+        self.tokens[token] = self.clock() + self.token_ttl
+        return 200, {"ttl": self.token_ttl, "value": token}
+
+    def _get_networks(self, headers: Dict[str, str], **kwargs) -> Tuple[Any, ...]:
+        networks = [dict(network) for network in self.networks]
+        etag = '"%s"' % hashlib.sha1(jsonlib.dumps(networks, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        if etag != self._networks_version[0]:
+            self._networks_version = (etag, self.clock())
+        modified_at = self._networks_version[1]
+        validators = {"ETag": etag, "Last-Modified": formatdate(modified_at, usegmt=True)}
+        if "if-none-match" in headers:
+            if etag in (tag.strip() for tag in headers["if-none-match"].split(",")):
+                return 304, None, validators
+        elif "if-modified-since" in headers:
+            try:
+                since = parsedate_to_datetime(headers["if-modified-since"]).timestamp()
+            except (TypeError, ValueError):
+                since = None
+            # HTTP dates have a resolution of one second
+            if since is not None and int(modified_at) <= since:
+                return 304, None, validators
+        return 200, networks, validators
+
+    def _create_tests(self, body: dict, **kwargs) -> Tuple[int, Any]:
+        destinations = (body or {}).get("destinationNetworks")
+        if not destinations:
+            return self._error(400, "destinationNetworks must not be empty")
+        text_type = body.get("testIdTextType") or "ALPHA"
+        case = body.get("testIdTextCase") or "MIXED"
+        length = body.get("testIdTextLength") or 10
+        created = []
+        for destination in destinations:
+            network = self._find_network(destination)
+            destination_network = {key: destination.get(key) for key in ("mcc", "mnc", "portedFromMnc")}
+            test = {
+                "id": None,
+                "testIdText": None,
+                "phoneNumber": None,
+                "errorMessage": None,
+                "destinationNetwork": destination_network,
+                "testIdTextType": text_type,
+                "testIdTextCase": case,
+                "testIdTextLength": length,
+            }
+            if network is None:
+                test["errorMessage"] = "NETWORK_OFFLINE"
+            else:
+                test.update(
+                    id=next(self._test_ids),
+                    testIdText=self._test_id_text(text_type, case, length),
+                    phoneNumber=str(self._random.randint(10 ** 10, 10 ** 11 - 1)),
+                )
+                self.tests[test["id"]] = {
+                    "id": test["id"],
+                    "testIdText": test["testIdText"],
+                    "testCreatedAt": self._format_time(self._now()),
+                    "testTimeToLiveInSeconds": body.get("testTimeToLiveInSeconds") or 3600,
+                    "destinationNetworkDetails": {
+                        "mcc": network["mcc"],
+                        "mnc": network["mnc"],
+                        "portedFromMnc": network.get("portedFromMnc"),
+                        "countryName": network.get("countryName"),
+                        "providerName": network.get("providerName"),
+                        "portedFromProviderName": network.get("portedFromProviderName"),
+                    },
+                    "smscInfo": None,
+                    "pdusDelivered": [],
+                }
+            created.append(test)
+        return 200, created
+
+    def _get_test(self, test_id: str, **kwargs) -> Tuple[int, Any]:
+        test = self.tests.get(int(test_id))
+        if test is None:
+            return self._error(404, f"Test {test_id} not found")
+        return 200, self._test_result(test)
+
+    def _create_lnt_tests(self, body: dict, **kwargs) -> Tuple[int, Any]:
+        tests = (body or {}).get("tests")
+        if not tests:
+            return self._error(400, "tests must not be empty")
+        if self.max_lnt_tests is not None and len(tests) > self.max_lnt_tests:
+            return self._error(413, f"At most {self.max_lnt_tests} tests per batch")
+        for test in tests:
+            if test.get("supplierId") not in self.suppliers:
+                return self._error(400, f"Supplier {test.get('supplierId')} not found")
+            if not test.get("mcc") or not test.get("mnc"):
+                return self._error(400, "mcc and mnc are required for every test")
+        created = []
+        for test in tests:
+            test_id = next(self._test_ids)
+            self.lnt_tests[test_id] = {
+                "id": test_id,
+                "testIdText": self._test_id_text(test["testIdTextType"], test["testIdTextCase"], test["testIdTextLength"]),
+                "senderSent": test["sender"],
+                "textSent": test["text"],
+                "supplierId": test["supplierId"],
+                "testCreatedAt": self._format_time(self._now()),
+                "testTimeToLiveInSeconds": body.get("testTimeToLiveInSeconds") or 3600,
+                "destinationNetworkDetails": {
+                    "mcc": test["mcc"], "mnc": test["mnc"], "portedFromMnc": test.get("portedFromMnc"),
+                },
+                "commentText": body.get("commentText"),
+            }
+            created.append({"id": test_id, "testIdText": self.lnt_tests[test_id]["testIdText"],
+                            "supplierId": test["supplierId"], "mcc": test["mcc"], "mnc": test["mnc"],
+                            "portedFromMnc": test.get("portedFromMnc")})
+        return 200, created
+
+    def _list_lnt_tests(self, query: Dict[str, str], **kwargs) -> Tuple[int, Any]:
+        date_from = self._parse_time(query["from"]) if "from" in query else None
+        date_to = self._parse_time(query["to"]) if "to" in query else None
+        tests = []
+        for test in self.lnt_tests.values():
+            created_at = self._parse_time(test["testCreatedAt"])
+            if (date_from is None or created_at >= date_from) and (date_to is None or created_at <= date_to):
+                tests.append(self._test_result(test))
+        return 200, self._page(tests, query)
+
+    def _session_view(self, session: dict) -> dict:
+        view = {key: value for key, value in session.items() if key != "password"}
+        view["supplierCount"] = sum(
+            1 for supplier in self.suppliers.values() if supplier["smppSessionId"] == session["smppSessionId"]
+        )
+        return view
+
+    def _create_session(self, body: dict, **kwargs) -> Tuple[int, Any]:
+        body = body or {}
+        for key in ("hostIp", "hostPort", "systemId", "password"):
+            if not body.get(key):
+                return self._error(400, f"{key} is required")
+        session_id = next(self._session_ids)
+        self.sessions[session_id] = dict(
+            body, smppSessionId=session_id, userId=1, userName="fake", online=bool(body.get("enabled", True)),
+            lastError=None,
+        )
+        return 200, {"smppSessionId": session_id}
+
+    def _update_session(self, body: dict, **kwargs) -> Tuple[int, Any]:
+        session = self.sessions.get((body or {}).get("smppSessionId"))
+        if session is None:
+            return self._error(404, "Session not found")
+        session.update(body)
+        return 200, None
+
+    def _list_sessions(self, query: Dict[str, str], **kwargs) -> Tuple[int, Any]:
+        return 200, self._page([self._session_view(session) for session in self.sessions.values()], query)
+
+    def _get_session(self, session_id: str, **kwargs) -> Tuple[int, Any]:
+        session = self.sessions.get(int(session_id))
+        if session is None:
+            return self._error(404, f"Session {session_id} not found")
+        return 200, self._session_view(session)
+
+    def _delete_session(self, session_id: str, **kwargs) -> Tuple[int, Any]:
+        if self.sessions.pop(int(session_id), None) is None:
+            return self._error(404, f"Session {session_id} not found")
+        return 200, None
+
+    def _create_supplier(self, body: dict, **kwargs) -> Tuple[int, Any]:
+        body = body or {}
+        if body.get("smppSessionId") not in self.sessions:
+            return self._error(400, f"Session {body.get('smppSessionId')} not found")
+        for key in ("supplierName", "routeType"):
+            if not body.get(key):
+                return self._error(400, f"{key} is required")
+        supplier_id = next(self._supplier_ids)
+        self.suppliers[supplier_id] = dict(body, supplierId=supplier_id, userId=1)
+        return 200, {"supplierId": supplier_id}
+
+    def _update_supplier(self, body: dict, **kwargs) -> Tuple[int, Any]:
+        supplier = self.suppliers.get((body or {}).get("supplierId"))
+        if supplier is None:
+            return self._error(404, "Supplier not found")
+        if body.get("smppSessionId") not in self.sessions:
+            return self._error(400, f"Session {body.get('smppSessionId')} not found")
+        supplier.update(body)
+        return 200, None
+
+    def _list_suppliers(self, query: Dict[str, str], **kwargs) -> Tuple[int, Any]:
+        return 200, self._page([dict(supplier) for supplier in self.suppliers.values()], query)
+
+    def _get_supplier(self, supplier_id: str, **kwargs) -> Tuple[int, Any]:
+        supplier = self.suppliers.get(int(supplier_id))
+        if supplier is None:
+            return self._error(404, f"Supplier {supplier_id} not found")
+        return 200, dict(supplier)
+
+    def _delete_supplier(self, supplier_id: str, **kwargs) -> Tuple[int, Any]:
+        if self.suppliers.pop(int(supplier_id), None) is None:
+            return self._error(404, f"Supplier {supplier_id} not found")
+        return 200, None
+
+    def _assign_suppliers(self, body: dict, **kwargs) -> Tuple[int, Any]:
+        body = body or {}
+        if body.get("smppSessionId") not in self.sessions:
+            return self._error(400, f"Session {body.get('smppSessionId')} not found")
+        supplier_ids = [int(supplier_id) for supplier_id in body.get("supplierIds") or []]
+        missing = [supplier_id for supplier_id in supplier_ids if supplier_id not in self.suppliers]
+        if missing:
+            return self._error(400, f"Suppliers {missing} not found")
+        for supplier_id in supplier_ids:
+            self.suppliers[supplier_id]["smppSessionId"] = body["smppSessionId"]
+        return 200, None
+
+    def _list_status(self, query: Dict[str, str], **kwargs) -> Tuple[int, Any]:
+        items = []
+        for supplier in self.suppliers.values():
+            session = self.sessions.get(supplier["smppSessionId"], {})
+            items.append({
+                "supplierId": supplier["supplierId"],
+                "supplierName": supplier["supplierName"],
+                "routeType": supplier["routeType"],
+                "smppSessionId": supplier["smppSessionId"],
+                "hostIp": session.get("hostIp"),
+                "hostPort": session.get("hostPort"),
+                "systemId": session.get("systemId"),
+                "enabled": session.get("enabled"),
+                "online": session.get("online", False),
+                "lastError": session.get("lastError"),
+            })
+        return 200, self._page(items, query)
+
+
+class FakeTransport(Transport):
+    """Transport serving requests from a FakeTelQServer instead of the network
+
+    Parameters
+    ----------
+    server : FakeTelQServer, optional
+        The server to send requests to, a new one is created if not given
+    latency : float, default 0
+        Seconds every request takes, to simulate the network round trip
+    """ ""
+
+    def __init__(self, server: Optional[FakeTelQServer] = None, latency: float = 0):
+        self.server = server or FakeTelQServer()
+        self.latency = latency
+
+    def request(self, method: str, url: str, headers: Optional[dict] = None, json: Optional[Any] = None) -> TransportResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        return self.server.handle(method, url, headers, json)
+
+
+class AsyncFakeTransport(AsyncTransport):
+    """Asyncio transport serving requests from a FakeTelQServer, see FakeTransport"""
+
+    def __init__(self, server: Optional[FakeTelQServer] = None, latency: float = 0):
+        self.server = server or FakeTelQServer()
+        self.latency = latency
+
+    async def request(self, method: str, url: str, headers: Optional[dict] = None, json: Optional[Any] = None) -> TransportResponse:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.server.handle(method, url, headers, json)
@@ -0,0 +1,215 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+from telq.util.rest import APIError
+
+if TYPE_CHECKING:
+    from telq.util.retry import RetryPolicy
+
+# a part of a chunk sent on its own: its offset in the chunk, its items and its results or error
+_Piece = Tuple[int, Sequence, Any]
+
+# HTTP statuses the API rejects a whole batch with, because of one of its items or its size
+REJECTED_BATCH_STATUSES = frozenset({400, 413, 422})
+
+
+def is_rejected_batch(error: Exception) -> bool:
+    """Whether a batch failed because the API rejected it, as opposed to e.g. a network error.
+    A smaller part of a rejected batch may be accepted"""
+    if isinstance(error, APIError):
+        return error.status_code in REJECTED_BATCH_STATUSES
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) in REJECTED_BATCH_STATUSES
+
+
+def chunked(items: Sequence, size: int) -> List[Sequence]:
+    """Splits `items` into consecutive chunks of at most `size` items"""
+    if size < 1:
+        raise ValueError("chunk size must be at least 1")
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+@dataclass
+class ChunkFailure:
+    """A chunk of a bulk request which failed.
+
+    Attributes:
+        index (int): Position of the chunk, starting at 0.
+        start (int): Position of the first failed item in the bulk request.
+        items (list): The failed items, e.g. to submit them again. When chunks are split on errors,
+            only the items still failing once split as far as possible.
+        error (Exception): The error raised for the chunk.
+    """
+    index: int
+    start: int
+    items: list
+    error: Exception
+
+
+@dataclass
+class BulkResult:
+    """Result of a request split into chunks sent concurrently.
+
+    Attributes:
+        results (list): Results of the chunks which succeeded, merged in input order.
+        failures (List[ChunkFailure]): The chunks which failed, in input order.
+    """
+    results: list = field(default_factory=list)
+    failures: List[ChunkFailure] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    def failed_items(self) -> list:
+        """Items of every failed chunk, in input order"""
+        return [item for failure in self.failures for item in failure.items]
+
+
+def retry_after(error: Exception) -> Optional[str]:
+    """The Retry-After header of the response an error was raised for, if any"""
+    headers = getattr(error, "headers", None) or getattr(getattr(error, "response", None), "headers", None)
+    return headers.get("Retry-After") if headers else None
+
+
+def is_transient(error: Exception, policy: "RetryPolicy") -> bool:
+    """Whether a request may succeed if sent again: it failed to connect, timed out, or the
+    API answered with a status in `policy.retry_statuses`, e.g. HTTP 503"""
+    import requests
+
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(error, APIError):
+        return error.status_code in policy.retry_statuses
+    if isinstance(error, requests.exceptions.HTTPError):
+        return getattr(error.response, "status_code", None) in policy.retry_statuses
+    return False
+
+
+def _chunk_backoff(policy: Optional["RetryPolicy"], attempt: int, error: Exception) -> Optional[float]:
+    """Seconds to wait before sending a chunk again after `error`, None to give up"""
+    if policy is None:
+        from telq.util.retry import RetryPolicy
+
+        policy = RetryPolicy(max_retries=2)
+    if attempt >= policy.max_retries or not is_transient(error, policy):
+        return None
+    return policy.backoff(attempt, retry_after(error))
+
+
+def retrying(send: Callable[[Sequence], list], policy: Optional["RetryPolicy"] = None,
+             sleep: Callable[[float], None] = time.sleep) -> Callable[[Sequence], list]:
+    """Wraps `send` so a chunk failing with a transient error, e.g. a timeout or HTTP 503, is
+    sent again up to `policy.max_retries` times, waiting as `policy.backoff` tells: with jitter,
+    so concurrent chunks do not retry in lockstep, and as long as Retry-After asks for. Other
+    errors, e.g. rejections, HTTP 404 or bugs, are raised at once. By default retries twice.
+    Only for requests which can safely be repeated"""
+    def send_with_retries(chunk: Sequence) -> list:
+        attempt = 0
+        while True:
+            try:
+                return send(chunk)
+            except Exception as e:
+                wait = _chunk_backoff(policy, attempt, e)
+                if wait is None:
+                    raise
+            sleep(wait)
+            attempt += 1
+
+    return send_with_retries
+
+
+def aretrying(send: Callable[[Sequence], Awaitable[list]],
+              policy: Optional["RetryPolicy"] = None) -> Callable[[Sequence], Awaitable[list]]:
+    """Asyncio counterpart of retrying"""
+    async def send_with_retries(chunk: Sequence) -> list:
+        # imported here so that the blocking clients do not pay for asyncio
+        import asyncio
+
+        attempt = 0
+        while True:
+            try:
+                return await send(chunk)
+            except Exception as e:
+                wait = _chunk_backoff(policy, attempt, e)
+                if wait is None:
+                    raise
+            await asyncio.sleep(wait)
+            attempt += 1
+
+    return send_with_retries
+
+
+def _merge(chunks: List[Sequence], outcomes: List[List[_Piece]]) -> BulkResult:
+    result = BulkResult()
+    start = 0
+    for index, (chunk, pieces) in enumerate(zip(chunks, outcomes)):
+        for offset, items, outcome in pieces:
+            if isinstance(outcome, Exception):
+                result.failures.append(ChunkFailure(index, start + offset, list(items), outcome))
+            else:
+                result.results.extend(outcome)
+        start += len(chunk)
+    return result
+
+
+def run_chunks(send: Callable[[Sequence], list], items: Sequence, chunk_size: int, max_workers: int,
+               split: Optional[Callable[[Exception], bool]] = None) -> BulkResult:
+    """Calls `send` with each chunk of `items` on up to `max_workers` threads.
+
+    `send` returns the results of a chunk as a list. A chunk for which it raises
+    is reported in `BulkResult.failures` instead of failing the other chunks.
+    If `split` returns True for the error, e.g. because the server rejected the whole
+    chunk for one bad item, the chunk is split in halves sent again, down to single
+    items, so only the items actually rejected are reported as failed.
+    """ ""
+    chunks = chunked(items, chunk_size)
+
+    def send_chunk(chunk: Sequence) -> List[_Piece]:
+        pieces = []
+        remaining = [(0, chunk)]
+        while remaining:
+            offset, part = remaining.pop()
+            try:
+                pieces.append((offset, part, send(part)))
+            except Exception as e:
+                if split is None or len(part) < 2 or not split(e):
+                    pieces.append((offset, part, e))
+                    continue
+                half = len(part) // 2
+                remaining.append((offset + half, part[half:]))
+                remaining.append((offset, part[:half]))
+        return sorted(pieces, key=lambda piece: piece[0])
+
+    if max_workers <= 1 or len(chunks) <= 1:
+        return _merge(chunks, [send_chunk(chunk) for chunk in chunks])
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks)), thread_name_prefix="telq-bulk") as executor:
+        return _merge(chunks, list(executor.map(send_chunk, chunks)))
+
+
+async def run_chunks_async(send: Callable[[Sequence], Awaitable[list]], items: Sequence, chunk_size: int,
+                           max_workers: int, split: Optional[Callable[[Exception], bool]] = None) -> BulkResult:
+    """Asyncio counterpart of run_chunks, awaiting up to `max_workers` chunks at a time.
+    The halves of a split chunk are sent concurrently too"""
+    # imported here so that the blocking clients do not pay for asyncio
+    import asyncio
+
+    chunks = chunked(items, chunk_size)
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def send_chunk(chunk: Sequence, offset: int = 0) -> List[_Piece]:
+        async with semaphore:
+            try:
+                return [(offset, chunk, await send(chunk))]
+            except Exception as e:
+                error = e
+        if split is None or len(chunk) < 2 or not split(error):
+            return [(offset, chunk, error)]
+        half = len(chunk) // 2
+        first, second = await asyncio.gather(send_chunk(chunk[:half], offset),
+                                             send_chunk(chunk[half:], offset + half))
+        return first + second
+
+    return _merge(chunks, await asyncio.gather(*(send_chunk(chunk) for chunk in chunks)))
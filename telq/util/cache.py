@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Iterator, Optional, Tuple
+
+
+class ItemCache:
+    """In-memory LRU cache of API items, each expiring `ttl` seconds after it was stored.
+
+    Set it as the `cache` of a Session or Supplier client (or their asyncio counterparts) to
+    serve `get` from memory: items are stored when fetched by `get` and when listed by `list`,
+    `iter_all` or `fetch_all`, and removed when updated, deleted or re-assigned through the
+    same client. Changes made by other clients or in the TelQ App are seen once items expire.
+
+    Items returned from the cache are shared by every caller and must not be modified. Ids given
+    as strings of digits, e.g. by `Supplier.assign`, are the same keys as the integer ids.
+
+    Parameters
+    ----------
+    max_size : int, default 1024
+        Maximum number of items kept, the least recently used ones are evicted first
+    ttl : float, default 60
+        Seconds an item is served from memory
+    clock : Callable[[], float], default time.monotonic
+        Returns the current time in seconds
+
+    Examples
+    --------
+    >>> telq_api.session.cache = ItemCache(ttl=30)
+    >>> telq_api.session.fetch_all()  # warms the cache
+    >>> telq_api.session.get(17)  # served from memory
+    """ ""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60, clock: Callable[[], float] = time.monotonic):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        # items with the time they expire, least recently used first
+        self._items: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        # incremented by each invalidation, so items read before it are not stored after it
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def generation(self) -> int:
+        """Pass it to `put` when the item was requested before the response is stored"""
+        return self._generation
+
+    @staticmethod
+    def _key(key: Hashable) -> Hashable:
+        return int(key) if isinstance(key, str) and key.isdigit() else key
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """The item stored under `key`, None if it is missing or expired"""
+        key = self._key(key)
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None or entry[0] <= self.clock():
+                if entry is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, item: Any, generation: Optional[int] = None) -> None:
+        """Stores an item. It is dropped if the cache was invalidated since `generation`,
+        as it may have been read before the change invalidating it"""
+        self.put_many([(key, item)], generation)
+
+    def put_many(self, items: Iterable[Tuple[Hashable, Any]], generation: Optional[int] = None) -> None:
+        """Stores several items, see put"""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            expires_at = self.clock() + self.ttl
+            for key, item in items:
+                key = self._key(key)
+                self._items[key] = (expires_at, item)
+                self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Removes the items stored under `keys`"""
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._items.pop(self._key(key), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._items.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._items), "hits": self.hits, "misses": self.misses}
+
+
+def read_through(cache: Optional[ItemCache], key: Hashable, fetch: Callable[[], Any]) -> Any:
+    """The item stored under `key`, else fetches and stores it"""
+    if cache is None:
+        return fetch()
+    generation = cache.generation
+    item = cache.get(key)
+    if item is None:
+        item = fetch()
+        cache.put(key, item, generation)
+    return item
+
+
+async def aread_through(cache: Optional[ItemCache], key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Awaitable counterpart of read_through"""
+    if cache is None:
+        return await fetch()
+    generation = cache.generation
+    item = cache.get(key)
+    if item is None:
+        item = await fetch()
+        cache.put(key, item, generation)
+    return item
+
+
+@contextmanager
+def invalidating(cache: Optional[ItemCache], *keys: Hashable) -> Iterator[None]:
+    """Invalidates `keys` once the block changing them ran, even if it failed as the change may have been applied"""
+    try:
+        yield
+    finally:
+        if cache is not None:
+            cache.invalidate(*keys)
+
+
+def warm(cache: Optional[ItemCache], page: dict, key: str, generation: Optional[int] = None) -> dict:
+    """Stores the items of a page in `cache` under their `key` field, and returns the page"""
+    if cache is not None and isinstance(page, dict):
+        cache.put_many(((item[key], item) for item in page.get("content") or [] if key in item), generation)
+    return page
@@ -0,0 +1,215 @@
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Iterable, Iterator, Optional, Tuple
+
+
+def total_pages(page: dict) -> Optional[int]:
+    """Number of pages announced by a page of results, None if it does not tell"""
+    total = page.get("totalPages") if isinstance(page, dict) else None
+    return total if isinstance(total, int) else None
+
+
+def is_last(page: dict, number: int) -> bool:
+    total = total_pages(page)
+    if total is not None:
+        return number >= total
+    return bool(page.get("last", True)) or not page.get("content")
+
+
+def iter_pages(fetch_page: Callable[[int], dict], prefetch: int = 4, first_page: int = 1) -> Iterator[dict]:
+    """Yields every page of a paginated endpoint in order.
+
+    The first page is fetched alone. Once it tells how many pages there are, up to `prefetch`
+    following pages are fetched concurrently ahead of the one being consumed, so at most
+    `prefetch` pages are held in memory at once. Without totalPages, or with `prefetch`
+    below 2, pages are fetched one after another until the last one.
+
+    Parameters
+    ----------
+    fetch_page : Callable[[int], dict]
+        Returns the page with the given number
+    prefetch : int, default 4
+        Maximum number of pages fetched ahead
+    first_page : int, default 1
+        Number of the first page, the pages of the TelQ API start at 1
+    """ ""
+    page = fetch_page(first_page)
+    yield page
+    total = total_pages(page)
+    if is_last(page, first_page):
+        return
+    if total is None or prefetch < 2:
+        number = first_page
+        while not is_last(page, number):
+            number += 1
+            page = fetch_page(number)
+            yield page
+        return
+
+    yield from _fetch_ahead(fetch_page, range(first_page + 1, first_page + total), prefetch)
+
+
+def _fetch_ahead(fetch_page: Callable[[int], dict], numbers: Iterable[int], prefetch: int) -> Iterator[dict]:
+    """Yields the pages with the given numbers in order, fetching up to `prefetch` of them concurrently"""
+    numbers = iter(numbers)
+    with ThreadPoolExecutor(max_workers=max(1, prefetch), thread_name_prefix="telq-pages") as executor:
+        window: Deque = deque(executor.submit(fetch_page, number) for number in islice(numbers, max(1, prefetch)))
+        try:
+            while window:
+                page = window.popleft().result()
+                number = next(numbers, None)
+                if number is not None:
+                    window.append(executor.submit(fetch_page, number))
+                yield page
+        finally:
+            # stop fetching when the consumer stops early
+            for future in window:
+                future.cancel()
+
+
+def iter_items(fetch_page: Callable[[int], dict], prefetch: int = 4, first_page: int = 1) -> Iterator[Any]:
+    """Yields the items ('content') of every page in order, see iter_pages"""
+    for page in iter_pages(fetch_page, prefetch, first_page):
+        yield from page.get("content") or []
+
+
+async def aiter_pages(fetch_page: Callable[[int], Awaitable[dict]], prefetch: int = 4,
+                      first_page: int = 1) -> AsyncIterator[dict]:
+    """Asyncio counterpart of iter_pages"""
+    # imported here so that the blocking clients do not pay for asyncio
+    import asyncio
+
+    page = await fetch_page(first_page)
+    yield page
+    total = total_pages(page)
+    if is_last(page, first_page):
+        return
+    if total is None or prefetch < 2:
+        number = first_page
+        while not is_last(page, number):
+            number += 1
+            page = await fetch_page(number)
+            yield page
+        return
+
+    async for page in _afetch_ahead(fetch_page, range(first_page + 1, first_page + total), prefetch):
+        yield page
+
+
+async def _afetch_ahead(fetch_page: Callable[[int], Awaitable[dict]], numbers: Iterable[int],
+                        prefetch: int) -> AsyncIterator[dict]:
+    """Asyncio counterpart of _fetch_ahead"""
+    import asyncio
+
+    numbers = iter(numbers)
+    window: Deque = deque(asyncio.ensure_future(fetch_page(number)) for number in islice(numbers, max(1, prefetch)))
+    try:
+        while window:
+            page = await window.popleft()
+            number = next(numbers, None)
+            if number is not None:
+                window.append(asyncio.ensure_future(fetch_page(number)))
+            yield page
+    finally:
+        for task in window:
+            task.cancel()
+
+
+async def aiter_items(fetch_page: Callable[[int], Awaitable[dict]], prefetch: int = 4,
+                      first_page: int = 1) -> AsyncIterator[Any]:
+    """Asyncio counterpart of iter_items"""
+    async for page in aiter_pages(fetch_page, prefetch, first_page):
+        for item in page.get("content") or []:
+            yield item
+
+
+# size of the first page of iter_all_items, the API default
+FIRST_PAGE_SIZE = 20
+# largest page size chosen by iter_all_items
+MAX_PAGE_SIZE = 100
+
+
+def plan_pages(first: dict, first_size: int, max_workers: int,
+               max_size: int) -> Optional[Tuple[int, Optional[int], int]]:
+    """Chooses how to fetch the items following the first page of `first_size` items.
+
+    Returns the page size, the number of the last page (None if the page does not tell) and
+    how many items of the first page of that size were already returned, or None if the first
+    page was the last one. The page size is picked so the remaining items take a single wave
+    of `max_workers` concurrent requests, within `first_size` and `max_size`.
+    """ ""
+    if is_last(first, 1):
+        return None
+    total = first.get("totalElements")
+    if not isinstance(total, int):
+        return first_size, None, 0
+    size = min(max_size, max(first_size, math.ceil(total / max(1, max_workers))))
+    if size == first_size:
+        return size, math.ceil(total / size), 0
+    # the first page of the larger size includes the items already returned
+    return size, math.ceil(total / size), first_size
+
+
+def iter_all_items(fetch_page: Callable[[int, int], dict], size: Optional[int] = None, max_workers: int = 4,
+                   first_size: int = FIRST_PAGE_SIZE, max_size: int = MAX_PAGE_SIZE) -> Iterator[Any]:
+    """Yields the items of every page of a list endpoint, fetching pages concurrently.
+
+    With a `size`, pages of that size are fetched as by iter_items. Otherwise the first page is
+    fetched with `first_size` items, which is all it takes for short lists. Once it tells how many
+    items there are, the page size is chosen so the remaining pages are fetched in a single
+    wave of `max_workers` concurrent requests (see plan_pages).
+
+    Parameters
+    ----------
+    fetch_page : Callable[[int, int], dict]
+        Returns the page with the given number and size
+    size : int, optional
+        Number of items per page, chosen automatically if not given
+    max_workers : int, default 4
+        Maximum number of pages fetched at once
+    """ ""
+    if size is not None:
+        yield from iter_items(lambda number: fetch_page(number, size), max_workers)
+        return
+    first = fetch_page(1, first_size)
+    yield from first.get("content") or []
+    plan = plan_pages(first, first_size, max_workers, max_size)
+    if plan is None:
+        return
+    size, last, skip = plan
+    if last is None:
+        # without totalElements, fetch the following pages one after another
+        yield from iter_items(lambda number: fetch_page(number, size), 1, first_page=2)
+        return
+    numbers = range(1 if skip else 2, last + 1)
+    for page in _fetch_ahead(lambda number: fetch_page(number, size), numbers, max_workers):
+        yield from (page.get("content") or [])[skip:]
+        skip = 0
+
+
+async def aiter_all_items(fetch_page: Callable[[int, int], Awaitable[dict]], size: Optional[int] = None,
+                          max_workers: int = 4, first_size: int = FIRST_PAGE_SIZE,
+                          max_size: int = MAX_PAGE_SIZE) -> AsyncIterator[Any]:
+    """Asyncio counterpart of iter_all_items"""
+    if size is not None:
+        async for item in aiter_items(lambda number: fetch_page(number, size), max_workers):
+            yield item
+        return
+    first = await fetch_page(1, first_size)
+    for item in first.get("content") or []:
+        yield item
+    plan = plan_pages(first, first_size, max_workers, max_size)
+    if plan is None:
+        return
+    size, last, skip = plan
+    if last is None:
+        async for item in aiter_items(lambda number: fetch_page(number, size), 1, first_page=2):
+            yield item
+        return
+    async for page in _afetch_ahead(lambda number: fetch_page(number, size), range(1 if skip else 2, last + 1),
+                                    max_workers):
+        for item in (page.get("content") or [])[skip:]:
+            yield item
+        skip = 0
@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+@dataclass
+class PoolConfig:
+    """Connection pool settings shared by every client of a TelQTelecomAPI instance.
+
+    Attributes:
+        pool_connections (int): Number of per-host connection pools to keep. (default: 10)
+        pool_maxsize (int): Maximum number of connections kept open per host. (default: 10)
+        pool_block (bool): Block when all connections to a host are in use instead of
+            opening a throwaway connection. (default: False)
+        keep_alive (bool): Reuse connections between requests. (default: True)
+        timeout (float): Seconds to wait for the server before giving up, None waits forever. (default: None)
+    """
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    keep_alive: bool = True
+    timeout: Optional[float] = None
+
+
+class PooledSession(requests.Session):
+    """A requests session whose connections are pooled according to a PoolConfig"""
+
+    def __init__(self, config: Optional[PoolConfig] = None):
+        super().__init__()
+        self.config = config or PoolConfig()
+        adapter = HTTPAdapter(
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            pool_block=self.config.pool_block,
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        if not self.config.keep_alive:
+            self.headers["Connection"] = "close"
+
+    def request(self, method, url, *args, **kwargs):
+        if self.config.timeout is not None:
+            kwargs.setdefault("timeout", self.config.timeout)
+        return super().request(method, url, *args, **kwargs)
@@ -0,0 +1,199 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from telq.endpoints import endpoint_key
+from telq.transport import AsyncTransport, Transport, TransportResponse
+
+SUBMIT = "submit"
+POLL = "poll"
+NETWORKS = "networks"
+MANAGE = "manage"
+
+# endpoints not listed here are session and supplier management (MANAGE)
+ENDPOINT_CLASSES = {
+    "POST /token": None,
+    "GET /networks": NETWORKS,
+    "POST /tests": SUBMIT,
+    "POST /lnt/tests": SUBMIT,
+    "GET /tests/{id}": POLL,
+    "GET /lnt/tests": POLL,
+}
+
+# lower values are served first when requests wait for the shared budget
+DEFAULT_PRIORITIES = {SUBMIT: 0, MANAGE: 1, NETWORKS: 1, POLL: 2}
+
+
+@dataclass
+class RateLimit:
+    """A request budget.
+
+    Attributes:
+        rate (float): Requests per second allowed on average.
+        burst (int): Requests allowed at once after being idle, defaults to `rate` (at least 1).
+    """
+    rate: float
+    burst: Optional[int] = None
+
+
+class TokenBucket:
+    """Thread-safe and asyncio-safe token bucket with priority lanes.
+
+    While an acquirer of a higher priority (lower value) waits for a token,
+    acquirers of lower priorities are held back, so they never take the tokens it waits for.
+
+    Parameters
+    ----------
+    limit : RateLimit
+        Rate at which tokens are added and capacity of the bucket
+    clock : Callable[[], float], default time.monotonic
+        Returns the current time in seconds
+    """ ""
+
+    def __init__(self, limit: RateLimit, clock: Callable[[], float] = time.monotonic):
+        if limit.rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = limit.rate
+        self.capacity = float(limit.burst or max(1.0, limit.rate))
+        self.clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._waiting: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _reserve(self, priority: int) -> float:
+        """Takes a token and returns 0, or returns the seconds to wait before trying again"""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            preempted = any(count for waiting, count in self._waiting.items() if waiting < priority)
+            # tolerate rounding errors, which would otherwise make us wait for a fraction of a nanosecond
+            if self._tokens >= 1 - 1e-9 and not preempted:
+                self._tokens = max(0.0, self._tokens - 1)
+                return 0.0
+            if preempted:
+                return 1 / self.rate
+            return (1 - self._tokens) / self.rate
+
+    def _wait(self, priority: int, delta: int) -> None:
+        with self._lock:
+            self._waiting[priority] += delta
+
+    def acquire(self, priority: int = 0, sleep: Callable[[float], None] = time.sleep) -> None:
+        """Blocks until a token is taken"""
+        wait = self._reserve(priority)
+        if not wait:
+            return
+        self._wait(priority, 1)
+        try:
+            while wait:
+                sleep(wait)
+                wait = self._reserve(priority)
+        finally:
+            self._wait(priority, -1)
+
+    async def acquire_async(self, priority: int = 0) -> None:
+        """Waits without blocking the event loop until a token is taken"""
+        wait = self._reserve(priority)
+        if not wait:
+            return
+        self._wait(priority, 1)
+        try:
+            while wait:
+                await asyncio.sleep(wait)
+                wait = self._reserve(priority)
+        finally:
+            self._wait(priority, -1)
+
+
+class RateLimiter:
+    """Client-side rate limiter shared by every client of one or more TelQTelecomAPI instances.
+
+    Requests are grouped into endpoint classes: test creation ('submit'), result polling ('poll'),
+    network listing ('networks') and session and supplier management ('manage').
+    Each class can have its own budget, and `total` is the budget shared by all of them, e.g.
+    the API quota of the account. When requests wait for the shared budget, those of the class
+    with the highest priority go first, so by default submissions always preempt polling.
+    Token requests are never limited.
+
+    Parameters
+    ----------
+    total : RateLimit, optional
+        Budget shared by all endpoint classes, unlimited if not given
+    limits : Dict[str, RateLimit], optional
+        Budget per endpoint class, classes without a budget are only limited by `total`
+    priorities : Dict[str, int], optional
+        Priority per endpoint class, lower values go first, see DEFAULT_PRIORITIES
+
+    Examples
+    --------
+    >>> limiter = RateLimiter(total=RateLimit(rate=20), limits={"poll": RateLimit(rate=10, burst=20)})
+    >>> telq_api = TelQTelecomAPI(rate_limiter=limiter)
+    """ ""
+
+    def __init__(self, total: Optional[RateLimit] = None, limits: Optional[Dict[str, RateLimit]] = None,
+                 priorities: Optional[Dict[str, int]] = None, clock: Callable[[], float] = time.monotonic):
+        self.total = TokenBucket(total, clock) if total else None
+        self.buckets = {name: TokenBucket(limit, clock) for name, limit in (limits or {}).items()}
+        self.priorities = dict(DEFAULT_PRIORITIES, **(priorities or {}))
+
+    @staticmethod
+    def classify(method: str, url: str) -> Optional[str]:
+        """Endpoint class of a request, None if it is not limited"""
+        return ENDPOINT_CLASSES.get(endpoint_key(method, url), MANAGE)
+
+    def acquire(self, method: str, url: str) -> None:
+        """Blocks until the request may be sent"""
+        endpoint_class = self.classify(method, url)
+        if endpoint_class is None:
+            return
+        priority = self.priorities.get(endpoint_class, max(self.priorities.values()))
+        if endpoint_class in self.buckets:
+            self.buckets[endpoint_class].acquire(priority)
+        if self.total is not None:
+            self.total.acquire(priority)
+
+    async def acquire_async(self, method: str, url: str) -> None:
+        """Waits without blocking the event loop until the request may be sent"""
+        endpoint_class = self.classify(method, url)
+        if endpoint_class is None:
+            return
+        priority = self.priorities.get(endpoint_class, max(self.priorities.values()))
+        if endpoint_class in self.buckets:
+            await self.buckets[endpoint_class].acquire_async(priority)
+        if self.total is not None:
+            await self.total.acquire_async(priority)
+
+
+class RateLimitedTransport(Transport):
+    """Transport holding back requests of another transport according to a RateLimiter"""
+
+    def __init__(self, transport: Transport, limiter: RateLimiter):
+        self.transport = transport
+        self.limiter = limiter
+
+    def request(self, method: str, url: str, headers: Optional[dict] = None, json: Optional[Any] = None) -> TransportResponse:
+        self.limiter.acquire(method, url)
+        return self.transport.request(method, url, headers=headers, json=json)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncRateLimitedTransport(AsyncTransport):
+    """Asyncio counterpart of RateLimitedTransport"""
+
+    def __init__(self, transport: AsyncTransport, limiter: RateLimiter):
+        self.transport = transport
+        self.limiter = limiter
+
+    async def request(self, method: str, url: str, headers: Optional[dict] = None, json: Optional[Any] = None) -> TransportResponse:
+        await self.limiter.acquire_async(method, url)
+        return await self.transport.request(method, url, headers=headers, json=json)
+
+    async def close(self) -> None:
+        await self.transport.close()
@@ -1,40 +1,66 @@
-from typing import Optional
+from typing import Mapping, Optional
 from abc import ABC
 
-import requests
-from requests.exceptions import JSONDecodeError
-
 from telq.authentication import Authentication
+from telq.transport import RequestsTransport
 from telq.util.version import SDK_VERSION
 
+
+class APIError(ValueError):
+    """Error returned by the TelQ API in the response body.
+
+    It is a ValueError, the exception the clients have always raised for API errors.
+
+    Attributes:
+        status_code (int): HTTP status of the response.
+        body (dict): The error returned, e.g. {'error': 'Bad Request', 'message': '...'}.
+        headers (Mapping[str, str]): Headers of the response, e.g. Retry-After, empty if unknown.
+    """
+
+    def __init__(self, message: str, status_code: int, body: dict, headers: Optional[Mapping[str, str]] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers if headers is not None else {}
+
+
+def request_headers(authentication: Optional[Authentication] = None, extra_headers: Optional[dict] = None) -> dict:
+    """Headers sent with every API request, including the bearer token when authenticated"""
+    headers = {
+        "accept": "*/*",
+        "Content-Type": "application/json",
+        "User-Agent": f"python-sdk/{SDK_VERSION}"
+    }
+    if authentication:
+        headers["Authorization"] = authentication._bearer_token
+    if extra_headers:
+        headers.update(extra_headers)
+    return headers
+
+
 class TelQRest(ABC):
     def __init__(self, authentcation: Optional[Authentication] = None):
         self._authentication = authentcation
+        # share the authentication's transport so all clients reuse the same connections
+        self._transport = authentcation.transport if authentcation else RequestsTransport()
 
 
     def request(self, url: str, method: str, data: Optional[dict] = None, extra_headers: Optional[dict] = None) -> dict:
-        headers = {
-            "accept": "*/*",
-            "Content-Type": "application/json",
-            "User-Agent": f"python-sdk/{SDK_VERSION}"
-        }
+        headers = request_headers(self._authentication, extra_headers)
         if self._authentication:
-            headers["Authorization"] = self._authentication._bearer_token
-        if extra_headers:
-            headers.update(extra_headers)
-
-        response = requests.request(method, url, headers=headers, json=data)
+            # re-authenticates and replays the request if the token was rejected
+            response = self._authentication.request(method, url, headers=headers, json=data)
+        else:
+            response = self._transport.request(method, url, headers=headers, json=data)
 
         try:
             res = response.json()
-        except JSONDecodeError:
+        except ValueError:
             res = response.text
 
-        try:
-            if isinstance(res, dict) and res.get('error') != None:
-                raise ValueError(f"Server returned {url} HTTP {response.status_code}: {res}")
-            response.raise_for_status()
-        except requests.exceptions.HTTPError as e:
-            raise (e)
+        if isinstance(res, dict) and res.get('error') != None:
+            raise APIError(f"Server returned {url} HTTP {response.status_code}: {res}", response.status_code, res,
+                           response.headers)
+        response.raise_for_status()
 
         return res if isinstance(res, dict) else {"response": res}
@@ -0,0 +1,246 @@
+import asyncio
+import datetime as dt
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, FrozenSet, Optional
+
+import requests
+
+from telq.endpoints import endpoint_key
+from telq.transport import AsyncTransport, Transport, TransportResponse
+
+
+@dataclass
+class RetryPolicy:
+    """Decides which failed requests are retried and how long to wait before each retry.
+
+    Idempotent requests (GET, PUT, DELETE), e.g. `get_test_results`, `list` and `list_status`,
+    are retried on any status in `retry_statuses` and on connection errors. Other requests,
+    e.g. `initiate_new_tests` and `assign`, are only retried on statuses in
+    `non_idempotent_retry_statuses`, with which the server reports it did not process
+    the request, so a retry never creates the same tests twice.
+
+    The wait before retry n (starting at 0) is drawn uniformly from
+    [0, min(max_backoff, backoff_factor * 2 ** n)] ("full jitter"), unless the server
+    asks for a specific wait with a Retry-After header.
+
+    Attributes:
+        max_retries (int): Maximum number of retries after the first attempt. (default: 3)
+        backoff_factor (float): Base wait in seconds of the exponential backoff. (default: 0.5)
+        max_backoff (float): Maximum wait in seconds between two attempts. (default: 30)
+        jitter (bool): Randomise the wait to spread retries of concurrent requests. (default: True)
+        respect_retry_after (bool): Wait as long as the Retry-After header asks for. (default: True)
+        max_retry_after (float): Give up instead of waiting longer than this for Retry-After. (default: 120)
+        retry_statuses (FrozenSet[int]): Statuses retried for idempotent requests. (default: 429, 500, 502, 503, 504)
+        non_idempotent_retry_statuses (FrozenSet[int]): Statuses retried for other requests. (default: 429)
+        idempotent_methods (FrozenSet[str]): Methods safe to repeat. (default: GET, PUT, DELETE, HEAD, OPTIONS)
+    """
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30
+    jitter: bool = True
+    respect_retry_after: bool = True
+    max_retry_after: float = 120
+    retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    non_idempotent_retry_statuses: FrozenSet[int] = frozenset({429})
+    idempotent_methods: FrozenSet[str] = frozenset({"GET", "PUT", "DELETE", "HEAD", "OPTIONS"})
+
+    def is_idempotent(self, method: str) -> bool:
+        return method.upper() in self.idempotent_methods
+
+    def should_retry_status(self, method: str, status_code: int, attempt: int) -> bool:
+        if attempt >= self.max_retries:
+            return False
+        statuses = self.retry_statuses if self.is_idempotent(method) else self.non_idempotent_retry_statuses
+        return status_code in statuses
+
+    def should_retry_error(self, method: str, attempt: int) -> bool:
+        # a connection error does not tell whether the server processed the request
+        return attempt < self.max_retries and self.is_idempotent(method)
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """Seconds to wait before retry `attempt`, None if Retry-After asks to wait too long"""
+        if self.respect_retry_after and retry_after:
+            wait = parse_retry_after(retry_after)
+            if wait is not None:
+                return wait if wait <= self.max_retry_after else None
+        wait = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, wait) if self.jitter else wait
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Parses a Retry-After header given either in seconds or as an HTTP date"""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=dt.timezone.utc)
+    return max(0.0, (retry_at - dt.datetime.now(dt.timezone.utc)).total_seconds())
+
+
+@dataclass
+class EndpointRetryStats:
+    """Retry statistics of a single endpoint.
+
+    Attributes:
+        requests (int): Requests sent to the endpoint, not counting retries.
+        retries (int): Retries sent after a failed attempt.
+        failures (int): Requests whose final attempt failed, retried or not.
+        backoff_seconds (float): Total time spent waiting between attempts.
+        retried_statuses (Counter): How often each status (or exception name) was retried.
+    """
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    backoff_seconds: float = 0.0
+    retried_statuses: Counter = field(default_factory=Counter)
+
+
+class RetryStats:
+    """Thread-safe retry statistics per endpoint, keyed as in `telq.endpoints.endpoint_key`"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, EndpointRetryStats] = {}
+
+    def _endpoint(self, endpoint: str) -> EndpointRetryStats:
+        if endpoint not in self._endpoints:
+            self._endpoints[endpoint] = EndpointRetryStats()
+        return self._endpoints[endpoint]
+
+    def record_request(self, endpoint: str) -> None:
+        with self._lock:
+            self._endpoint(endpoint).requests += 1
+
+    def record_retry(self, endpoint: str, reason: Any, wait: float) -> None:
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats.retries += 1
+            stats.backoff_seconds += wait
+            stats.retried_statuses[reason] += 1
+
+    def record_failure(self, endpoint: str) -> None:
+        with self._lock:
+            self._endpoint(endpoint).failures += 1
+
+    def snapshot(self) -> Dict[str, EndpointRetryStats]:
+        """Copy of the statistics collected so far"""
+        with self._lock:
+            return {
+                endpoint: replace(stats, retried_statuses=Counter(stats.retried_statuses))
+                for endpoint, stats in self._endpoints.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+
+class _RetryState:
+    """Tracks the attempts of one request and decides whether to retry it"""
+
+    def __init__(self, policy: RetryPolicy, stats: RetryStats, method: str, url: str):
+        self.policy = policy
+        self.stats = stats
+        self.method = method
+        self.endpoint = endpoint_key(method, url)
+        self.attempt = 0
+        stats.record_request(self.endpoint)
+
+    def wait_after_response(self, response: TransportResponse) -> Optional[float]:
+        """Seconds to wait before retrying, None if the response is final"""
+        if response.status_code < 400:
+            return None
+        wait = None
+        if self.policy.should_retry_status(self.method, response.status_code, self.attempt):
+            wait = self.policy.backoff(self.attempt, response.headers.get("Retry-After"))
+        return self._next(wait, response.status_code)
+
+    def wait_after_error(self, error: Exception) -> Optional[float]:
+        wait = self.policy.backoff(self.attempt) if self.policy.should_retry_error(self.method, self.attempt) else None
+        return self._next(wait, type(error).__name__)
+
+    def _next(self, wait: Optional[float], reason: Any) -> Optional[float]:
+        if wait is None:
+            self.stats.record_failure(self.endpoint)
+            return None
+        self.stats.record_retry(self.endpoint, reason, wait)
+        self.attempt += 1
+        return wait
+
+
+class RetryingTransport(Transport):
+    """Transport retrying failed requests of another transport according to a RetryPolicy
+
+    Parameters
+    ----------
+    transport : Transport
+        The transport sending the requests
+    policy : RetryPolicy, optional
+        The retry policy, the default policy if not given
+    sleep : Callable[[float], None], default time.sleep
+        Waits for the given seconds between attempts
+    """ ""
+
+    def __init__(self, transport: Transport, policy: Optional[RetryPolicy] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.transport = transport
+        self.policy = policy or RetryPolicy()
+        self.stats = RetryStats()
+        self.sleep = sleep
+
+    def request(self, method: str, url: str, headers: Optional[dict] = None, json: Optional[Any] = None) -> TransportResponse:
+        state = _RetryState(self.policy, self.stats, method, url)
+        while True:
+            try:
+                response = self.transport.request(method, url, headers=headers, json=json)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                wait = state.wait_after_error(e)
+                if wait is None:
+                    raise
+            else:
+                wait = state.wait_after_response(response)
+                if wait is None:
+                    return response
+            self.sleep(wait)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncRetryingTransport(AsyncTransport):
+    """Asyncio counterpart of RetryingTransport"""
+
+    def __init__(self, transport: AsyncTransport, policy: Optional[RetryPolicy] = None,
+                 sleep: Callable[[float], Any] = asyncio.sleep):
+        self.transport = transport
+        self.policy = policy or RetryPolicy()
+        self.stats = RetryStats()
+        self.sleep = sleep
+
+    async def request(self, method: str, url: str, headers: Optional[dict] = None, json: Optional[Any] = None) -> TransportResponse:
+        state = _RetryState(self.policy, self.stats, method, url)
+        while True:
+            try:
+                response = await self.transport.request(method, url, headers=headers, json=json)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                wait = state.wait_after_error(e)
+                if wait is None:
+                    raise
+            else:
+                wait = state.wait_after_response(response)
+                if wait is None:
+                    return response
+            await self.sleep(wait)
+
+    async def close(self) -> None:
+        await self.transport.close()
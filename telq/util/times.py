@@ -0,0 +1,22 @@
+import datetime as dt
+from typing import Union
+
+TimeLike = Union[str, dt.datetime]
+
+
+def parse_time(value: TimeLike) -> dt.datetime:
+    """Parses a time of the TelQ API, e.g. '2022-05-13T19:46:38.011254Z', as an aware UTC datetime"""
+    if isinstance(value, str):
+        text = value.strip().replace("Z", "+00:00")
+        # fromisoformat of Python < 3.11 only accepts 3 or 6 digit fractions
+        head, dot, rest = text.partition(".")
+        if dot:
+            digits = len(rest) - len(rest.lstrip("0123456789"))
+            text = head + "." + rest[:digits][:6].ljust(6, "0") + rest[digits:]
+        value = dt.datetime.fromisoformat(text)
+    return value if value.tzinfo else value.replace(tzinfo=dt.timezone.utc)
+
+
+def format_time(value: TimeLike) -> str:
+    """Formats a time the way the TelQ API expects it in queries"""
+    return parse_time(value).astimezone(dt.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
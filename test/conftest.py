@@ -0,0 +1,26 @@
+import pytest
+from telq import TelQTelecomAPI
+from telq.session.session_data import SessionData
+from telq.supplier.supplier_data import SupplierData
+from telq.transport.fake import FakeTelQServer, FakeTransport
+
+
+@pytest.fixture
+def fake_server():
+    """In-memory TelQ server which delivers tests immediately"""
+    return FakeTelQServer(credentials={"app-id": "app-key"}, result_delay=0, seed=1)
+
+
+@pytest.fixture
+def offline_api(fake_server: FakeTelQServer):
+    """TelQTelecomAPI authenticated against the in-memory TelQ server"""
+    telq_api = TelQTelecomAPI(transport=FakeTransport(fake_server))
+    telq_api.authenticate(api_id="app-id", api_key="app-key")
+    return telq_api
+
+
+@pytest.fixture
+def supplier_id(offline_api: TelQTelecomAPI) -> int:
+    """Supplier of the in-memory TelQ server, for LNT tests"""
+    session_id = offline_api.session.create(SessionData("127.0.0.1", 2775, "user", "pass"))["smppSessionId"]
+    return offline_api.supplier.create(SupplierData(session_id, "supplier", "Wholesale"))["supplierId"]
@@ -0,0 +1,136 @@
+""" Test the aiohttp transport against an in-memory TelQ server listening on localhost"""
+
+import asyncio
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+pytest.importorskip("aiohttp")
+
+from telq.aio import AsyncTelQTelecomAPI
+from telq.aio.transport import AiohttpTransport
+from telq.session.session_data import SessionData
+from telq.tests.batch import TestBatch as Batch
+from telq.transport import EncodedJSON
+from telq.transport.fake import FakeTelQServer
+from telq.util.pool import PoolConfig
+from telq.util.rest import APIError
+
+
+def serve(fake_server: FakeTelQServer, delay: float = 0):
+    """Serves `fake_server` over HTTP on a free local port, returns the HTTP server"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def handle_request(self):
+            time.sleep(delay)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length)) if length else None
+            response = fake_server.handle(self.command, f"http://localhost{self.path}", dict(self.headers), body)
+            self.send_response(response.status_code)
+            for name, value in response.headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(response.content)))
+            self.end_headers()
+            self.wfile.write(response.content)
+
+        do_GET = do_POST = do_PUT = do_DELETE = handle_request
+
+        def log_message(self, *args):
+            pass
+
+    http_server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    return http_server
+
+
+@pytest.fixture
+def base_url(fake_server: FakeTelQServer):
+    http_server = serve(fake_server)
+    yield f"http://127.0.0.1:{http_server.server_port}"
+    http_server.shutdown()
+    http_server.server_close()
+
+
+def test_client_over_aiohttp(base_url: str, fake_server: FakeTelQServer):
+    async def run():
+        async with AsyncTelQTelecomAPI(base_url=base_url, refresh_margin=None) as telq_api:
+            assert isinstance(telq_api._transport, AiohttpTransport)
+            await telq_api.authenticate(api_id="app-id", api_key="app-key")
+            session_id = (await telq_api.session.create(SessionData("10.0.0.1", 2775, "user", "pass")))["smppSessionId"]
+            assert (await telq_api.session.get(session_id))["hostIp"] == "10.0.0.1"
+            with pytest.raises(APIError) as error:
+                await telq_api.session.get(session_id + 1)
+            assert error.value.status_code == 404
+
+    asyncio.run(run())
+
+
+def test_request_bodies(base_url: str, fake_server: FakeTelQServer):
+    async def run():
+        transport = AiohttpTransport()
+        try:
+            token = (await transport.request("POST", f"{base_url}/v3/client/token",
+                                             json={"appId": "app-id", "appKey": "app-key"})).json()["value"]
+            headers = {"Authorization": token}
+            session = {"hostIp": "10.0.0.1", "hostPort": 2775, "systemId": "user", "password": "pass"}
+            for body in (session, EncodedJSON(json.dumps(session).encode("utf-8"))):
+                response = await transport.request("POST", f"{base_url}/v3/client/sessions", headers, body)
+                assert response.status_code == 200 and "smppSessionId" in response.json()
+            assert response.headers["content-type"] == "application/json"
+        finally:
+            await transport.close()
+        assert transport._session is None
+
+    asyncio.run(run())
+
+
+def test_batch_request(base_url: str, fake_server: FakeTelQServer, supplier_id: int):
+    async def run():
+        async with AsyncTelQTelecomAPI(base_url=base_url, refresh_margin=None) as telq_api:
+            await telq_api.authenticate(api_id="app-id", api_key="app-key")
+            network = fake_server.networks[0]
+            batch = Batch("sender", "text", supplier_id)
+            batch.extend([network] * 3)
+            return await telq_api.lnt.initiate_new_tests(batch)
+
+    assert len(asyncio.run(run())["response"]) == 3
+
+
+def test_connection_errors_are_mapped():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    async def run():
+        transport = AiohttpTransport()
+        try:
+            await transport.request("GET", f"http://127.0.0.1:{port}/v3/client/networks")
+        finally:
+            await transport.close()
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        asyncio.run(run())
+
+
+def test_timeouts_are_mapped(fake_server: FakeTelQServer):
+    http_server = serve(fake_server, delay=1)
+
+    async def run():
+        transport = AiohttpTransport(PoolConfig(timeout=0.2))
+        try:
+            await transport.request("GET", f"http://127.0.0.1:{http_server.server_port}/v3/client/networks")
+        finally:
+            await transport.close()
+
+    try:
+        with pytest.raises(requests.exceptions.Timeout):
+            asyncio.run(run())
+    finally:
+        http_server.shutdown()
+        http_server.server_close()
@@ -0,0 +1,83 @@
+""" Test the time-sharded LNT backfill against the in-memory TelQ server"""
+
+import datetime as dt
+
+import pytest
+from telq import TelQTelecomAPI
+from telq.session.session_data import SessionData
+from telq.supplier.supplier_data import SupplierData
+from telq.tests import Test as LNTTest
+from telq.tests.backfill import BackfillWindow, LNTBackfill
+from telq.transport.fake import FakeTelQServer, FakeTransport
+
+START = dt.datetime(2022, 5, 1, tzinfo=dt.timezone.utc)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = START.timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def backfill_api(clock: FakeClock):
+    server = FakeTelQServer(result_delay=0, clock=clock, seed=1, token_ttl=10 ** 9)
+    telq_api = TelQTelecomAPI(transport=FakeTransport(server), refresh_margin=None)
+    telq_api.authenticate(api_id="app-id", api_key="app-key")
+    session_id = telq_api.session.create(SessionData("127.0.0.1", 2775, "user", "pass"))["smppSessionId"]
+    telq_api.supplier_id = telq_api.supplier.create(SupplierData(session_id, "supplier", "Wholesale"))["supplierId"]
+    telq_api.server = server
+    return telq_api
+
+
+def create_tests(telq_api: TelQTelecomAPI, clock: FakeClock, at: dt.datetime, count: int) -> list:
+    clock.now = at.timestamp()
+    tests = [LNTTest("TelQ", "hello", "ALPHA", "LOWER", 7, telq_api.supplier_id, "246", "03") for _ in range(count)]
+    return [test["id"] for test in telq_api.lnt.initiate_new_tests(tests)["response"]]
+
+
+def test_windows():
+    window = BackfillWindow(START, START + dt.timedelta(days=1))
+    assert window.contains(START) and not window.contains(window.end)
+    halves = BackfillWindow(START, START + dt.timedelta(days=1), last=True).split(2)
+    assert [half.last for half in halves] == [False, True]
+    assert halves[0].end == halves[1].start and halves[1].contains(halves[1].end)
+
+
+def test_backfill_returns_each_test_once(backfill_api: TelQTelecomAPI, clock: FakeClock):
+    ids = []
+    for day in range(10):
+        # tests created exactly at a window boundary belong to the window they start
+        ids += create_tests(backfill_api, clock, START + dt.timedelta(days=day), 3)
+        ids += create_tests(backfill_api, clock, START + dt.timedelta(days=day, hours=12), 2)
+    ids += create_tests(backfill_api, clock, START + dt.timedelta(days=10), 1)
+
+    backfill = LNTBackfill(backfill_api.lnt, window=dt.timedelta(days=1), size=2, max_workers=4)
+    results = list(backfill.run(START, START + dt.timedelta(days=10)))
+    assert sorted(result["id"] for result in results) == sorted(ids)
+    assert backfill.stats.windows == 10 and backfill.stats.results == len(ids)
+
+
+def test_backfill_splits_crowded_windows(backfill_api: TelQTelecomAPI, clock: FakeClock):
+    ids = []
+    for hour in range(24):
+        ids += create_tests(backfill_api, clock, START + dt.timedelta(hours=hour, minutes=30), 4)
+
+    backfill = LNTBackfill(backfill_api.lnt, window=dt.timedelta(days=1), max_pages=2, size=5, max_workers=3)
+    results = list(backfill.run(START, START + dt.timedelta(days=1)))
+    assert sorted(result["id"] for result in results) == sorted(ids)
+    assert backfill.stats.splits >= 1 and backfill.stats.windows > 1
+    # no window fetched more than max_pages pages
+    assert backfill.stats.requests <= backfill.stats.splits + backfill.stats.windows * 2
+
+
+def test_backfill_range_validation(backfill_api: TelQTelecomAPI):
+    with pytest.raises(ValueError):
+        LNTBackfill(backfill_api.lnt).windows(START, START - dt.timedelta(days=1))
@@ -0,0 +1,47 @@
+""" Test building and sending LNT tests column-wise with TestBatch"""
+
+import json
+
+import pytest
+from telq import TelQTelecomAPI
+from telq.tests import Test as LNTTest
+from telq.tests.batch import TestBatch as Batch
+from telq.transport.fake import FakeTelQServer
+
+
+def make_batch(supplier_id: int = 1) -> Batch:
+    return Batch("TelQ", "hello", supplier_id, "ALPHA", "LOWER", 7,
+                 mcc=["246", "246", "310"], mnc=["03", "02", "012"], portedFromMnc=[None, "01", "260"])
+
+
+def test_batch_json_matches_tests():
+    batch = make_batch()
+    tests = [LNTTest("TelQ", "hello", "ALPHA", "LOWER", 7, 1, mcc, mnc, ported)
+             for mcc, mnc, ported in [("246", "03", None), ("246", "02", "01"), ("310", "012", "260")]]
+    assert json.loads(batch.to_json()) == [test.__dict__ for test in tests]
+    assert list(batch) == tests and batch[1] == tests[1]
+    assert json.loads(Batch("TelQ", "hello", 1).to_json()) == []
+
+
+def test_batch_building():
+    batch = make_batch()
+    batch.add("716", "06")
+    batch.extend([{"mcc": "206", "mnc": "10", "portedFromMnc": "20"}])
+    assert len(batch) == 5 and batch.mcc[-2:] == ["716", "206"] and batch.portedFromMnc[-2:] == [None, "20"]
+    assert isinstance(batch[1:3], Batch) and batch[1:3].mnc == ["02", "012"]
+    with pytest.raises(ValueError):
+        batch.extend_columns(["246"], ["03", "02"])
+
+    tests = list(batch) + [LNTTest("Other", "hello", "ALPHA", "LOWER", 7, 1, "246", "03")]
+    assert [len(grouped) for grouped in Batch.from_tests(tests)] == [5, 1]
+
+
+def test_send_batch(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer, supplier_id: int):
+    batch = make_batch(supplier_id)
+    created = offline_api.lnt.initiate_new_tests(batch, commentText="columns")["response"]
+    assert [(test["mcc"], test["mnc"], test["portedFromMnc"]) for test in created] == list(
+        zip(batch.mcc, batch.mnc, batch.portedFromMnc))
+    assert all(fake_server.lnt_tests[test["id"]]["commentText"] == "columns" for test in created)
+
+    with pytest.raises(KeyError):
+        offline_api.lnt.initiate_new_tests(Batch("TelQ", "hello", supplier_id))
@@ -0,0 +1,194 @@
+""" Test chunked bulk test creation against the in-memory TelQ server"""
+
+import asyncio
+
+import pytest
+import requests
+from telq import TelQTelecomAPI
+from telq.aio import AsyncTelQTelecomAPI
+from telq.session.session_data import SessionData
+from telq.supplier.supplier_data import SupplierData
+from telq.tests import Test as LNTTest
+from telq.tests.batch import TestBatch as Batch
+from telq.transport.fake import AsyncFakeTransport, FakeTelQServer
+from telq.util.bulk import chunked, retrying
+from telq.util.rest import APIError
+from telq.util.retry import RetryPolicy
+
+
+def destinations(fake_server: FakeTelQServer, count: int) -> list:
+    networks = fake_server.networks
+    return [
+        {"mcc": network["mcc"], "mnc": network["mnc"], "portedFromMnc": network["portedFromMnc"]}
+        for network in (networks[i % len(networks)] for i in range(count))
+    ]
+
+
+def test_chunked():
+    assert chunked([1, 2, 3, 4, 5], 2) == [[1, 2], [3, 4], [5]]
+    with pytest.raises(ValueError):
+        chunked([1], 0)
+
+
+def test_bulk_keeps_input_order(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    networks = destinations(fake_server, 45)
+    result = offline_api.mt.initiate_new_tests_bulk(networks, chunk_size=10, max_workers=4)
+    assert result.ok
+    assert [test["destinationNetwork"]["mnc"] for test in result.results] == [network["mnc"] for network in networks]
+    assert fake_server.requests["POST /tests"] == 5
+
+
+def test_bulk_reports_failed_chunks(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    networks = destinations(fake_server, 30)
+    fake_server.fail_next(500, endpoint="POST /tests")
+    result = offline_api.mt.initiate_new_tests_bulk(networks, chunk_size=10, max_workers=1)
+    assert not result.ok
+    assert len(result.results) == 20
+    [failure] = result.failures
+    assert (failure.index, failure.start) == (0, 0)
+    assert failure.items == networks[:10] == result.failed_items()
+
+    retried = offline_api.mt.initiate_new_tests_bulk(result.failed_items())
+    assert retried.ok and len(retried.results) == 10
+
+
+def test_bulk_validates_before_sending(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    with pytest.raises(KeyError):
+        offline_api.mt.initiate_new_tests_bulk(destinations(fake_server, 5) + [{"mcc": "310"}], chunk_size=2)
+    assert fake_server.requests["POST /tests"] == 0
+
+
+def lnt_tests(supplier_id: int, count: int, bad: tuple = ()) -> list:
+    # tests sent through an unknown supplier make the API reject their whole batch
+    return [LNTTest("TelQ", "hello", "ALPHA", "LOWER", 7, 999 if i in bad else supplier_id, "246", "03")
+            for i in range(count)]
+
+
+def test_lnt_bulk_isolates_rejected_tests(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer, supplier_id: int):
+    tests = lnt_tests(supplier_id, 40, bad=(3, 27))
+    result = offline_api.lnt.initiate_new_tests_bulk(tests, chunk_size=10, max_workers=4, commentText="bulk")
+    assert [(failure.index, failure.start) for failure in result.failures] == [(0, 3), (2, 27)]
+    assert result.failed_items() == [tests[3], tests[27]]
+    assert all(failure.error.status_code == 400 for failure in result.failures)
+    assert len(result.results) == len(fake_server.lnt_tests) == 38
+    assert {test["commentText"] for test in fake_server.lnt_tests.values()} == {"bulk"}
+
+    unsplit = offline_api.lnt.initiate_new_tests_bulk(tests, chunk_size=10, split_rejected=False)
+    assert [len(failure.items) for failure in unsplit.failures] == [10, 10] and len(unsplit.results) == 20
+
+
+def test_lnt_bulk_splits_oversized_batches(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer,
+                                           supplier_id: int):
+    fake_server.max_lnt_tests = 4
+    batch = Batch("TelQ", "hello", supplier_id, mcc=["246"] * 25, mnc=["03"] * 25)
+    result = offline_api.lnt.initiate_new_tests_bulk(batch, chunk_size=10)
+    assert result.ok and len(result.results) == 25
+    # chunks of 10 are split in halves of 5, then in parts of 2 and 3, the last chunk of 5 once
+    assert fake_server.requests["POST /lnt/tests"] == 2 * (1 + 2 + 4) + (1 + 2)
+
+
+def test_lnt_bulk_does_not_split_other_errors(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer,
+                                              supplier_id: int):
+    fake_server.fail_next(503, endpoint="POST /lnt/tests")
+    result = offline_api.lnt.initiate_new_tests_bulk(lnt_tests(supplier_id, 20), chunk_size=10, max_workers=1)
+    assert [len(failure.items) for failure in result.failures] == [10]
+    assert fake_server.requests["POST /lnt/tests"] == 2
+
+
+def test_async_bulk(fake_server: FakeTelQServer):
+    async def main():
+        async with AsyncTelQTelecomAPI(transport=AsyncFakeTransport(fake_server)) as telq_api:
+            await telq_api.authenticate(api_id="app-id", api_key="app-key")
+            networks = destinations(fake_server, 25)
+            fake_server.fail_next(503, endpoint="POST /tests")
+            result = await telq_api.mt.initiate_new_tests_bulk(networks, chunk_size=10, max_workers=1)
+            assert [failure.start for failure in result.failures] == [0]
+            assert [test["destinationNetwork"]["mnc"] for test in result.results] == [n["mnc"] for n in networks[10:]]
+
+    asyncio.run(main())
+
+
+def test_async_lnt_bulk(fake_server: FakeTelQServer, supplier_id: int):
+    async def main():
+        async with AsyncTelQTelecomAPI(transport=AsyncFakeTransport(fake_server)) as telq_api:
+            await telq_api.authenticate(api_id="app-id", api_key="app-key")
+            tests = lnt_tests(supplier_id, 16, bad=(0, 9))
+            result = await telq_api.lnt.initiate_new_tests_bulk(tests, chunk_size=8, max_workers=3)
+            assert [failure.start for failure in result.failures] == [0, 9]
+            assert len(result.results) == 14
+
+    asyncio.run(main())
+
+
+def failover_setup(api: TelQTelecomAPI, suppliers: int = 120):
+    sessions = [api.session.create(SessionData(f"10.0.0.{i}", 2775, "user", "pass"))["smppSessionId"]
+                for i in range(2)]
+    ids = [api.supplier.create(SupplierData(sessions[0], f"supplier {i}", "Wholesale"))["supplierId"]
+           for i in range(suppliers)]
+    return sessions, ids
+
+
+def test_chunk_retries_follow_the_policy():
+    waits = []
+    errors = [APIError("busy", 503, {"error": "busy"}, {"Retry-After": "7"}), requests.exceptions.Timeout(),
+              APIError("bad", 400, {"error": "bad"})]
+
+    def send(chunk):
+        raise errors.pop(0)
+
+    with pytest.raises(APIError) as error:
+        retrying(send, RetryPolicy(max_retries=3, backoff_factor=1), sleep=waits.append)([1])
+    # Retry-After is honored, other waits are jittered, and rejected chunks are not retried
+    assert error.value.status_code == 400 and errors == []
+    assert waits[0] == 7 and 0 <= waits[1] <= 2 and len(waits) == 2
+
+
+@pytest.mark.parametrize("error", [APIError("not found", 404, {"error": "Not Found"}), KeyError("supplierId")])
+def test_only_transient_errors_are_retried(error: Exception):
+    waits = []
+    calls = []
+
+    def send(chunk):
+        calls.append(chunk)
+        raise error
+
+    with pytest.raises(type(error)):
+        retrying(send, RetryPolicy(max_retries=3), sleep=waits.append)([1])
+    assert len(calls) == 1 and waits == []
+
+
+def test_assign_bulk_retries_and_isolates(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    (_, standby), ids = failover_setup(offline_api)
+    offline_api.supplier.delete(ids[7])
+    fake_server.fail_next(503, count=2, endpoint="POST /suppliers/assign")
+    result = offline_api.supplier.assign_bulk(standby, ids, chunk_size=25,
+                                              retry=RetryPolicy(max_retries=2, backoff_factor=0))
+    assert result.results == ids[:7] + ids[8:]
+    assert [(failure.start, failure.items) for failure in result.failures] == [(7, [ids[7]])]
+    assert all(supplier["smppSessionId"] == standby for supplier in fake_server.suppliers.values())
+
+
+def test_assign_bulk_gives_up_after_retries(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    (_, standby), ids = failover_setup(offline_api, suppliers=10)
+    fake_server.fail_next(503, count=3, endpoint="POST /suppliers/assign")
+    result = offline_api.supplier.assign_bulk(standby, ids, chunk_size=5, max_workers=1,
+                                              retry=RetryPolicy(max_retries=2, backoff_factor=0))
+    assert result.failed_items() == ids[:5] and result.results == ids[5:]
+    # resuming assigns the rest
+    assert offline_api.supplier.assign_bulk(standby, result.failed_items()).ok
+
+
+def test_assign_bulk_async(fake_server: FakeTelQServer):
+    async def run():
+        async with AsyncTelQTelecomAPI(transport=AsyncFakeTransport(fake_server)) as telq_api:
+            await telq_api.authenticate(api_id="app-id", api_key="app-key")
+            sessions = [(await telq_api.session.create(SessionData(f"10.0.0.{i}", 2775, "user", "pass")))
+                        ["smppSessionId"] for i in range(2)]
+            ids = [(await telq_api.supplier.create(SupplierData(sessions[0], f"s{i}", "Wholesale")))["supplierId"]
+                   for i in range(40)]
+            fake_server.fail_next(503, endpoint="POST /suppliers/assign")
+            result = await telq_api.supplier.assign_bulk(sessions[1], ids, chunk_size=10,
+                                                         retry=RetryPolicy(backoff_factor=0))
+            assert result.ok and result.results == ids
+
+    asyncio.run(run())
@@ -0,0 +1,89 @@
+""" Test the callback receiver by posting test results to localhost"""
+
+import asyncio
+import functools
+
+import requests
+from telq.aio.callbacks import CallbackReceiver
+
+RESULT = {"id": 13754642, "testIdText": "woOMJtrQAy", "testStatus": "POSITIVE"}
+
+
+async def post(receiver: CallbackReceiver, payload, token="secret", path=None, session=None) -> requests.Response:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    url = receiver.url if path is None else receiver.url.rsplit("/", 1)[0] + path
+    send = functools.partial((session or requests).post, url, json=payload, headers=headers, timeout=5)
+    return await asyncio.get_running_loop().run_in_executor(None, send)
+
+
+def test_receives_results():
+    async def main():
+        async with CallbackReceiver(token="secret", path="/telq") as receiver:
+            assert (await post(receiver, RESULT)).status_code == 200
+            assert (await post(receiver, [dict(RESULT, id=1), dict(RESULT, id=2)])).status_code == 200
+            assert [await receiver.__anext__() for _ in range(3)] == [RESULT, dict(RESULT, id=1), dict(RESULT, id=2)]
+            assert receiver.received == 3
+
+    asyncio.run(main())
+
+
+def test_rejects_invalid_callbacks():
+    async def main():
+        async with CallbackReceiver(token="secret", path="/telq") as receiver:
+            assert (await post(receiver, RESULT, token="wrong")).status_code == 401
+            assert (await post(receiver, RESULT, token=None)).status_code == 401
+            assert (await post(receiver, RESULT, path="/other")).status_code == 404
+            assert (await post(receiver, "not a result")).status_code == 400
+            assert receiver.queue.empty() and receiver.rejected == 4
+
+    asyncio.run(main())
+
+
+def test_dispatches_to_handlers():
+    async def main():
+        received = []
+
+        async def handler(result):
+            received.append(result["id"])
+
+        receiver = CallbackReceiver()
+        receiver.add_handler(handler)
+        receiver.add_handler(lambda result: 1 / 0)  # failing handlers do not stop the others
+        async with receiver:
+            with requests.Session() as session:  # keep-alive connection
+                for test_id in range(5):
+                    assert (await post(receiver, dict(RESULT, id=test_id), token=None, session=session)).status_code == 200
+            await receiver.queue.join()
+        assert sorted(received) == list(range(5))
+
+    asyncio.run(main())
+
+
+def test_backpressure():
+    async def main():
+        async with CallbackReceiver(max_queue=2, put_timeout=0.05) as receiver:
+            statuses = [(await post(receiver, dict(RESULT, id=test_id), token=None)).status_code for test_id in range(3)]
+            assert statuses == [200, 200, 503]
+            response = await post(receiver, RESULT, token=None)
+            assert response.headers["Retry-After"] == "1"
+            await receiver.__anext__()
+            assert (await post(receiver, RESULT, token=None)).status_code == 200
+
+    asyncio.run(main())
+
+
+def test_batches_are_queued_whole():
+    async def main():
+        async with CallbackReceiver(max_queue=3, put_timeout=0.05) as receiver:
+            assert (await post(receiver, dict(RESULT, id=0), token=None)).status_code == 200
+            # only two of the three results fit: none is queued and the batch is sent again later
+            batch = [dict(RESULT, id=test_id) for test_id in range(1, 4)]
+            assert (await post(receiver, batch, token=None)).status_code == 503
+            assert receiver.queue.qsize() == 1 and receiver.received == 1
+            assert (await post(receiver, [RESULT] * 4, token=None)).status_code == 413
+
+            await receiver.__anext__()
+            assert (await post(receiver, batch, token=None)).status_code == 200
+            assert [await receiver.__anext__() for _ in range(3)] == batch
+
+    asyncio.run(main())
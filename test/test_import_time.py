@@ -0,0 +1,78 @@
+import subprocess
+import sys
+
+import pytest
+from telq import TelQTelecomAPI
+from telq.transport.fake import FakeTransport
+
+# modules `import telq` must not load, they are imported when first needed
+DEFERRED_MODULES = ["requests", "urllib3", "asyncio", "aiohttp", "toml", "telq.aio", "telq.session", "telq.supplier",
+                    "telq.tests", "telq.networks", "telq.reconcile", "telq.transport.fake", "telq.util.retry",
+                    "telq.util.ratelimit", "telq.util.pool", "telq.util.bulk", "telq.util.paging",
+                    "telq.util.rest", "telq.authentication.refresh"]
+
+
+def run_python(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+
+
+def loaded(modules_code: str) -> list:
+    """Deferred modules loaded after running `modules_code` in a fresh interpreter"""
+    output = run_python(
+        modules_code + "\nimport sys\n"
+        f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    return [module for module in output.strip().split(",") if module]
+
+
+def test_import_is_lazy():
+    """Test importing telq does not import requests, asyncio or the clients"""
+    assert loaded("import telq") == []
+
+
+def test_constructing_the_client_is_lazy():
+    """Test creating a TelQTelecomAPI does not import the clients or asyncio"""
+    modules = loaded("from telq import TelQTelecomAPI\nTelQTelecomAPI()")
+    assert not {"asyncio", "aiohttp", "telq.aio", "telq.session", "telq.supplier", "telq.tests"} & set(modules)
+
+
+def test_lazy_exports():
+    """Test the clients and data classes can still be imported from telq"""
+    from telq import LNT, MT, Networks, Session, SessionData, Supplier, SupplierData, Test
+    from telq.tests import MT as tests_MT
+    assert MT is tests_MT
+    with pytest.raises(ImportError):
+        from telq import NotAClient  # noqa: F401
+
+
+def test_clients_built_on_access():
+    """Test only the clients used are imported"""
+    code = (
+        "from telq import TelQTelecomAPI\n"
+        "from telq.transport.fake import FakeTelQServer, FakeTransport\n"
+        "telq_api = TelQTelecomAPI(transport=FakeTransport(FakeTelQServer(credentials={'id': 'key'})))\n"
+        "telq_api.authenticate(api_id='id', api_key='key')\n"
+        "telq_api.mt\n"
+    )
+    modules = loaded(code)
+    assert "telq.tests" in modules
+    assert "telq.session" not in modules
+    assert "telq.supplier" not in modules
+
+
+def test_clients_require_authentication():
+    """Test clients cannot be used before authenticating"""
+    telq_api = TelQTelecomAPI(transport=FakeTransport())
+    with pytest.raises(RuntimeError):
+        _ = telq_api.mt
+
+
+def test_clients_rebuilt_after_authentication(offline_api: TelQTelecomAPI):
+    """Test clients are cached and follow a new authentication"""
+    mt = offline_api.mt
+    assert offline_api.mt is mt
+    assert mt._authentication is offline_api._authenticated
+    offline_api._authenticated.expires_at = 0
+    offline_api.authenticate(api_id="app-id", api_key="app-key")
+    assert offline_api.mt is not mt
+    assert offline_api.mt._authentication is offline_api._authenticated
@@ -0,0 +1,127 @@
+""" Test the read-through cache of sessions and suppliers"""
+
+import asyncio
+
+from telq import TelQTelecomAPI
+from telq.aio import AsyncTelQTelecomAPI
+from telq.session.session_data import SessionData
+from telq.supplier.supplier_data import SupplierData
+from telq.transport.fake import AsyncFakeTransport, FakeTelQServer
+from telq.util.cache import ItemCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_and_ttl():
+    clock = FakeClock()
+    cache = ItemCache(max_size=2, ttl=10, clock=clock)
+    cache.put(1, "a")
+    cache.put(2, "b")
+    assert cache.get(1) == "a"
+    cache.put(3, "c")
+    # 2 was the least recently used
+    assert cache.get(2) is None and cache.get(1) == "a" and len(cache) == 2
+    clock.now = 10
+    assert cache.get(1) is None and cache.get(3) is None
+    assert cache.stats() == {"size": 0, "hits": 2, "misses": 3}
+
+
+def test_put_after_invalidation_is_dropped():
+    cache = ItemCache()
+    generation = cache.generation
+    cache.invalidate(1)
+    cache.put(1, "read before the update", generation)
+    assert cache.get(1) is None
+
+
+def test_session_get_is_cached_and_invalidated(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    session = offline_api.session
+    session.cache = ItemCache(ttl=30)
+    session_id = session.create(SessionData("10.0.0.1", 2775, "user", "pass"))["smppSessionId"]
+    fake_server.requests.clear()
+
+    assert session.get(session_id)["throughput"] == 5
+    assert session.get(session_id) is session.get(session_id)
+    assert fake_server.requests["GET /sessions/{id}"] == 1
+
+    session.update(SessionData("10.0.0.1", 2775, "user", "pass", smppSessionId=session_id, throughput=20))
+    assert session.get(session_id)["throughput"] == 20
+    assert fake_server.requests["GET /sessions/{id}"] == 2
+
+
+def test_supplier_cache_is_warmed_by_list(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    sessions = [offline_api.session.create(SessionData(f"10.0.0.{i}", 2775, "user", "pass"))["smppSessionId"]
+                for i in range(2)]
+    ids = [offline_api.supplier.create(SupplierData(sessions[0], f"supplier {i}", "Wholesale"))["supplierId"]
+           for i in range(30)]
+    supplier = offline_api.supplier
+    supplier.cache = ItemCache()
+    assert len(supplier.fetch_all()) == 30
+    fake_server.requests.clear()
+
+    assert all(supplier.get(supplier_id)["smppSessionId"] == sessions[0] for supplier_id in ids)
+    assert fake_server.requests["GET /suppliers/{id}"] == 0
+
+    supplier.assign(sessions[1], ids[:5])
+    supplier.delete(ids[-1])
+    assert [supplier.get(supplier_id)["smppSessionId"] for supplier_id in ids[:6]] == [sessions[1]] * 5 + [sessions[0]]
+    assert fake_server.requests["GET /suppliers/{id}"] == 5
+    assert len(supplier.cache) == 29
+
+    # ids given as strings invalidate the cached suppliers too
+    supplier.assign(sessions[0], [str(supplier_id) for supplier_id in ids[:5]])
+    assert [supplier.get(supplier_id)["smppSessionId"] for supplier_id in ids[:5]] == [sessions[0]] * 5
+
+
+def test_async_supplier_cache(fake_server: FakeTelQServer):
+    async def run():
+        async with AsyncTelQTelecomAPI(transport=AsyncFakeTransport(fake_server)) as telq_api:
+            await telq_api.authenticate(api_id="app-id", api_key="app-key")
+            telq_api.supplier.cache = ItemCache()
+            session_id = (await telq_api.session.create(SessionData("10.0.0.1", 2775, "user", "pass")))["smppSessionId"]
+            supplier_id = (await telq_api.supplier.create(SupplierData(session_id, "supplier", "Wholesale")))["supplierId"]
+            await telq_api.supplier.fetch_all()
+            fake_server.requests.clear()
+            assert (await telq_api.supplier.get(supplier_id))["supplierName"] == "supplier"
+            await telq_api.supplier.update(SupplierData(session_id, "renamed", "Wholesale", supplierId=supplier_id))
+            assert (await telq_api.supplier.get(supplier_id))["supplierName"] == "renamed"
+            assert fake_server.requests["GET /suppliers/{id}"] == 1
+
+    asyncio.run(run())
+
+
+def test_cache_kept_when_authenticating_again(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    offline_api.session.cache = cache = ItemCache()
+    session_id = offline_api.session.create(SessionData("10.0.0.1", 2775, "user", "pass"))["smppSessionId"]
+    offline_api.session.get(session_id)
+    # the token expired
+    offline_api._authenticated.expires_at = 0
+    offline_api.authenticate(api_id="app-id", api_key="app-key")
+    assert offline_api.session.cache is cache
+    fake_server.requests.clear()
+    offline_api.session.get(session_id)
+    assert fake_server.requests["GET /sessions/{id}"] == 0 and cache.hits == 1
+
+
+def test_async_cache_kept_when_authenticating_again(fake_server: FakeTelQServer):
+    async def run():
+        async with AsyncTelQTelecomAPI(transport=AsyncFakeTransport(fake_server)) as telq_api:
+            await telq_api.authenticate(api_id="app-id", api_key="app-key")
+            telq_api.supplier.cache = cache = ItemCache()
+            session_id = (await telq_api.session.create(SessionData("10.0.0.1", 2775, "user", "pass")))["smppSessionId"]
+            supplier_id = (await telq_api.supplier.create(SupplierData(session_id, "supplier", "Wholesale")))["supplierId"]
+            await telq_api.supplier.get(supplier_id)
+            telq_api._authenticated.expires_at = 0
+            await telq_api.authenticate(api_id="app-id", api_key="app-key")
+            assert telq_api.supplier.cache is cache and telq_api.session.cache is None
+            fake_server.requests.clear()
+            await telq_api.supplier.get(supplier_id)
+            assert fake_server.requests["GET /suppliers/{id}"] == 0 and cache.hits == 1
+
+    asyncio.run(run())
@@ -0,0 +1,51 @@
+""" Test the indexed network catalog"""
+
+from telq import TelQTelecomAPI
+from telq.networks.cache import NetworksCache
+from telq.networks.catalog import Network, NetworkCatalog
+from telq.transport.fake import DEFAULT_NETWORKS, FakeTelQServer
+
+
+def test_lookups():
+    catalog = NetworkCatalog(DEFAULT_NETWORKS)
+    assert len(catalog) == len(DEFAULT_NETWORKS)
+    verizon = catalog.get("310", "012", "260")
+    assert verizon.providerName == "Verizon" and verizon.ported
+    assert catalog.get("310", "012") is None
+    assert {"mcc": "310", "mnc": "260"} in catalog
+    assert verizon in catalog
+
+    assert [network.mnc for network in catalog.by_mcc("310")] == ["012", "260"]
+    assert catalog.by_country("united states of america") == catalog.by_mcc("310")
+    assert catalog.by_provider("T-Mobile")[0].key == ("310", "260", None)
+    assert catalog.by_mcc("999") == ()
+
+
+def test_find():
+    catalog = NetworkCatalog(DEFAULT_NETWORKS)
+    assert catalog.find(providerName="verizon", ported=True) == (catalog.get("310", "012", "260"),)
+    assert catalog.find(mcc="310", ported=False) == (catalog.get("310", "260"),)
+    assert len(catalog.find(ported=True)) == 2
+    assert catalog.find(mcc="310", countryName="Brazil") == ()
+
+
+def test_round_trip():
+    catalog = NetworkCatalog(DEFAULT_NETWORKS + DEFAULT_NETWORKS[:1])
+    assert catalog.to_list() == DEFAULT_NETWORKS
+    network = Network.from_dict(DEFAULT_NETWORKS[1])
+    assert network.destination() == {"mcc": "310", "mnc": "012", "portedFromMnc": "260"}
+    assert not hasattr(network, "__dict__")
+
+
+def test_cache_swaps_catalog(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    cache = NetworksCache(offline_api.network)
+    catalog = cache.catalog()
+    assert cache.catalog() is catalog
+    assert len(catalog) == len(fake_server.networks)
+
+    fake_server.networks.pop()
+    cache.refresh()
+    assert cache.catalog() is not catalog
+    assert len(cache.catalog()) == len(fake_server.networks)
+    # the previous catalog is left untouched
+    assert len(catalog) == len(fake_server.networks) + 1
@@ -0,0 +1,59 @@
+""" Test the network change feed"""
+
+import copy
+
+from telq import TelQTelecomAPI
+from telq.networks.cache import NetworksCache
+from telq.networks.catalog import NetworkCatalog
+from telq.networks.changes import ADDED, CHANGED, REMOVED, NetworkChangeFeed, diff_catalogs
+from telq.transport.fake import DEFAULT_NETWORKS, FakeTelQServer
+
+
+def test_diff_catalogs():
+    previous = NetworkCatalog(DEFAULT_NETWORKS)
+    networks = copy.deepcopy(DEFAULT_NETWORKS)
+    networks[0]["providerName"] = "Digicel Bermuda"  # renamed
+    networks[3]["portedFromMnc"] = "01"  # ported from another network
+    del networks[4]  # went offline
+    networks.append({"mcc": "262", "countryName": "Germany", "mnc": "01", "providerName": "Telekom"})
+
+    changes = {(change.kind, change.network.mcc): change for change in diff_catalogs(previous, NetworkCatalog(networks))}
+    assert sorted(changes) == [(ADDED, "262"), (CHANGED, "246"), (CHANGED, "350"), (REMOVED, "364")]
+    assert changes[CHANGED, "246"].previous.portedFromMnc == "02"
+    assert changes[CHANGED, "246"].network.portedFromMnc == "01"
+    assert changes[CHANGED, "350"].previous.providerName == "Digicel"
+
+
+def test_diff_first_catalog():
+    catalog = NetworkCatalog(DEFAULT_NETWORKS)
+    assert [change.kind for change in diff_catalogs(None, catalog)] == [ADDED] * len(DEFAULT_NETWORKS)
+    assert diff_catalogs(catalog, catalog) == []
+    assert diff_catalogs(catalog, NetworkCatalog(DEFAULT_NETWORKS)) == []
+
+
+def test_failing_subscriber_does_not_stop_others():
+    feed = NetworkChangeFeed()
+    received = []
+    feed.subscribe(lambda changes: 1 / 0)
+    unsubscribe = feed.subscribe(received.append)
+    feed.publish(None, NetworkCatalog(DEFAULT_NETWORKS[:1]))
+    assert len(received) == 1
+    unsubscribe()
+    feed.publish(None, NetworkCatalog(DEFAULT_NETWORKS))
+    assert len(received) == 1
+
+
+def test_cache_publishes_changes(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    cache = NetworksCache(offline_api.network)
+    received = []
+    cache.changes.subscribe(received.append)
+    cache.get()
+    assert len(received[0]) == len(fake_server.networks)
+
+    # unchanged networks (HTTP 304) publish nothing
+    cache.refresh()
+    assert len(received) == 1
+
+    removed = fake_server.networks.pop()
+    cache.refresh()
+    assert [(change.kind, change.network.to_dict()) for change in received[1]] == [(REMOVED, removed)]
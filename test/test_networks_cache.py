@@ -0,0 +1,136 @@
+""" Test the in-memory network cache against the in-memory TelQ server"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from telq import TelQTelecomAPI
+from telq.aio import AsyncTelQTelecomAPI
+from telq.aio.networks import AsyncNetworksCache
+from telq.networks.cache import NetworksCache
+from telq.transport.fake import AsyncFakeTransport, FakeTelQServer, FakeTransport
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def wait_for_revalidation(cache: NetworksCache) -> None:
+    thread = cache._revalidation
+    if thread is not None:
+        thread.join(5)
+
+
+def test_conditional_request(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    first = offline_api.network.get_networks_if_modified()
+    assert first.networks == fake_server.networks and first.etag and first.last_modified
+
+    assert offline_api.network.get_networks_if_modified(etag=first.etag).networks is None
+    assert offline_api.network.get_networks_if_modified(last_modified=first.last_modified).networks is None
+
+    fake_server.networks.pop()
+    changed = offline_api.network.get_networks_if_modified(etag=first.etag)
+    assert changed.networks == fake_server.networks
+    assert changed.etag != first.etag
+
+
+def test_fresh_networks_served_from_memory(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    clock = FakeClock()
+    cache = NetworksCache(offline_api.network, ttl=60, clock=clock)
+    networks = cache.get()
+    clock.now += 59
+    assert cache.get() is networks
+    assert fake_server.requests["GET /networks"] == 1
+
+
+def test_stale_networks_revalidated_in_background(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    clock = FakeClock()
+    cache = NetworksCache(offline_api.network, ttl=60, max_stale=300, clock=clock)
+    networks = cache.get()
+
+    # unchanged networks are kept, the server only answers 304
+    clock.now += 61
+    assert cache.get() is networks
+    wait_for_revalidation(cache)
+    assert fake_server.requests["GET /networks"] == 2
+    assert cache.get() is networks
+
+    # changed networks are served once revalidated
+    fake_server.networks.pop()
+    clock.now += 61
+    assert cache.get() is networks
+    wait_for_revalidation(cache)
+    assert cache.get() == fake_server.networks
+    assert cache.last_error is None
+
+
+def test_expired_networks_fetched_before_served(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    clock = FakeClock()
+    cache = NetworksCache(offline_api.network, ttl=60, max_stale=300, clock=clock)
+    cache.get()
+    fake_server.networks.pop()
+    clock.now += 361
+    assert cache.get() == fake_server.networks
+    assert cache._revalidation is None
+
+
+def test_failed_revalidation_serves_stale_networks(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    clock = FakeClock()
+    cache = NetworksCache(offline_api.network, ttl=60, clock=clock)
+    networks = cache.get()
+    fake_server.fail_next(500, endpoint="GET /networks")
+    clock.now += 61
+    assert cache.get() is networks
+    wait_for_revalidation(cache)
+    assert cache.last_error is not None
+    assert cache.get() is networks
+
+
+def test_invalidate(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    cache = NetworksCache(offline_api.network)
+    cache.get()
+    cache.invalidate()
+    cache.get()
+    assert fake_server.requests["GET /networks"] == 2
+
+
+def test_async_networks_cache(fake_server: FakeTelQServer):
+    async def main():
+        clock = FakeClock()
+        async with AsyncTelQTelecomAPI(transport=AsyncFakeTransport(fake_server)) as telq_api:
+            await telq_api.authenticate(api_id="app-id", api_key="app-key")
+            cache = AsyncNetworksCache(telq_api.network, ttl=60, clock=clock)
+            networks = await cache.get()
+            fake_server.networks.pop()
+            clock.now += 61
+            assert await cache.get() is networks
+            await cache._revalidation
+            assert await cache.get() == fake_server.networks
+            await cache.close()
+
+    asyncio.run(main())
+
+
+def test_concurrent_cold_misses_fetch_once(fake_server: FakeTelQServer):
+    telq_api = TelQTelecomAPI(transport=FakeTransport(fake_server, latency=0.2))
+    telq_api.authenticate(api_id="app-id", api_key="app-key")
+    cache = NetworksCache(telq_api.network)
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        results = list(executor.map(lambda _: cache.get(), range(10)))
+    assert all(networks is results[0] for networks in results)
+    assert fake_server.requests["GET /networks"] == 1
+
+
+def test_async_concurrent_cold_misses_fetch_once(fake_server: FakeTelQServer):
+    async def main():
+        async with AsyncTelQTelecomAPI(transport=AsyncFakeTransport(fake_server, latency=0.2)) as telq_api:
+            await telq_api.authenticate(api_id="app-id", api_key="app-key")
+            cache = AsyncNetworksCache(telq_api.network)
+            results = await asyncio.gather(*(cache.get() for _ in range(10)))
+            assert all(networks is results[0] for networks in results)
+            assert fake_server.requests["GET /networks"] == 1
+
+    asyncio.run(main())
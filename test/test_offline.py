@@ -0,0 +1,81 @@
+""" Test the SDK end to end against the in-memory TelQ server"""
+
+import asyncio
+
+import pytest
+import requests
+from telq import TelQTelecomAPI
+from telq.aio import AsyncTelQTelecomAPI
+from telq.session.session_data import SessionData
+from telq.supplier.supplier_data import SupplierData
+from telq.tests import Test
+from telq.transport.fake import AsyncFakeTransport, FakeTelQServer, FakeTransport
+
+
+def test_invalid_credentials(fake_server: FakeTelQServer):
+    telq_api = TelQTelecomAPI(transport=FakeTransport(fake_server))
+    with pytest.raises(ValueError):
+        telq_api.authenticate(api_id="app-id", api_key="wrong")
+
+
+def test_unauthenticated_request(fake_server: FakeTelQServer):
+    response = FakeTransport(fake_server).request("GET", "https://api.telqtele.com/v3/client/networks")
+    assert response.status_code == 401
+    with pytest.raises(requests.exceptions.HTTPError):
+        response.raise_for_status()
+
+
+def test_clients_share_transport(offline_api: TelQTelecomAPI):
+    assert offline_api.mt._transport is offline_api.session._transport is offline_api._transport
+
+
+def test_mt_tests(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    networks = offline_api.network.get_networks()
+    offline = {"mcc": "001", "mnc": "01"}
+    tests = offline_api.mt.initiate_new_tests(networks[:2] + [offline]).get("response")
+    assert [test["errorMessage"] for test in tests] == [None, None, "NETWORK_OFFLINE"]
+
+    result = offline_api.mt.get_test_results(tests[0]["id"])
+    assert result["testStatus"] == "POSITIVE"
+    assert result["destinationNetworkDetails"]["mcc"] == networks[0]["mcc"]
+    assert fake_server.requests["GET /tests/{id}"] == 1
+
+
+def test_mt_test_not_found(offline_api: TelQTelecomAPI):
+    with pytest.raises(ValueError):
+        offline_api.mt.get_test_results(404)
+
+
+def test_session_supplier_lnt(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    session_id0 = offline_api.session.create(SessionData("127.0.0.1", 2775, "user", "pass"))["smppSessionId"]
+    session_id1 = offline_api.session.create(SessionData("127.0.0.2", 2775, "user", "pass"))["smppSessionId"]
+    supplier_id = offline_api.supplier.create(SupplierData(session_id0, "supplier", "Wholesale"))["supplierId"]
+    assert offline_api.session.get(session_id0)["supplierCount"] == 1
+
+    offline_api.supplier.assign(smpp_session_id=session_id1, supplier_id_list=[supplier_id])
+    assert offline_api.supplier.get(supplier_id)["smppSessionId"] == session_id1
+
+    fake_server.set_session_status(session_id1, online=False, last_error="bind failed")
+    status = offline_api.supplier.list_status()["content"]
+    assert status[0]["online"] is False and status[0]["lastError"] == "bind failed"
+
+    tests = [Test("TelQ", "hello", "ALPHA", "LOWER", 7, supplier_id, "246", "03") for _ in range(3)]
+    assert len(offline_api.lnt.initiate_new_tests(tests)["response"]) == 3
+    page = offline_api.lnt.get_test_results(size=2)
+    assert page["totalElements"] == 3 and page["totalPages"] == 2 and len(page["content"]) == 2
+
+    offline_api.supplier.delete(supplier_id)
+    assert offline_api.supplier.list()["empty"]
+
+
+def test_async_client(fake_server: FakeTelQServer):
+    async def run():
+        async with AsyncTelQTelecomAPI(transport=AsyncFakeTransport(fake_server)) as telq_api:
+            await telq_api.authenticate(api_id="app-id", api_key="app-key")
+            networks = await telq_api.network.get_networks()
+            tests = (await telq_api.mt.initiate_new_tests(networks))["response"]
+            return await asyncio.gather(*(telq_api.mt.get_test_results(test["id"]) for test in tests))
+
+    results = asyncio.run(run())
+    assert len(results) == len(fake_server.networks)
+    assert all(result["testStatus"] == "POSITIVE" for result in results)
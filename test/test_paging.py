@@ -0,0 +1,136 @@
+""" Test iterating over paginated results"""
+
+import asyncio
+import threading
+import time
+
+from telq import TelQTelecomAPI
+from telq.aio import AsyncTelQTelecomAPI
+from telq.tests import Test as LNTTest
+from telq.transport.fake import AsyncFakeTransport, FakeTelQServer
+from telq.session.session_data import SessionData
+from telq.supplier.supplier_data import SupplierData
+from telq.util.paging import iter_all_items, iter_items, iter_pages
+
+
+def fake_pages(count: int, size: int = 2, total: bool = True, delay: float = 0):
+    """fetch_page serving `count` items, recording the pages fetched and the peak concurrency"""
+    stats = {"fetched": [], "active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fetch_page(number: int) -> dict:
+        with lock:
+            stats["fetched"].append(number)
+            stats["active"] += 1
+            stats["peak"] = max(stats["peak"], stats["active"])
+        time.sleep(delay)
+        with lock:
+            stats["active"] -= 1
+        content = list(range(count))[(number - 1) * size:number * size]
+        page = {"content": content, "last": number * size >= count}
+        if total:
+            page["totalPages"] = -(-count // size)
+        return page
+
+    return fetch_page, stats
+
+
+def test_iter_items_in_order():
+    fetch_page, stats = fake_pages(25, delay=0.005)
+    assert list(iter_items(fetch_page, prefetch=4)) == list(range(25))
+    assert sorted(stats["fetched"]) == list(range(1, 14))
+    assert 1 < stats["peak"] <= 4
+
+
+def test_iter_without_total_pages():
+    fetch_page, stats = fake_pages(5, total=False)
+    assert list(iter_items(fetch_page)) == list(range(5))
+    assert stats["fetched"] == [1, 2, 3]
+
+
+def test_iter_empty_and_single_page():
+    assert list(iter_items(fake_pages(0)[0])) == []
+    fetch_page, stats = fake_pages(2)
+    assert list(iter_items(fetch_page)) == [0, 1]
+    assert stats["fetched"] == [1]
+
+
+def test_stopping_early_stops_prefetching():
+    fetch_page, stats = fake_pages(200, delay=0.001)
+    pages = iter_pages(fetch_page, prefetch=3)
+    next(pages), next(pages)
+    pages.close()
+    assert len(stats["fetched"]) <= 6
+
+
+def test_lnt_iter_test_results(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer, supplier_id: int):
+    tests = [LNTTest("TelQ", f"hello {i}", "ALPHA", "LOWER", 7, supplier_id, "246", "03") for i in range(23)]
+    created = offline_api.lnt.initiate_new_tests(tests)["response"]
+    results = list(offline_api.lnt.iter_test_results(size=5, prefetch=3))
+    assert [result["id"] for result in results] == [test["id"] for test in created]
+    assert fake_server.requests["GET /lnt/tests"] == 5
+
+    async def run():
+        async with AsyncTelQTelecomAPI(transport=AsyncFakeTransport(fake_server)) as telq_api:
+            await telq_api.authenticate(api_id="app-id", api_key="app-key")
+            return [result["id"] async for result in telq_api.lnt.iter_test_results(size=5, order="desc")]
+
+    assert asyncio.run(run()) == [test["id"] for test in reversed(created)]
+
+
+def sized_pages(count: int, total: bool = True):
+    """fetch_page(number, size) serving `count` items, recording the (number, size) fetched"""
+    fetched = []
+
+    def fetch_page(number: int, size: int) -> dict:
+        fetched.append((number, size))
+        page = {"content": list(range(count))[(number - 1) * size:number * size], "last": number * size >= count}
+        if total:
+            page.update(totalPages=-(-count // size), totalElements=count)
+        return page
+
+    return fetch_page, fetched
+
+
+def test_iter_all_items_chooses_page_size():
+    fetch_page, fetched = sized_pages(15)
+    assert list(iter_all_items(fetch_page)) == list(range(15))
+    assert fetched == [(1, 20)]
+
+    # 250 items: 20 first, then pages of 63 fetched in one wave of 4 requests
+    fetch_page, fetched = sized_pages(250)
+    assert list(iter_all_items(fetch_page, max_workers=4)) == list(range(250))
+    assert fetched[0] == (1, 20) and sorted(fetched[1:]) == [(1, 63), (2, 63), (3, 63), (4, 63)]
+
+    # the page size is capped, more pages are then fetched
+    fetch_page, fetched = sized_pages(1000)
+    assert list(iter_all_items(fetch_page, max_workers=2, max_size=100)) == list(range(1000))
+    assert len(fetched) == 11 and {size for _, size in fetched[1:]} == {100}
+
+    fetch_page, fetched = sized_pages(50)
+    assert list(iter_all_items(fetch_page, size=10)) == list(range(50)) and len(fetched) == 5
+
+    fetch_page, fetched = sized_pages(45, total=False)
+    assert list(iter_all_items(fetch_page)) == list(range(45)) and fetched == [(1, 20), (2, 20), (3, 20)]
+
+
+def test_fetch_all_sessions_and_suppliers(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    for i in range(3):
+        session_id = offline_api.session.create(SessionData("127.0.0.1", 2775 + i, f"user{i}", "pass"))["smppSessionId"]
+        for j in range(15):
+            offline_api.supplier.create(SupplierData(session_id, f"supplier {i}-{j}", "Wholesale"))
+
+    assert [session["systemId"] for session in offline_api.session.fetch_all()] == ["user0", "user1", "user2"]
+    suppliers = offline_api.supplier.fetch_all(max_workers=2)
+    assert [supplier["supplierId"] for supplier in suppliers] == sorted(fake_server.suppliers)
+    assert fake_server.requests["GET /suppliers"] == 3
+    assert len(list(offline_api.supplier.iter_all_status(size=10))) == 45
+
+    async def run():
+        async with AsyncTelQTelecomAPI(transport=AsyncFakeTransport(fake_server)) as telq_api:
+            await telq_api.authenticate(api_id="app-id", api_key="app-key")
+            return await telq_api.supplier.fetch_all(order="desc"), await telq_api.session.fetch_all()
+
+    suppliers, sessions = asyncio.run(run())
+    assert [supplier["supplierId"] for supplier in suppliers] == sorted(fake_server.suppliers, reverse=True)
+    assert len(sessions) == 3
@@ -0,0 +1,166 @@
+""" Test the adaptive MT result poller against the in-memory TelQ server"""
+
+import asyncio
+import threading
+import time
+
+from telq import TelQTelecomAPI
+from telq.aio import AsyncTelQTelecomAPI
+from telq.aio.poller import AsyncResultPoller
+from telq.tests.poller import PollSchedule, ResultPoller
+from telq.transport.fake import AsyncFakeTransport, FakeTelQServer, FakeTransport
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+    async def async_sleep(self, seconds: float) -> None:
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+class ConcurrencyTransport(FakeTransport):
+    """FakeTransport recording the highest number of concurrent requests"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.active = self.peak = 0
+        self.lock = threading.Lock()
+
+    def request(self, *args, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            return super().request(*args, **kwargs)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def create_tests(telq_api, server: FakeTelQServer, count: int, **kwargs) -> list:
+    networks = [server.networks[i % len(server.networks)] for i in range(count)]
+    return [test["id"] for test in telq_api.mt.initiate_new_tests(networks, **kwargs)["response"]]
+
+
+def offline_api(server: FakeTelQServer, transport=None) -> TelQTelecomAPI:
+    telq_api = TelQTelecomAPI(transport=transport or FakeTransport(server))
+    telq_api.authenticate(api_id="app-id", api_key="app-key")
+    return telq_api
+
+
+def test_schedule_backs_off():
+    schedule = PollSchedule(min_interval=1, max_interval=60, growth=0.25, ttl_fraction=0.05)
+    assert schedule.interval(0, 3600) == 1
+    assert schedule.interval(20, 3600) == 5
+    assert schedule.interval(1000, 3600) == 60
+    assert schedule.interval(1000, 600) == 30
+    assert schedule.expired(3660, 3600) and not schedule.expired(3659, 3600)
+
+
+def test_polls_until_delivered():
+    clock = FakeClock()
+    server = FakeTelQServer(credentials={"app-id": "app-key"}, result_delay=30, clock=clock, seed=1)
+    telq_api = offline_api(server)
+    test_ids = create_tests(telq_api, server, 5)
+
+    poller = ResultPoller(telq_api.mt, clock=clock, sleep=clock.sleep)
+    results = poller.wait(test_ids)
+    assert sorted(results) == sorted(test_ids)
+    assert all(polled.done and polled.status == "POSITIVE" for polled in results.values())
+    # polling every second would take 31 polls per test
+    assert all(polled.polls <= 15 for polled in results.values())
+
+
+def test_yields_as_completed():
+    clock = FakeClock()
+    server = FakeTelQServer(credentials={"app-id": "app-key"}, result_delay=None, clock=clock, seed=1)
+    telq_api = offline_api(server)
+    slow, fast, expired = create_tests(telq_api, server, 3, testTimeToLiveInSeconds=600)
+    server.set_test_status(fast, "POSITIVE")
+    received = []
+    poller = ResultPoller(telq_api.mt, schedule=PollSchedule(grace=10), clock=clock, sleep=clock.sleep)
+
+    # a test is given up on after its time to live, without a final status
+    [polled] = poller.as_completed([expired], time_to_live=60)
+    assert polled.status == "WAIT" and not polled.done
+
+    order = [polled.test_id for polled in poller.as_completed([slow, fast], time_to_live=600, callback=received.append)]
+    assert order == [fast, slow]
+    assert [polled.test_id for polled in received] == order
+
+
+def test_failed_polls_are_retried():
+    clock = FakeClock()
+    server = FakeTelQServer(credentials={"app-id": "app-key"}, result_delay=0, clock=clock, seed=1)
+    telq_api = offline_api(server)
+    [test_id] = create_tests(telq_api, server, 1)
+    server.fail_next(500, count=2, endpoint="GET /tests/{id}")
+
+    [polled] = ResultPoller(telq_api.mt, clock=clock, sleep=clock.sleep).as_completed([test_id])
+    assert polled.done and polled.polls == 3 and polled.error is None
+
+
+def test_in_flight_cap():
+    server = FakeTelQServer(credentials={"app-id": "app-key"}, result_delay=0, seed=1)
+    transport = ConcurrencyTransport(server, latency=0.01)
+    telq_api = offline_api(server, transport)
+    test_ids = create_tests(telq_api, server, 20)
+
+    results = ResultPoller(telq_api.mt, max_in_flight=3).wait(test_ids)
+    assert len(results) == 20
+    assert 1 < transport.peak <= 3
+
+
+def test_async_poller():
+    clock = FakeClock()
+    server = FakeTelQServer(credentials={"app-id": "app-key"}, result_delay=30, clock=clock, seed=1)
+    test_ids = create_tests(offline_api(server), server, 4)
+
+    async def main():
+        async with AsyncTelQTelecomAPI(transport=AsyncFakeTransport(server)) as telq_api:
+            await telq_api.authenticate(api_id="app-id", api_key="app-key")
+            poller = AsyncResultPoller(telq_api.mt, max_in_flight=2, clock=clock, sleep=clock.async_sleep)
+            return [polled async for polled in poller.as_completed(test_ids)]
+
+    results = asyncio.run(main())
+    assert sorted(polled.test_id for polled in results) == sorted(test_ids)
+    assert all(polled.status == "POSITIVE" for polled in results)
+
+
+def test_age_is_measured_from_creation():
+    clock = FakeClock()
+    server = FakeTelQServer(credentials={"app-id": "app-key"}, result_delay=None, clock=clock, seed=1)
+    telq_api = offline_api(server)
+    [test_id] = create_tests(telq_api, server, 1, testTimeToLiveInSeconds=60)
+    server.set_test_status(test_id, "WAIT")
+    created = clock.now
+    clock.now += 65
+
+    [polled] = ResultPoller(telq_api.mt, schedule=PollSchedule(grace=10), clock=clock,
+                            sleep=clock.sleep).as_completed([test_id], time_to_live=60)
+    # given up on 70 seconds after its creation, not 70 seconds after polling started
+    assert polled.status == "WAIT" and clock.now - created < 75
+
+
+def test_time_to_live_per_test():
+    clock = FakeClock()
+    server = FakeTelQServer(credentials={"app-id": "app-key"}, result_delay=None, clock=clock, seed=1)
+    telq_api = offline_api(server)
+    [short] = create_tests(telq_api, server, 1, testTimeToLiveInSeconds=60)
+    [long] = create_tests(telq_api, server, 1, testTimeToLiveInSeconds=600)
+    server.set_test_status(short, "WAIT")
+    server.set_test_status(long, "WAIT")
+    created = clock.now
+    given_up = {}
+    poller = ResultPoller(telq_api.mt, schedule=PollSchedule(grace=10), clock=clock, sleep=clock.sleep)
+    for polled in poller.as_completed([short, long], time_to_live={short: 60, long: 600}):
+        given_up[polled.test_id] = clock.now - created
+    assert 70 <= given_up[short] < 75 and 610 <= given_up[long] < 650
@@ -0,0 +1,66 @@
+""" Test the client-side rate limiter"""
+
+import asyncio
+
+from telq import TelQTelecomAPI
+from telq.transport.fake import FakeTelQServer, FakeTransport
+from telq.util.ratelimit import RateLimit, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_burst_then_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(RateLimit(rate=10, burst=5), clock)
+    for _ in range(5):
+        bucket.acquire(sleep=clock.sleep)
+    assert clock.now == 0
+    for _ in range(10):
+        bucket.acquire(sleep=clock.sleep)
+    assert abs(clock.now - 1.0) < 1e-9
+
+
+def test_classify():
+    base = "https://api.telqtele.com/v3/client"
+    assert RateLimiter.classify("POST", f"{base}/tests") == "submit"
+    assert RateLimiter.classify("GET", f"{base}/tests/5") == "poll"
+    assert RateLimiter.classify("GET", f"{base}/lnt/tests?page=1") == "poll"
+    assert RateLimiter.classify("POST", f"{base}/suppliers/assign") == "manage"
+    assert RateLimiter.classify("POST", f"{base}/token") is None
+
+
+def test_submissions_preempt_polling():
+    limiter = RateLimiter(total=RateLimit(rate=200, burst=1))
+    base = "https://api.telqtele.com/v3/client"
+    order = []
+
+    async def send(kind, method, url):
+        await limiter.acquire_async(method, url)
+        order.append(kind)
+
+    async def run():
+        polls = [send("poll", "GET", f"{base}/tests/{i}") for i in range(10)]
+        submits = [send("submit", "POST", f"{base}/tests") for _ in range(10)]
+        await asyncio.gather(*polls, *submits)
+
+    asyncio.run(run())
+    assert order[1:11] == ["submit"] * 10
+
+
+def test_limiter_shared_by_all_clients(fake_server: FakeTelQServer):
+    limiter = RateLimiter(total=RateLimit(rate=1000), limits={"networks": RateLimit(rate=1000, burst=2)})
+    telq_api = TelQTelecomAPI(transport=FakeTransport(fake_server), rate_limiter=limiter)
+    telq_api.authenticate(api_id="app-id", api_key="app-key")
+    telq_api.network.get_networks()
+    telq_api.mt.initiate_new_tests(fake_server.networks[:1])
+    assert limiter.buckets["networks"]._tokens < 2
+    assert limiter.total._tokens < 1000
@@ -0,0 +1,52 @@
+""" Test refreshing the token in the background and re-authenticating on HTTP 401"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from telq import TelQTelecomAPI
+from telq.aio import AsyncTelQTelecomAPI
+from telq.authentication.refresh import seconds_until_refresh
+from telq.transport.fake import AsyncFakeTransport, FakeTelQServer, FakeTransport
+
+
+def test_seconds_until_refresh():
+    assert seconds_until_refresh(expires_at=1000, margin=300, now=0) == 700
+    # short-lived tokens are refreshed halfway through
+    assert seconds_until_refresh(expires_at=100, margin=300, now=0) == 50
+    assert seconds_until_refresh(expires_at=0, margin=300, now=10) == 1
+
+
+def test_rejected_token_reauthenticates_once(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    test_ids = [test["id"] for test in offline_api.mt.initiate_new_tests(fake_server.networks)["response"]]
+    fake_server.tokens.clear()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(offline_api.mt.get_test_results, test_ids * 4))
+
+    assert [result["id"] for result in results] == test_ids * 4
+    assert fake_server.requests["POST /token"] == 2
+    assert offline_api.network.get_networks()
+
+
+def test_token_refreshed_before_expiry(fake_server: FakeTelQServer):
+    fake_server.token_ttl = 2
+    telq_api = TelQTelecomAPI(transport=FakeTransport(fake_server), refresh_margin=1)
+    telq_api.authenticate(api_id="app-id", api_key="app-key")
+    first_token = telq_api._authenticated._bearer_token
+
+    time.sleep(1.5)
+    assert telq_api._authenticated._bearer_token != first_token
+    assert fake_server.requests["POST /token"] == 2
+    telq_api.close()
+
+
+def test_async_rejected_token_reauthenticates_once(fake_server: FakeTelQServer):
+    async def run():
+        async with AsyncTelQTelecomAPI(transport=AsyncFakeTransport(fake_server, latency=0.01)) as telq_api:
+            await telq_api.authenticate(api_id="app-id", api_key="app-key")
+            fake_server.tokens.clear()
+            return await asyncio.gather(*(telq_api.network.get_networks() for _ in range(20)))
+
+    assert len(asyncio.run(run())) == 20
+    assert fake_server.requests["POST /token"] == 2
@@ -0,0 +1,72 @@
+""" Test reconciling sessions and suppliers with a desired configuration"""
+
+from telq import TelQTelecomAPI
+from telq.reconcile import Reconciler
+from telq.session.session_data import SessionData
+from telq.supplier.supplier_data import SupplierData
+from telq.transport.fake import FakeTelQServer
+
+
+def configuration(throughput: int = 10, suppliers: int = 30):
+    primary = SessionData("10.0.0.1", 2775, "primary", "secret", throughput=throughput)
+    standby = SessionData("10.0.0.2", 2775, "standby", "secret")
+    return [primary, standby], [
+        SupplierData(primary if i % 3 else standby, f"supplier {i}", "Wholesale", comment="managed")
+        for i in range(suppliers)
+    ]
+
+
+def writes(fake_server: FakeTelQServer) -> dict:
+    return {endpoint: count for endpoint, count in fake_server.requests.items()
+            if not endpoint.startswith(("GET", "POST /token"))}
+
+
+def test_reconcile_creates_then_does_nothing(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    reconciler = Reconciler(offline_api.session, offline_api.supplier)
+    sessions, suppliers = configuration()
+    result = reconciler.reconcile(sessions, suppliers)
+    assert result.ok and len(result.applied) == 32
+    assert writes(fake_server) == {"POST /sessions": 2, "POST /suppliers": 30}
+    primary = next(s for s in fake_server.sessions.values() if s["systemId"] == "primary")["smppSessionId"]
+    assert sum(supplier["smppSessionId"] == primary for supplier in fake_server.suppliers.values()) == 20
+
+    # unchanged configuration, read from a fresh config, costs only list requests
+    fake_server.requests.clear()
+    assert reconciler.plan(*configuration()).empty
+    assert writes(fake_server) == {}
+    assert fake_server.requests["GET /suppliers"] <= 3
+
+
+def test_reconcile_minimal_diff(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    reconciler = Reconciler(offline_api.session, offline_api.supplier, prune=True)
+    reconciler.reconcile(*configuration())
+    stray = offline_api.session.create(SessionData("10.0.0.9", 2775, "stray", "secret"))["smppSessionId"]
+    offline_api.supplier.create(SupplierData(stray, "stray", "Wholesale"))
+
+    sessions, suppliers = configuration(throughput=20, suppliers=28)
+    suppliers[0].comment = "changed"
+    # move two suppliers from the standby session to the primary one
+    suppliers[3].smppSessionId = suppliers[6].smppSessionId = sessions[0]
+    plan = reconciler.plan(sessions, suppliers)
+    assert plan.summary() == {"update session": 1, "update supplier": 1, "assign supplier": 2,
+                              "delete supplier": 3, "delete session": 1}
+    assert next(change for change in plan.sessions if change.action == "update").fields == ["throughput"]
+
+    fake_server.requests.clear()
+    result = reconciler.apply(plan)
+    assert result.ok
+    assert writes(fake_server) == {"PUT /sessions": 1, "PUT /suppliers": 1, "POST /suppliers/assign": 1,
+                                   "DELETE /suppliers/{id}": 3, "DELETE /sessions/{id}": 1}
+    assert reconciler.plan(sessions, suppliers).empty
+
+
+def test_reconcile_reports_failures(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    reconciler = Reconciler(offline_api.session, offline_api.supplier, max_workers=1)
+    sessions, suppliers = configuration(suppliers=3)
+    fake_server.fail_next(400, endpoint="POST /sessions")
+    result = reconciler.reconcile(sessions, suppliers)
+    # the suppliers of the session which could not be created fail too
+    assert [(failure.change.action, failure.change.resource) for failure in result.failures] == [
+        ("create", "session"), ("create", "supplier"), ("create", "supplier")]
+    assert len(fake_server.suppliers) == 1
+    assert reconciler.reconcile(sessions, suppliers).ok and len(fake_server.suppliers) == 3
@@ -0,0 +1,97 @@
+""" Test retrying requests against the in-memory TelQ server"""
+
+import pytest
+import requests
+from telq import TelQTelecomAPI
+from telq.endpoints import endpoint_key
+from telq.transport.fake import FakeTelQServer, FakeTransport
+from telq.util.retry import RetryingTransport, RetryPolicy, parse_retry_after
+
+
+@pytest.fixture
+def waits():
+    return []
+
+
+@pytest.fixture
+def retrying_api(fake_server: FakeTelQServer, waits: list):
+    telq_api = TelQTelecomAPI(transport=FakeTransport(fake_server), retry=RetryPolicy(jitter=False))
+    telq_api._transport.sleep = waits.append
+    telq_api.authenticate(api_id="app-id", api_key="app-key")
+    return telq_api
+
+
+def test_backoff_is_exponential_and_capped():
+    policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+    assert [policy.backoff(attempt) for attempt in range(5)] == [1, 2, 4, 5, 5]
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+
+
+def test_endpoint_key_ignores_base_url_path(fake_server: FakeTelQServer):
+    assert endpoint_key("get", "https://gw.example.com/telq/v3/client/tests/17?page=1") == "GET /tests/{id}"
+    telq_api = TelQTelecomAPI(base_url="https://gw.example.com/telq", transport=FakeTransport(fake_server),
+                              retry=RetryPolicy(jitter=False, backoff_factor=0))
+    telq_api.authenticate(api_id="app-id", api_key="app-key")
+    fake_server.fail_next(503, endpoint="GET /networks")
+    telq_api.network.get_networks()
+    assert telq_api.retry_stats.snapshot()["GET /networks"].retries == 1
+
+
+def test_get_retried_after_server_errors(retrying_api: TelQTelecomAPI, fake_server: FakeTelQServer, waits: list):
+    test_id = retrying_api.mt.initiate_new_tests(fake_server.networks[:1])["response"][0]["id"]
+    fake_server.fail_next(503, count=2, endpoint="GET /tests/{id}")
+
+    assert retrying_api.mt.get_test_results(test_id)["id"] == test_id
+    assert waits == [0.5, 1.0]
+    stats = retrying_api.retry_stats.snapshot()["GET /tests/{id}"]
+    assert (stats.requests, stats.retries, stats.failures) == (1, 2, 0)
+    assert stats.retried_statuses[503] == 2
+
+
+def test_retry_after_is_honored(retrying_api: TelQTelecomAPI, fake_server: FakeTelQServer, waits: list):
+    fake_server.fail_next(429, headers={"Retry-After": "7"})
+    retrying_api.network.get_networks()
+    assert waits == [7]
+
+
+def test_post_not_retried_on_server_error(retrying_api: TelQTelecomAPI, fake_server: FakeTelQServer, waits: list):
+    fake_server.fail_next(503, endpoint="POST /tests")
+    with pytest.raises(ValueError):
+        retrying_api.mt.initiate_new_tests(fake_server.networks[:1])
+    assert waits == []
+    assert retrying_api.retry_stats.snapshot()["POST /tests"].failures == 1
+
+    fake_server.fail_next(429, endpoint="POST /tests")
+    assert retrying_api.mt.initiate_new_tests(fake_server.networks[:1])["response"][0]["id"]
+    assert len(fake_server.tests) == 1
+
+
+def test_gives_up_after_max_retries(fake_server: FakeTelQServer):
+    transport = RetryingTransport(FakeTransport(fake_server), RetryPolicy(max_retries=2), sleep=lambda wait: None)
+    fake_server.fail_next(502, count=5)
+    response = transport.request("GET", "https://api.telqtele.com/v3/client/networks")
+    assert response.status_code == 502
+    assert fake_server.requests["GET /networks"] == 3
+
+
+def test_connection_errors_retried_for_idempotent_requests_only():
+    class FlakyTransport(FakeTransport):
+        calls = 0
+
+        def request(self, method, url, headers=None, json=None):
+            self.calls += 1
+            if self.calls == 1:
+                raise requests.exceptions.ConnectionError("reset")
+            return super().request(method, url, headers, json)
+
+    transport = RetryingTransport(FlakyTransport(), sleep=lambda wait: None)
+    assert transport.request("GET", "https://api.telqtele.com/v3/client/networks").status_code == 401
+
+    transport = RetryingTransport(FlakyTransport(), sleep=lambda wait: None)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        transport.request("POST", "https://api.telqtele.com/v3/client/tests", json={})
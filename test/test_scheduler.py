@@ -0,0 +1,118 @@
+""" Test pacing LNT campaigns to the throughput of the SMPP sessions"""
+
+from collections import Counter
+
+import pytest
+from telq import TelQTelecomAPI
+from telq.session.session_data import SessionData
+from telq.supplier.supplier_data import SupplierData
+from telq.tests import Test as LNTTest
+from telq.tests.scheduler import LNTScheduler, SessionTopology
+from telq.transport.fake import FakeTelQServer, FakeTransport
+from telq.util.times import parse_time
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1651363200.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def server(clock: FakeClock):
+    return FakeTelQServer(result_delay=None, clock=clock, seed=1, token_ttl=10 ** 9)
+
+
+@pytest.fixture
+def campaign_api(server: FakeTelQServer):
+    telq_api = TelQTelecomAPI(transport=FakeTransport(server), refresh_margin=None)
+    telq_api.authenticate(api_id="app-id", api_key="app-key")
+    # a window of 2 batches lets the next batch be submitted `lead` seconds ahead
+    slow = telq_api.session.create(SessionData("127.0.0.1", 2775, "slow", "pass", throughput=5,
+                                               windowSize=2))["smppSessionId"]
+    fast = telq_api.session.create(SessionData("127.0.0.1", 2776, "fast", "pass", throughput=20,
+                                               windowSize=2))["smppSessionId"]
+    telq_api.suppliers = {
+        "slow": telq_api.supplier.create(SupplierData(slow, "slow", "Wholesale"))["supplierId"],
+        "fast": telq_api.supplier.create(SupplierData(fast, "fast", "Wholesale"))["supplierId"],
+        "fast2": telq_api.supplier.create(SupplierData(fast, "fast2", "Direct"))["supplierId"],
+    }
+    return telq_api
+
+
+def campaign(telq_api: TelQTelecomAPI, slow: int, fast: int) -> list:
+    tests = [LNTTest("TelQ", "hello", "ALPHA", "LOWER", 7, telq_api.suppliers["slow"], "246", "03")] * slow
+    tests += [LNTTest("TelQ", "hello", "ALPHA", "LOWER", 7, telq_api.suppliers["fast" if i % 2 else "fast2"],
+                      "310", "012") for i in range(fast)]
+    return tests
+
+
+def test_topology(campaign_api: TelQTelecomAPI):
+    topology = SessionTopology.load(campaign_api.session, campaign_api.supplier, size=1)
+    assert sorted(topology.throughput.values()) == [5, 20]
+    assert list(topology.window_size.values()) == [2, 2]
+    assert topology.session_for(campaign_api.suppliers["fast"]) == topology.session_for(campaign_api.suppliers["fast2"])
+    with pytest.raises(ValueError):
+        topology.session_for(999)
+
+
+def test_plan(campaign_api: TelQTelecomAPI, clock: FakeClock):
+    topology = SessionTopology.load(campaign_api.session, campaign_api.supplier)
+    scheduler = LNTScheduler(campaign_api.lnt, topology, utilization=1, clock=clock)
+    plan = scheduler.plan(campaign(campaign_api, 50, 100))
+    assert sorted((session.tests, session.duration) for session in plan.sessions.values()) == [(50, 10), (100, 5)]
+    assert plan.duration == 10 and plan.completes_at.timestamp() == clock.now + 10
+
+
+def test_run_paces_each_session(campaign_api: TelQTelecomAPI, server: FakeTelQServer, clock: FakeClock):
+    topology = SessionTopology.load(campaign_api.session, campaign_api.supplier)
+    scheduler = LNTScheduler(campaign_api.lnt, topology, utilization=1, lead=1, clock=clock, sleep=clock.sleep)
+    start = clock.now
+    tests = campaign(campaign_api, 50, 100)
+    result = scheduler.run(tests, commentText="campaign")
+    assert result.ok and len(result.results) == 150
+    assert [test["supplierId"] for test in result.results] == [test.supplierId for test in tests]
+
+    # each session got its tests spread over its send time, the slow one did not hold back the fast one
+    created = Counter()
+    for test in server.lnt_tests.values():
+        created[(test["supplierId"] == campaign_api.suppliers["slow"], parse_time(test["testCreatedAt"]).timestamp())] += 1
+    slow_times = sorted(at for (slow, at) in created if slow)
+    fast_times = sorted(at for (slow, at) in created if not slow)
+    assert slow_times[-1] - start == pytest.approx(10 - 1 - 1)
+    assert fast_times[-1] - start == pytest.approx(5 - 1 - 1)
+    # `lead` seconds of tests are submitted upfront, then one second of tests every second
+    assert [created[(True, at)] for at in slow_times] == [10] + [5] * 8
+    assert clock.now - start < 10
+
+
+def test_run_reports_failed_batches(campaign_api: TelQTelecomAPI, server: FakeTelQServer, clock: FakeClock):
+    topology = SessionTopology.load(campaign_api.session, campaign_api.supplier)
+    scheduler = LNTScheduler(campaign_api.lnt, topology, clock=clock, sleep=clock.sleep)
+    server.fail_next(503, endpoint="POST /lnt/tests")
+    result = scheduler.run(campaign(campaign_api, 10, 0))
+    assert [len(failure.items) for failure in result.failures] == [5] and len(result.results) == 5
+
+
+def test_window_size_serializes_batches(campaign_api: TelQTelecomAPI, server: FakeTelQServer, clock: FakeClock):
+    session_id = campaign_api.session.create(SessionData("127.0.0.1", 2777, "single", "pass", throughput=5,
+                                                         windowSize=1))["smppSessionId"]
+    supplier_id = campaign_api.supplier.create(SupplierData(session_id, "single", "Wholesale"))["supplierId"]
+    topology = SessionTopology.load(campaign_api.session, campaign_api.supplier)
+    scheduler = LNTScheduler(campaign_api.lnt, topology, utilization=1, lead=2, clock=clock, sleep=clock.sleep)
+    start = clock.now
+    result = scheduler.run([LNTTest("TelQ", "hello", "ALPHA", "LOWER", 7, supplier_id, "246", "03")] * 20)
+    assert result.ok
+    # despite `lead`, each batch of a second of tests waits for the previous one to be sent
+    created = Counter(parse_time(test["testCreatedAt"]).timestamp() - start for test in server.lnt_tests.values())
+    assert sorted(created.items()) == [(0, 5), (1, 5), (2, 5), (3, 5)]
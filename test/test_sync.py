@@ -0,0 +1,123 @@
+""" Test the incremental LNT sync against the in-memory TelQ server"""
+
+import datetime as dt
+
+import pytest
+from telq import TelQTelecomAPI
+from telq.session.session_data import SessionData
+from telq.supplier.supplier_data import SupplierData
+from telq.tests import Test as LNTTest
+from telq.tests.sync import FileCheckpointStore, LNTSync, SQLiteCheckpointStore
+from telq.transport.fake import FakeTelQServer, FakeTransport
+
+START = dt.datetime(2022, 5, 1, tzinfo=dt.timezone.utc).timestamp()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = START
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def server(clock: FakeClock):
+    return FakeTelQServer(result_delay=60, clock=clock, seed=1, token_ttl=10 ** 9)
+
+
+@pytest.fixture
+def sync_api(server: FakeTelQServer):
+    telq_api = TelQTelecomAPI(transport=FakeTransport(server), refresh_margin=None)
+    telq_api.authenticate(api_id="app-id", api_key="app-key")
+    session_id = telq_api.session.create(SessionData("127.0.0.1", 2775, "user", "pass"))["smppSessionId"]
+    telq_api.supplier_id = telq_api.supplier.create(SupplierData(session_id, "supplier", "Wholesale"))["supplierId"]
+    return telq_api
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "file":
+        return FileCheckpointStore(str(tmp_path / "checkpoint.json"))
+    return SQLiteCheckpointStore(str(tmp_path / "telq.db"))
+
+
+def create_tests(telq_api: TelQTelecomAPI, count: int) -> list:
+    tests = [LNTTest("TelQ", "hello", "ALPHA", "LOWER", 7, telq_api.supplier_id, "246", "03") for _ in range(count)]
+    return [test["id"] for test in telq_api.lnt.initiate_new_tests(tests)["response"]]
+
+
+def test_sync_yields_new_and_updated_results(sync_api: TelQTelecomAPI, server: FakeTelQServer, clock: FakeClock,
+                                             store):
+    sync = LNTSync(sync_api.lnt, store, size=2, clock=clock)
+    first = create_tests(sync_api, 3)
+    clock.now += 10
+    second = create_tests(sync_api, 2)
+    assert [result["id"] for result in sync.run()] == first + second
+    assert sync.stats.new == 5 and sync.stats.pending == 5
+
+    # nothing changed
+    assert list(sync.run()) == []
+
+    # the first tests are delivered and new tests are created
+    clock.now += 55
+    third = create_tests(sync_api, 2)
+    results = {result["id"]: result["testStatus"] for result in LNTSync(sync_api.lnt, store, clock=clock).run()}
+    assert results == {**{test_id: "POSITIVE" for test_id in first}, **{test_id: "WAIT" for test_id in third}}
+
+    # the tests returned in their final status are no longer fetched
+    clock.now += 60
+    requests = server.requests["GET /lnt/tests"]
+    sync = LNTSync(sync_api.lnt, store, clock=clock)
+    assert sorted(result["id"] for result in sync.run()) == sorted(second + third)
+    assert sync.stats.fetched == 4 and sync.stats.pending == 0
+    # only the tests created at the watermark are fetched again
+    assert list(sync.run()) == [] and sync.stats.fetched == len(third)
+    assert server.requests["GET /lnt/tests"] - requests == 2
+
+
+def test_sync_stops_following_expired_tests(sync_api: TelQTelecomAPI, server: FakeTelQServer, clock: FakeClock,
+                                            store):
+    sync = LNTSync(sync_api.lnt, store, pending_ttl=dt.timedelta(minutes=5), clock=clock)
+    test_id = create_tests(sync_api, 1)[0]
+    server.set_test_status(test_id, "WAIT")
+    assert len(list(sync.run())) == 1
+    clock.now += 600
+    assert list(sync.run()) == []
+    assert sync.stats.expired == 1 and store.load().pending == {}
+
+
+def test_sync_start(sync_api: TelQTelecomAPI, clock: FakeClock, tmp_path):
+    create_tests(sync_api, 2)
+    clock.now += 3600
+    recent = create_tests(sync_api, 1)
+    store = FileCheckpointStore(str(tmp_path / "checkpoint.json"))
+    start = dt.datetime.fromtimestamp(clock.now - 60, dt.timezone.utc)
+    assert [result["id"] for result in LNTSync(sync_api.lnt, store, start=start, clock=clock).run()] == recent
+
+
+def test_pending_tests_do_not_widen_the_sync(sync_api: TelQTelecomAPI, server: FakeTelQServer, clock: FakeClock,
+                                             store):
+    sync = LNTSync(sync_api.lnt, store, size=10, clock=clock)
+    test_id = create_tests(sync_api, 1)[0]
+    server.set_test_status(test_id, "WAIT")
+    clock.now += 600
+    previous = create_tests(sync_api, 4)
+    assert len(list(sync.run())) == 5
+    for _ in range(10):
+        clock.now += 600
+        new = create_tests(sync_api, 4)
+        requests = server.requests["GET /lnt/tests"]
+        # the previous tests are delivered by now
+        assert [result["id"] for result in sync.run()] == previous + new
+        # a page for the pending test and one from the watermark, not every test created since the pending one
+        assert server.requests["GET /lnt/tests"] - requests == 2
+        assert sync.stats.fetched == 1 + len(previous) + len(new) and sync.stats.pending == 1 + len(new)
+        previous = new
+    server.set_test_status(test_id, "POSITIVE")
+    assert [result["id"] for result in sync.run()][0] == test_id
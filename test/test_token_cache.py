@@ -0,0 +1,97 @@
+""" Test sharing tokens between clients through the disk token cache"""
+
+import asyncio
+import threading
+import time
+
+from telq import TelQTelecomAPI
+from telq.aio import AsyncTelQTelecomAPI
+from telq.authentication.cache import CachedToken, TokenCache
+from telq.transport.fake import AsyncFakeTransport, FakeTelQServer, FakeTransport
+
+
+def authenticated_api(fake_server: FakeTelQServer, token_cache: TokenCache) -> TelQTelecomAPI:
+    telq_api = TelQTelecomAPI(transport=FakeTransport(fake_server), token_cache=token_cache)
+    telq_api.authenticate(api_id="app-id", api_key="app-key")
+    return telq_api
+
+
+def test_token_reused_by_other_clients(tmp_path, fake_server: FakeTelQServer):
+    token_cache = TokenCache(str(tmp_path / "tokens.json"))
+    first = authenticated_api(fake_server, token_cache)
+    second = authenticated_api(fake_server, TokenCache(str(tmp_path / "tokens.json")))
+
+    assert fake_server.requests["POST /token"] == 1
+    assert second._authenticated._bearer_token == first._authenticated._bearer_token
+    assert second.network.get_networks()
+
+
+def test_concurrent_clients_request_one_token(tmp_path, fake_server: FakeTelQServer):
+    token_cache = TokenCache(str(tmp_path / "tokens.json"))
+    threads = [
+        threading.Thread(target=authenticated_api, args=(fake_server, token_cache)) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert fake_server.requests["POST /token"] == 1
+
+
+def test_expiring_token_not_reused(tmp_path, fake_server: FakeTelQServer):
+    token_cache = TokenCache(str(tmp_path / "tokens.json"), min_ttl=300)
+    key = TokenCache.key("app-id", "https://api.telqtele.com", "v3")
+    token_cache.set(key, CachedToken("stale", time.time() + 60))
+
+    telq_api = authenticated_api(fake_server, token_cache)
+    assert telq_api._authenticated._bearer_token != "stale"
+    assert token_cache.get(key).value == telq_api._authenticated._bearer_token
+
+
+def test_tokens_keyed_by_app_id_and_base_url(tmp_path):
+    token_cache = TokenCache(str(tmp_path / "tokens.json"))
+    token_cache.set(TokenCache.key("a", "https://api.telqtele.com", "v3"), CachedToken("a-token", time.time() + 3600))
+    assert token_cache.get(TokenCache.key("b", "https://api.telqtele.com", "v3")) is None
+    assert token_cache.get(TokenCache.key("a", "https://other", "v3")) is None
+
+    token_cache.invalidate(TokenCache.key("a", "https://api.telqtele.com", "v3"), "other-token")
+    assert token_cache.get(TokenCache.key("a", "https://api.telqtele.com", "v3")).value == "a-token"
+
+
+def test_corrupt_cache_file_ignored(tmp_path, fake_server: FakeTelQServer):
+    (tmp_path / "tokens.json").write_text("{not json")
+    authenticated_api(fake_server, TokenCache(str(tmp_path / "tokens.json")))
+    assert fake_server.requests["POST /token"] == 1
+
+
+def test_async_cache_lock_does_not_block_event_loop(tmp_path, fake_server: FakeTelQServer):
+    token_cache = TokenCache(str(tmp_path / "tokens.json"))
+    locked, release = threading.Event(), threading.Event()
+
+    def hold_lock():
+        # e.g. another process requesting a token with the blocking client
+        with token_cache.lock():
+            locked.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    locked.wait(5)
+
+    async def run():
+        async with AsyncTelQTelecomAPI(transport=AsyncFakeTransport(fake_server), token_cache=token_cache,
+                                       refresh_margin=None) as telq_api:
+            authenticating = asyncio.ensure_future(telq_api.authenticate(api_id="app-id", api_key="app-key"))
+            ticks = 0
+            while ticks < 10:
+                await asyncio.sleep(0.01)
+                ticks += 1
+            # the event loop kept running while the cache was locked
+            assert not authenticating.done()
+            release.set()
+            await authenticating
+            return telq_api._authenticated._bearer_token
+
+    token = asyncio.run(run())
+    holder.join()
+    assert token_cache.get(TokenCache.key("app-id", "https://api.telqtele.com", "v3")).value == token
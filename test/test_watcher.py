@@ -0,0 +1,84 @@
+""" Test watching the status of suppliers for changes"""
+
+from telq import TelQTelecomAPI
+from telq.session.session_data import SessionData
+from telq.supplier.supplier_data import SupplierData
+from telq.supplier.watcher import ADDED, ERROR, OFFLINE, ONLINE, REMOVED, StatusWatcher
+from telq.transport.fake import FakeTelQServer
+
+
+def populate(api: TelQTelecomAPI, suppliers: int = 25) -> list:
+    sessions = [api.session.create(SessionData(f"10.0.0.{i}", 2775, "user", "pass"))["smppSessionId"]
+                for i in range(3)]
+    for i in range(suppliers):
+        api.supplier.create(SupplierData(sessions[i % 3], f"supplier {i}", "Wholesale"))
+    return sessions
+
+
+def test_watcher_emits_transitions_only(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    sessions = populate(offline_api)
+    watcher = StatusWatcher(offline_api.supplier, size=10)
+    received = []
+    watcher.subscribe(received.extend)
+
+    assert [event.kind for event in watcher.poll()] == [ADDED] * 25
+    assert watcher.poll() == [] and len(received) == 25
+
+    fake_server.set_session_status(sessions[1], online=False, last_error="bind failed")
+    events = watcher.poll()
+    assert sorted({event.kind for event in events}) == [ERROR, OFFLINE]
+    assert {event.smppSessionId for event in events} == {sessions[1]} and len(events) == 16
+
+    fake_server.set_session_status(sessions[1], online=True, last_error="bind failed")
+    assert {event.kind for event in watcher.poll()} == {ONLINE}
+
+    supplier_id = next(iter(fake_server.suppliers))
+    offline_api.supplier.delete(supplier_id)
+    assert [(event.kind, event.supplierId) for event in watcher.poll()] == [(REMOVED, supplier_id)]
+    assert len(received) == 25 + 8 + 16 + 1
+
+
+def test_watcher_interval_adapts(offline_api: TelQTelecomAPI, fake_server: FakeTelQServer):
+    sessions = populate(offline_api, suppliers=3)
+    watcher = StatusWatcher(offline_api.supplier, min_interval=2, max_interval=10, backoff=2)
+    watcher.poll()
+    assert watcher.interval == 2
+    watcher.poll()
+    watcher.poll()
+    assert watcher.interval == 8
+    watcher.poll()
+    assert watcher.interval == 10
+    fake_server.set_session_status(sessions[0], online=False)
+    watcher.poll()
+    assert watcher.interval == 2
+
+
+def test_watcher_subscribers_are_isolated(offline_api: TelQTelecomAPI):
+    populate(offline_api, suppliers=2)
+    watcher = StatusWatcher(offline_api.supplier)
+
+    def failing(events):
+        raise RuntimeError("alerting is down")
+
+    received = []
+    watcher.subscribe(failing)
+    unsubscribe = watcher.subscribe(received.append)
+    watcher.poll()
+    assert len(received) == 1
+    unsubscribe()
+    offline_api.supplier.delete(next(iter(offline_api.supplier.iter_all()))["supplierId"])
+    assert len(watcher.poll()) == 1 and len(received) == 1
+
+
+def test_watcher_run_until_stopped(offline_api: TelQTelecomAPI):
+    populate(offline_api, suppliers=2)
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        if len(waits) == 3:
+            watcher.stop()
+
+    watcher = StatusWatcher(offline_api.supplier, min_interval=1, backoff=2, clock=lambda: 0.0, sleep=sleep)
+    watcher.run()
+    assert watcher.polls == 3 and waits == [1, 2, 4]